@@ -1,6 +1,22 @@
-from fastapi import APIRouter, Depends
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
 
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import profiler
+from app.database import get_read_session
 from app.api.auth.role_deps import role_required
+from app.api.pagination import Page, keyset_page, next_cursor, page_limit
+from app.api.voting.models import Vote, VoterList
+from app.api.voting.schemas import VoteRead, VoterListEntryRead
+from app.api.audit import log as audit
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -8,3 +24,156 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 async def view_tally(user = Depends(role_required("election-admin"))):
     # TODO: replace with real tally logic
     return {"status": "This would show the encrypted tally"}
+
+
+@router.get("/elections/{election_id}/tally")
+async def election_tally(
+        election_id: UUID,
+        request: Request,
+        session: AsyncSession = Depends(get_read_session),
+        user = Depends(role_required("election-admin")),
+):
+    """Homomorphic per-candidate tally; decrypted when the private key is loaded."""
+    audit.record("admin.tally", user_id=user.id, request=request, election_id=election_id)
+    from app.api.crypto.key_store import get_election_key, KeyNotFound
+    from app.api.crypto.paillier_utils import homomorphic_sum
+    from app.api.voting.caches import tally_mode
+
+    if await tally_mode(session, election_id) == "mixnet":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Mixnet elections are tallied offline: python -m app.scripts.mixnet_tally"
+        )
+
+    try:
+        key = get_election_key(election_id)
+    except KeyNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No key material for this election"
+        )
+
+    rows = await session.execute(
+        select(Vote.candidate_id, Vote.encrypted_vote)
+        .where(Vote.election_id == election_id)
+    )
+    by_candidate = defaultdict(list)
+    for candidate_id, ciphertext in rows:
+        by_candidate[candidate_id].append(ciphertext)
+
+    tally = []
+    for candidate_id, cts in by_candidate.items():
+        total = homomorphic_sum(cts, key.public)
+        tally.append({
+            "candidate_id": candidate_id,
+            "encrypted_total": str(total.ciphertext(be_secure=False)),
+            "votes": key.private.decrypt(total) if key.private else None,
+        })
+
+    return {"key_fingerprint": key.fingerprint, "tally": tally}
+
+
+@router.get("/audit/metrics")
+async def audit_metrics(user = Depends(role_required("election-admin"))):
+    """Audit log buffer depth, drops and flush latency."""
+    return audit.audit_log.metrics()
+
+
+@router.post("/profile")
+async def profile_worker(
+        request: Request,
+        seconds: float = Query(10, gt=0, le=profiler.PROFILE_MAX_SECONDS),
+        interval_ms: float = Query(5, ge=1, le=1000),
+        format: str = Query("collapsed", pattern="^(collapsed|json)$"),
+        user = Depends(role_required("election-admin")),
+):
+    """
+    Sample the stacks of the worker serving this request for `seconds`.
+    Collapsed stacks (flamegraph.pl, speedscope) or JSON with the overhead.
+    """
+    if not profiler.PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    audit.record("admin.profile", user_id=user.id, request=request, seconds=seconds)
+    try:
+        sampler = profiler.start(interval_ms / 1e3)
+    except profiler.ProfilerBusy as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        result = profiler.stop(sampler)
+
+    stats = {"pid": os.getpid(), **result.stats()}
+    if format == "json":
+        return {**stats, "stacks": dict(result.stacks.most_common())}
+    return PlainTextResponse(result.collapsed(), headers={
+        "X-Profile-" + k.replace("_", "-").title(): str(v) for k, v in stats.items()})
+
+
+@router.get("/elections/{election_id}/voters", response_model=Page[VoterListEntryRead])
+async def list_voters(
+        election_id: UUID,
+        after: Optional[str] = None,
+        limit: int = Depends(page_limit),
+        email: Optional[str] = Query(None, max_length=255, description="e-mail prefix"),
+        session: AsyncSession = Depends(get_read_session),
+        user = Depends(role_required("election-admin")),
+):
+    """Voter list of an election, one keyset page at a time."""
+    query = select(VoterList).where(VoterList.election_id == election_id)
+    if email:
+        query = query.where(VoterList.email.startswith(email, autoescape=True))
+    query = keyset_page(query, (VoterList.created_at, VoterList.id), after, limit)
+    rows = list((await session.execute(query)).scalars().all())
+    cursor = next_cursor(rows, lambda v: (v.created_at, v.id), limit)
+    return Page(items=rows, next_cursor=cursor)
+
+
+@router.get("/elections/{election_id}/votes", response_model=Page[VoteRead])
+async def list_votes(
+        election_id: UUID,
+        after: Optional[str] = None,
+        limit: int = Depends(page_limit),
+        candidate_id: Optional[UUID] = None,
+        cast_from: Optional[datetime] = None,
+        cast_to: Optional[datetime] = None,
+        session: AsyncSession = Depends(get_read_session),
+        user = Depends(role_required("election-admin")),
+):
+    """Votes stored for an election, one keyset page at a time."""
+    query = (
+        select(Vote.id, Vote.candidate_id, Vote.mfa_verified, Vote.cast_at)
+        .where(Vote.election_id == election_id)
+    )
+    if candidate_id:
+        query = query.where(Vote.candidate_id == candidate_id)
+    if cast_from:
+        query = query.where(Vote.cast_at >= cast_from)
+    if cast_to:
+        query = query.where(Vote.cast_at < cast_to)
+    query = keyset_page(query, (Vote.cast_at, Vote.id), after, limit)
+    rows = list((await session.execute(query)).all())
+    cursor = next_cursor(rows, lambda v: (v.cast_at, v.id), limit)
+    return Page(items=[VoteRead.model_validate(r) for r in rows], next_cursor=cursor)
+
+
+@router.get("/elections/{election_id}/turnout/stream")
+async def turnout_stream(
+        election_id: UUID,
+        user = Depends(role_required("election-admin")),
+):
+    """Server-sent events: live turnout, at most one update per push interval."""
+    import json
+    from fastapi.responses import StreamingResponse
+    from app.api.voting.turnout import hub
+
+    async def events():
+        async for event in hub.subscribe(election_id):
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: turnout\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache",
+                                      "X-Accel-Buffering": "no"})
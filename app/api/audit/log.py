@@ -0,0 +1,194 @@
+"""
+Asynchronous append-only audit log.
+
+`record()` only appends an event to an in-memory ring buffer; a background
+task drains the buffer in batches to a sink:
+
+  db             bulk INSERT into the `audit_event` table (default)
+  file:<path>    gzip-compressed JSON lines, rotated at AUDIT_FILE_MAX_BYTES
+
+If the sink falls behind and the buffer is full, the oldest events are
+dropped and counted; `metrics()` exposes buffer depth, high-water mark,
+drops and flush latency so that shows up before it matters.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+AUDIT_SINK = os.getenv("AUDIT_SINK", "db")
+AUDIT_BUFFER_SIZE = int(os.getenv("AUDIT_BUFFER_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+AUDIT_FILE_MAX_BYTES = int(os.getenv("AUDIT_FILE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+# ---------- sinks ---------------------------------------------------------- #
+
+class Sink:
+    async def write(self, events: List[dict]) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class DatabaseSink(Sink):
+    async def write(self, events):
+        from sqlalchemy import insert
+        from app.database import async_session
+        from app.api.audit.models import AuditEvent
+
+        rows = [dict(e, detail=json.dumps(e["detail"]) if e["detail"] else None)
+                for e in events]
+        async with async_session() as session:
+            await session.execute(insert(AuditEvent), rows)
+            await session.commit()
+
+
+class FileSink(Sink):
+    """
+    Appends gzip members to `path`; once it exceeds `max_bytes` the file is
+    renamed to `path.<timestamp>` and a new one started.  Rotated files are
+    never modified again.
+    """
+
+    def __init__(self, path: str, max_bytes: int = AUDIT_FILE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def _write(self, events: List[dict]) -> None:
+        lines = "".join(json.dumps(e, default=str) + "\n" for e in events)
+        with open(self.path, "ab") as f:
+            f.write(gzip.compress(lines.encode()))
+            size = f.tell()
+        if size >= self.max_bytes:
+            os.replace(self.path, f"{self.path}.{datetime.utcnow():%Y%m%dT%H%M%S%f}")
+
+    async def write(self, events):
+        await asyncio.get_running_loop().run_in_executor(None, self._write, events)
+
+
+class MemorySink(Sink):
+    """Keeps written events in a list (tests)."""
+
+    def __init__(self):
+        self.events: List[dict] = []
+
+    async def write(self, events):
+        self.events.extend(events)
+
+
+def make_sink(spec: str = AUDIT_SINK) -> Sink:
+    if spec == "db":
+        return DatabaseSink()
+    if spec.startswith("file:"):
+        return FileSink(spec[len("file:"):])
+    if spec == "memory":
+        return MemorySink()
+    raise ValueError(f"Unknown audit sink '{spec}'")
+
+
+# ---------- buffer ---------------------------------------------------------- #
+
+class AuditLog:
+    """Ring buffer of audit events, flushed to a sink by a background task."""
+
+    def __init__(self, sink: Optional[Sink] = None, capacity: int = AUDIT_BUFFER_SIZE,
+                 batch_size: int = AUDIT_BATCH_SIZE,
+                 interval: float = AUDIT_FLUSH_INTERVAL):
+        self._sink = sink
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.interval = interval
+        self._buffer: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"recorded": 0, "written": 0, "dropped": 0,
+                      "flush_failures": 0, "high_water": 0, "last_flush_ms": 0.0}
+
+    @property
+    def sink(self) -> Sink:
+        if self._sink is None:
+            self._sink = make_sink()
+        return self._sink
+
+    def record(self, event: str, *, user_id=None, request=None, **detail: Any) -> None:
+        """Queue one event; never blocks and never raises into the request."""
+        if len(self._buffer) >= self.capacity:
+            self._buffer.popleft()
+            self.stats["dropped"] += 1
+        self._buffer.append({
+            "occurred_at": datetime.utcnow(),
+            "event": event,
+            "user_id": user_id,
+            "ip_address": request.client.host if request is not None and request.client else None,
+            "user_agent": request.headers.get("user-agent", "")[:500] if request is not None else None,
+            "detail": {k: str(v) for k, v in detail.items() if v is not None} or None,
+        })
+        self.stats["recorded"] += 1
+        self.stats["high_water"] = max(self.stats["high_water"], len(self._buffer))
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:                # no loop (scripts): flushed on stop()
+            return
+        if self._task is None or self._task.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        while self._buffer:
+            batch = [self._buffer.popleft()
+                     for _ in range(min(self.batch_size, len(self._buffer)))]
+            t0 = time.perf_counter()
+            try:
+                await self.sink.write(batch)
+            except Exception:
+                # put the batch back in front (as far as it still fits) and retry later
+                self.stats["flush_failures"] += 1
+                room = self.capacity - len(self._buffer)
+                self.stats["dropped"] += max(0, len(batch) - room)
+                self._buffer.extendleft(reversed(batch[:max(0, room)]))
+                raise
+            self.stats["written"] += len(batch)
+            self.stats["last_flush_ms"] = round((time.perf_counter() - t0) * 1e3, 3)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._buffer:
+                try:
+                    await self.flush()
+                except Exception:
+                    log.exception("Audit log flush failed")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._buffer:
+            await self.flush()
+        await self.sink.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"sink": type(self.sink).__name__, "buffered": len(self._buffer),
+                "capacity": self.capacity, **self.stats}
+
+
+audit_log = AuditLog()
+record = audit_log.record
@@ -0,0 +1,20 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database import Base
+
+
+class AuditEvent(Base):
+    """Audit log entry - append-only, written in batches by app.api.audit.log"""
+    __tablename__ = "audit_event"
+
+    # BIGINT on Postgres, INTEGER (rowid alias, autoincrement) on SQLite
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True,
+                autoincrement=True)
+    occurred_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    event = Column(String(50), nullable=False, index=True)   # e.g. "auth.login"
+    user_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    ip_address = Column(String(45), nullable=True)
+    user_agent = Column(String(500), nullable=True)
+    detail = Column(Text, nullable=True)                       # JSON object
@@ -0,0 +1,121 @@
+import json
+import struct
+import zlib
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
+
+from app.database import async_read_session
+from app.api.auth.role_deps import role_required
+from app.api.pagination import decode_cursor, encode_cursor
+from app.api.audit import log as audit
+from app.api.voting.models import BulletinLeaf, Vote
+
+router = APIRouter(prefix="/auditor", tags=["auditor"])
+
+EXPORT_CHUNK_ROWS = 1000
+
+# Binary export: a header, then one length-prefixed record per ballot.
+#   header  b"SVBX" + version (1 byte)
+#   record  length (4 bytes) + vote id (16) + cast_at in us since epoch (8)
+#           + leaf index, -1 if not on the board yet (8) + leaf hash (32)
+#           + ciphertext (rest, the stored Base64 ballot)
+BINARY_MAGIC = b"SVBX\x01"
+_RECORD = struct.Struct(">16sqq32s")
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _ndjson_line(row) -> bytes:
+    vote_id, ciphertext, cast_at, leaf_index, leaf_hash = row
+    return (json.dumps({
+        "vote_id": str(vote_id),
+        "ciphertext": ciphertext,
+        "cast_at": cast_at.isoformat(),
+        "leaf_index": leaf_index,
+        "leaf_hash": leaf_hash.hex() if leaf_hash is not None else None,
+        "cursor": encode_cursor(cast_at, vote_id),
+    }) + "\n").encode()
+
+
+def _binary_record(row) -> bytes:
+    vote_id, ciphertext, cast_at, leaf_index, leaf_hash = row
+    micros = (cast_at - _EPOCH) // timedelta(microseconds=1)
+    body = _RECORD.pack(vote_id.bytes, micros,
+                        -1 if leaf_index is None else leaf_index,
+                        leaf_hash or bytes(32)) + ciphertext.encode()
+    return struct.pack(">I", len(body)) + body
+
+
+def _compressor(kind: str):
+    if kind == "gzip":
+        return zlib.compressobj(wbits=31)
+    if kind == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise HTTPException(status_code=400, detail="zstd compression is not available")
+        return zstandard.ZstdCompressor().compressobj()
+    return None
+
+
+async def _export(election_id: UUID, after: Optional[tuple], fmt: str,
+                  compressor) -> AsyncIterator[bytes]:
+    encode = _ndjson_line if fmt == "ndjson" else _binary_record
+    query = (
+        select(Vote.id, Vote.encrypted_vote, Vote.cast_at,
+               BulletinLeaf.leaf_index, BulletinLeaf.leaf_hash)
+        .outerjoin(BulletinLeaf, BulletinLeaf.vote_id == Vote.id)
+        .where(Vote.election_id == election_id)
+        .order_by(Vote.cast_at, Vote.id)
+        .execution_options(yield_per=EXPORT_CHUNK_ROWS)
+    )
+    if after is not None:
+        query = query.where(tuple_(Vote.cast_at, Vote.id) > tuple_(*after))
+
+    # Own session: the stream outlives the request's dependencies
+    async with async_read_session() as session:
+        result = await session.stream(query)
+        chunk = [BINARY_MAGIC] if fmt == "binary" and after is None else []
+        async for partition in result.partitions():
+            chunk.extend(encode(row) for row in partition)
+            data = b"".join(chunk)
+            chunk = []
+            if compressor is not None:
+                data = compressor.compress(data)
+            if data:
+                yield data
+        if chunk:
+            data = b"".join(chunk)
+            yield compressor.compress(data) if compressor is not None else data
+    if compressor is not None:
+        yield compressor.flush()
+
+
+@router.get("/elections/{election_id}/ballots")
+async def export_ballots(
+        election_id: UUID,
+        request: Request,
+        format: str = Query("ndjson", pattern="^(ndjson|binary)$"),
+        compression: str = Query("none", pattern="^(none|gzip|zstd)$"),
+        after: Optional[str] = Query(None, description="resume after this cursor"),
+        user = Depends(role_required("auditor")),
+):
+    """
+    Stream every ballot of an election in (cast_at, id) order, straight from a
+    server-side cursor.  Each NDJSON line carries the cursor to resume from.
+    """
+    resume = decode_cursor(after, (datetime, UUID)) if after else None
+    compressor = _compressor(compression)
+    audit.record("auditor.export", user_id=user.id, request=request,
+                 election_id=election_id, format=format, after=after)
+    headers = {"Content-Encoding": compression} if compressor is not None else {}
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/octet-stream"
+    return StreamingResponse(
+        _export(election_id, resume, format, compressor),
+        media_type=media_type,
+        headers=headers,
+    )
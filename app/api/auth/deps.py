@@ -7,10 +7,15 @@ from fastapi_users.authentication import (
 )
 from fastapi_users.password import PasswordHelper
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached, object_session
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app import cache
 from app.database import get_async_session
-from app.api.auth.models import User
+from app.api.audit import log as audit
+from app.api.auth.models import Role, User
 
 RESET_TOKEN_SECRET = os.getenv("RESET_SECRET", "RESET_ME")
 JWT_SECRET = os.getenv("JWT_SECRET", "CHANGE_ME")
@@ -32,9 +37,66 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
         # Optionally send "reset password" email
         pass
 
+    async def on_after_request_verify(self, user: User, token: str, request=None):
+        from app.sendgrid_helper import send_verification_email
+        await send_verification_email(user.email, token)
+
+    async def on_after_login(self, user: User, request=None, response=None):
+        audit.record("auth.login", user_id=user.id, request=request)
+
+    async def authenticate(self, credentials):
+        user = await super().authenticate(credentials)
+        if user is None:
+            audit.record("auth.login_failed", email=credentials.username)
+        return user
+
+
+# ------------------------------------------------------------------ #
+# User lookups by id (every authenticated request) – cached          #
+# ------------------------------------------------------------------ #
+
+# process-local values only: rows carry password hashes and MFA secrets
+users = cache.Cache("users", maxsize=4096, ttl=60)
+
+
+def _user_row(user: User) -> tuple:
+    cols = {a.key: getattr(user, a.key) for a in User.__mapper__.column_attrs}
+    return cols, tuple((r.id, r.name) for r in user.roles)
+
+
+def _detached_user(row: tuple) -> User:
+    cols, roles = row
+    user = User(**cols)
+    role_objs = [Role(id=rid, name=name) for rid, name in roles]
+    for role in role_objs:
+        make_transient_to_detached(role)
+    set_committed_value(user, "roles", role_objs)
+    make_transient_to_detached(user)
+    return user
+
+
+class CachedUserDatabase(SQLAlchemyUserDatabase):
+    """get(id) goes through `users`; the user is merged into the session without a query."""
+
+    async def get(self, id):
+        row = users.get(id)
+        if row is cache.MISSING:
+            stamp = users.stamp(id)
+            user = await super().get(id)
+            if user is not None:
+                users.set(id, _user_row(user), stamp)
+            return user
+        return await self.session.merge(_detached_user(row), load=False)
+
+
+@event.listens_for(User, "after_update")     # also fires for role changes
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    cache.invalidate_after_commit(object_session(target), users.namespace, target.id)
+
 
 async def get_user_db(session: AsyncSession = Depends(get_async_session)):
-    yield SQLAlchemyUserDatabase(session, User)
+    yield CachedUserDatabase(session, User)
 
 
 async def get_user_manager(user_db=Depends(get_user_db)):
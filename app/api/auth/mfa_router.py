@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel
-import pyotp, qrcode, io, base64
+import pyotp
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth.deps import current_active_user, get_async_session
 from app.api.auth.models import User
+from app.api.auth.qr import qr_code
+from app.api.audit import log as audit
 
 router = APIRouter(prefix="/mfa", tags=["mfa"])
 
@@ -16,10 +18,11 @@ class MFAVerifyRequest(BaseModel):
 
 @router.post("/setup")
 async def mfa_setup(
+        format: str = Query("png", pattern="^(png|svg|text)$"),
         user: User = Depends(current_active_user),
         session: AsyncSession = Depends(get_async_session),
 ):
-    """Generate or return existing TOTP secret as a data-URI QR code."""
+    """Generate or return existing TOTP secret as a QR code (data URI, or text)."""
     if not user.mfa_secret:
         user.mfa_secret = pyotp.random_base32()
         session.add(user)
@@ -29,17 +32,15 @@ async def mfa_setup(
     totp = pyotp.TOTP(user.mfa_secret)
     uri = totp.provisioning_uri(name=user.email, issuer_name="SecureVote")
 
-    buf = io.BytesIO()
-    qrcode.make(uri).save(buf, format="PNG")
-    qr_b64 = base64.b64encode(buf.getvalue()).decode()
-
-    return {"otpauth_url": uri, "qr": f"data:image/png;base64,{qr_b64}"}
+    # cached per URI, rendered off the event loop on a miss
+    return {"otpauth_url": uri, "qr": await qr_code(uri, format)}
 
 
 # FIXED VERSION - accepts JSON body with Pydantic model
 @router.post("/verify")
 async def mfa_verify(
         request: MFAVerifyRequest,  # This accepts {"code": "123456"}
+        http_request: Request,
         user: User = Depends(current_active_user)
 ):
     """Verify TOTP code from user's authenticator app."""
@@ -51,11 +52,13 @@ async def mfa_verify(
 
     # Use request.code instead of just code
     if not pyotp.TOTP(user.mfa_secret).verify(request.code):
+        audit.record("mfa.failed", user_id=user.id, request=http_request)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid TOTP"
         )
 
+    audit.record("mfa.verified", user_id=user.id, request=http_request)
     return {"detail": "MFA verified"}
 
 # Alternative version if your current code looks different:
@@ -6,6 +6,7 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from fastapi_users_db_sqlalchemy import SQLAlchemyBaseUserTableUUID
+from fastapi_users_db_sqlalchemy.generics import GUID
 from app.database import Base
 
 # --------------------------- RBAC tables --------------------------- #
@@ -13,7 +14,8 @@ from app.database import Base
 user_roles = Table(
     "user_roles",
     Base.metadata,
-    Column("user_id", UUID(as_uuid=True), ForeignKey("user.id", ondelete="CASCADE"),
+    # same type as user.id, so the join also matches on SQLite (CHAR(36) there)
+    Column("user_id", GUID, ForeignKey("user.id", ondelete="CASCADE"),
            primary_key=True),
     Column("role_id", UUID(as_uuid=True), ForeignKey("role.id", ondelete="CASCADE"),
            primary_key=True),
@@ -34,7 +36,7 @@ class User(SQLAlchemyBaseUserTableUUID, Base):
         "Role",
         secondary=user_roles,
         backref="users",
-        lazy="selectin",
+        lazy="joined",      # loaded with the user on every authenticated request
     )
 
     def has_role(self, role_name: str) -> bool:
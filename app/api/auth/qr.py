@@ -0,0 +1,97 @@
+"""
+MFA enrollment QR codes, rendered once per provisioning URI.
+
+Rendered codes are kept in an LRU cache keyed on the SHA-256 of the URI
+(and the format), so repeated /mfa/setup calls for an unchanged secret
+cost a dict lookup.  Misses render in a worker thread, off the event loop,
+and concurrent misses for the same URI share one render.
+
+Formats:
+  png    data:image/png URI (qrcode + Pillow)
+  svg    data:image/svg+xml URI, one <path> built straight from the module
+         matrix; no Pillow drawing or PNG encoding
+  text   the code as Unicode half blocks, for terminals
+"""
+import asyncio
+import base64
+import hashlib
+import io
+import os
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+QR_CACHE_SIZE = int(os.getenv("QR_CACHE_SIZE", "1024"))
+
+_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+stats = {"hits": 0, "misses": 0}
+
+
+def _matrix(uri: str):
+    import qrcode  # lazy: only needed for enrollment
+
+    qr = qrcode.QRCode(border=2)
+    qr.add_data(uri)
+    qr.make(fit=True)
+    return qr.get_matrix()
+
+
+def _svg(matrix) -> str:
+    # one path, one unit square per dark module
+    size = len(matrix)
+    path = "".join(f"M{x} {y}h1v1h-1z"
+                   for y, row in enumerate(matrix) for x, dark in enumerate(row) if dark)
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" '
+            f'shape-rendering="crispEdges"><rect width="100%" height="100%" fill="#fff"/>'
+            f'<path d="{path}" fill="#000"/></svg>')
+
+
+def _text(matrix) -> str:
+    # two modules per character cell: upper and lower half blocks
+    chars = {(False, False): " ", (True, False): "\u2580",
+             (False, True): "\u2584", (True, True): "\u2588"}
+    rows = matrix + [[False] * len(matrix[0])] * (len(matrix) % 2)
+    return "\n".join("".join(chars[top, bottom] for top, bottom in zip(rows[y], rows[y + 1]))
+                     for y in range(0, len(rows), 2)) + "\n"
+
+
+def render(uri: str, fmt: str = "png") -> str:
+    if fmt == "svg":
+        svg = _svg(_matrix(uri))
+        return "data:image/svg+xml;base64," + base64.b64encode(svg.encode()).decode()
+    if fmt == "text":
+        return _text(_matrix(uri))
+    if fmt == "png":
+        import qrcode  # Pillow does the drawing and PNG encoding
+
+        buf = io.BytesIO()
+        qrcode.make(uri).save(buf, format="PNG")
+        return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode()
+    raise ValueError(f"Unknown QR format '{fmt}'")
+
+
+async def qr_code(uri: str, fmt: str = "png") -> str:
+    """Cached rendering of `uri` in `fmt`."""
+    key = (hashlib.sha256(uri.encode()).hexdigest(), fmt)
+    if key in _cache:
+        _cache.move_to_end(key)
+        stats["hits"] += 1
+        return _cache[key]
+    if key in _inflight:
+        return await asyncio.shield(_inflight[key])
+
+    stats["misses"] += 1
+    fut = asyncio.ensure_future(asyncio.to_thread(render, uri, fmt))
+    _inflight[key] = fut
+    try:
+        out = await asyncio.shield(fut)
+    finally:
+        _inflight.pop(key, None)
+    _cache[key] = out
+    while len(_cache) > QR_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return out
+
+
+def clear_cache() -> None:
+    _cache.clear()
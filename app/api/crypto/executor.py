@@ -0,0 +1,56 @@
+"""
+Process pool for CPU-bound crypto (ballot encryption, proof verification).
+
+Paillier operations are big-integer exponentiations that hold the GIL, so
+running them on the event loop or in threads serialises every request in
+the worker.  `run()` ships them to a shared ProcessPoolExecutor instead.
+Set ``CRYPTO_WORKERS=0`` to run them in the default thread pool (e.g. where
+processes can't be forked).
+"""
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from app import profiler
+
+CRYPTO_WORKERS = int(os.getenv("CRYPTO_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> Optional[Executor]:
+    """The shared crypto pool (created on first use), or None for threads."""
+    global _pool
+    if CRYPTO_WORKERS <= 0:
+        return None
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=CRYPTO_WORKERS)
+    return _pool
+
+
+async def run(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a picklable module-level function on the crypto pool."""
+    return await run_in(get_executor(), fn, *args, **kwargs)
+
+
+async def run_in(pool: Optional[Executor], fn: Callable[..., Any],
+                 *args: Any, **kwargs: Any) -> Any:
+    """Like run(), on `pool`; sampled in the pool process while a profile is active."""
+    loop = asyncio.get_running_loop()
+    profile = profiler.active()
+    if profile is None or not isinstance(pool, ProcessPoolExecutor):
+        # threads are sampled by the profiler's own thread
+        return await loop.run_in_executor(pool, partial(fn, *args, **kwargs))
+    result, stacks, spent, wall = await loop.run_in_executor(pool, partial(
+        profiler.sampled_call, profile.interval, profile.max_overhead, fn, *args, **kwargs))
+    profile.merge_worker(stacks, spent, wall)
+    return result
+
+
+def shutdown() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,194 @@
+"""
+On-disk store and in-memory cache for per-election Paillier keys.
+
+Keys live in ``ELECTION_KEY_DIR`` as ``<election_id>.pub`` (public key) and,
+only where a tally is run, ``<election_id>.priv`` (p and q).  Both use the
+same small binary container:
+
+    magic  b"SVK1"          4 bytes
+    kind   1=public 2=priv  1 byte
+    uuid   election id      16 bytes
+    count                   2 bytes, big endian
+    count x (length: 4 bytes big endian, integer: big endian bytes)
+
+Keys are loaded once (see `preload`) into phe key objects, which derive
+n^2 and g (public) and p^2, q^2, hp, hq (private, CRT decryption) at
+construction time, so the vote and tally paths never re-derive them.
+
+A key is created once, when its election is (`create_election_key`), under
+a lock on the key directory: concurrent creators end up with the same key.
+The vote path never creates keys.
+"""
+import fcntl
+import hashlib
+import logging
+import os
+import pathlib
+import struct
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from phe import paillier
+
+from app.api.crypto.paillier_utils import generate_keypair
+
+log = logging.getLogger(__name__)
+
+KEY_DIR = pathlib.Path(os.getenv("ELECTION_KEY_DIR", "./keys"))
+# Dev convenience: at startup, create keys for active elections that have none.
+KEY_AUTOGEN = os.getenv("ELECTION_KEY_AUTOGEN", "0") == "1"
+
+_MAGIC = b"SVK1"
+_HEADER = struct.Struct(">4sB16sH")
+_KIND_PUBLIC, _KIND_PRIVATE = 1, 2
+
+
+class KeyNotFound(LookupError):
+    """No key material has been provisioned for an election."""
+
+
+@dataclass(frozen=True)
+class ElectionKey:
+    election_id: uuid.UUID
+    public: paillier.PaillierPublicKey
+    private: Optional[paillier.PaillierPrivateKey] = None
+
+    @property
+    def fingerprint(self) -> str:
+        return public_key_fingerprint(self.public)
+
+
+def public_key_fingerprint(pub: paillier.PaillierPublicKey) -> str:
+    n = pub.n.to_bytes((pub.n.bit_length() + 7) // 8, "big")
+    return hashlib.sha256(n).hexdigest()
+
+
+# ---------- binary (de)serialization --------------------------------------- #
+
+def _pack(kind: int, election_id: uuid.UUID, ints: List[int]) -> bytes:
+    out = [_HEADER.pack(_MAGIC, kind, election_id.bytes, len(ints))]
+    for i in ints:
+        raw = i.to_bytes((i.bit_length() + 7) // 8, "big")
+        out.append(struct.pack(">I", len(raw)) + raw)
+    return b"".join(out)
+
+
+def _unpack(data: bytes, kind: int) -> tuple:
+    magic, got_kind, eid, count = _HEADER.unpack_from(data)
+    if magic != _MAGIC or got_kind != kind:
+        raise ValueError("not a SecureVote key file of the expected kind")
+    off, ints = _HEADER.size, []
+    for _ in range(count):
+        (length,) = struct.unpack_from(">I", data, off)
+        off += 4
+        ints.append(int.from_bytes(data[off:off + length], "big"))
+        off += length
+    return uuid.UUID(bytes=eid), ints
+
+
+def dump_public_key(election_id: uuid.UUID,
+                    pub: paillier.PaillierPublicKey) -> bytes:
+    return _pack(_KIND_PUBLIC, election_id, [pub.n])
+
+
+def load_public_key(data: bytes) -> paillier.PaillierPublicKey:
+    _, (n,) = _unpack(data, _KIND_PUBLIC)
+    return paillier.PaillierPublicKey(n)
+
+
+def dump_private_key(election_id: uuid.UUID,
+                     priv: paillier.PaillierPrivateKey) -> bytes:
+    return _pack(_KIND_PRIVATE, election_id, [priv.p, priv.q])
+
+
+def load_private_key(data: bytes,
+                     pub: paillier.PaillierPublicKey) -> paillier.PaillierPrivateKey:
+    _, (p, q) = _unpack(data, _KIND_PRIVATE)
+    return paillier.PaillierPrivateKey(pub, p, q)
+
+
+# ---------- file store ----------------------------------------------------- #
+
+def _path(election_id: uuid.UUID, suffix: str) -> pathlib.Path:
+    return KEY_DIR / f"{election_id}.{suffix}"
+
+
+def _write_new(path: pathlib.Path, data: bytes, mode: int) -> None:
+    # O_EXCL: never replace a key; the mode applies from the first byte
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+
+
+def save_key(election_id: uuid.UUID,
+             pub: paillier.PaillierPublicKey,
+             priv: Optional[paillier.PaillierPrivateKey] = None) -> None:
+    """Write new key files; raises FileExistsError if the election has a key."""
+    KEY_DIR.mkdir(parents=True, exist_ok=True)
+    if priv is not None:
+        _write_new(_path(election_id, "priv"), dump_private_key(election_id, priv), 0o600)
+    # the public key goes last: once it exists, the key is complete
+    _write_new(_path(election_id, "pub"), dump_public_key(election_id, pub), 0o644)
+
+
+def read_key(election_id: uuid.UUID) -> ElectionKey:
+    try:
+        pub = load_public_key(_path(election_id, "pub").read_bytes())
+    except FileNotFoundError:
+        raise KeyNotFound(str(election_id)) from None
+    priv_path = _path(election_id, "priv")
+    priv = load_private_key(priv_path.read_bytes(), pub) if priv_path.exists() else None
+    return ElectionKey(election_id, pub, priv)
+
+
+# ---------- in-memory cache ------------------------------------------------ #
+
+_keys: Dict[uuid.UUID, ElectionKey] = {}
+
+
+def preload(election_ids: Iterable[uuid.UUID], create: bool = KEY_AUTOGEN) -> int:
+    """Load keys for the given elections into memory; returns how many loaded."""
+    loaded = 0
+    for eid in election_ids:
+        try:
+            get_election_key(eid)
+        except KeyNotFound:
+            if not create:
+                log.warning("No key material for election %s", eid)
+                continue
+            log.warning("Generating a dev keypair for election %s", eid)
+            create_election_key(eid)
+        loaded += 1
+    return loaded
+
+
+def get_election_key(election_id: uuid.UUID) -> ElectionKey:
+    """Cached key for an election, falling back to disk."""
+    key = _keys.get(election_id)
+    if key is None:
+        key = _keys[election_id] = read_key(election_id)
+    return key
+
+
+def create_election_key(election_id: uuid.UUID) -> ElectionKey:
+    """
+    Generate and store the key of a new election.  Safe to race from
+    threads, workers and scripts: whoever takes the lock first creates
+    the key, everyone else loads it.
+    """
+    KEY_DIR.mkdir(parents=True, exist_ok=True)
+    with open(KEY_DIR / ".lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)        # released when the file is closed
+        try:
+            key = read_key(election_id)
+        except KeyNotFound:
+            pub, priv = generate_keypair()
+            save_key(election_id, pub, priv)
+            key = ElectionKey(election_id, pub, priv)
+    _keys[election_id] = key
+    return key
+
+
+def clear_cache() -> None:
+    _keys.clear()
@@ -1,13 +1,27 @@
 """
 Light-weight helpers around the phe Paillier library.
+
+All math on raw integer ciphertexts goes through a pluggable engine
+(see `PaillierEngine`).  The `phe` engine is the reference implementation;
+the `gmpy2` engine skips phe's EncodedNumber / exponent bookkeeping and
+works directly on gmpy2 integers, which is all our small non-negative
+integer ballots need.  Select it with ``PAILLIER_ENGINE=gmpy2``.
 """
 import base64
 import json
+import os
 from functools import reduce
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from phe import paillier
 
+try:                                    # optional fast big-integer backend
+    import gmpy2
+except ImportError:                     # pragma: no cover - depends on env
+    gmpy2 = None
+
+PAILLIER_ENGINE = os.getenv("PAILLIER_ENGINE", "phe")
+
 # ---------- key generation ------------------------------------------------- #
 
 def generate_keypair() -> Tuple[paillier.PaillierPublicKey,
@@ -15,6 +29,105 @@ def generate_keypair() -> Tuple[paillier.PaillierPublicKey,
     return paillier.generate_paillier_keypair()
 
 
+# ---------- engines --------------------------------------------------------- #
+# Engines operate on raw ints: plaintexts are non-negative ints < n and
+# ciphertexts are ints < n^2 (exponent 0 in phe terms).
+
+class PaillierEngine:
+    """Interface for raw-integer Paillier arithmetic."""
+    name = "abstract"
+
+    def encrypt(self, m: int, pub: paillier.PaillierPublicKey,
+                r: Optional[int] = None) -> int:
+        raise NotImplementedError
+
+    def add(self, c1: int, c2: int, pub: paillier.PaillierPublicKey) -> int:
+        raise NotImplementedError
+
+    def batch_add(self, cts: Iterable[int],
+                  pub: paillier.PaillierPublicKey) -> int:
+        """Homomorphic sum of many ciphertexts (E(0) for an empty input)."""
+        return reduce(lambda a, b: self.add(a, b, pub), cts, 1)
+
+    def decrypt(self, c: int, pub: paillier.PaillierPublicKey,
+                priv: paillier.PaillierPrivateKey) -> int:
+        raise NotImplementedError
+
+
+class PheEngine(PaillierEngine):
+    """Reference engine: every operation goes through phe's public API."""
+    name = "phe"
+
+    def encrypt(self, m, pub, r=None):
+        enc = pub.encrypt(m, r_value=r)
+        return enc.ciphertext(be_secure=False)
+
+    def add(self, c1, c2, pub):
+        total = (paillier.EncryptedNumber(pub, c1)
+                 + paillier.EncryptedNumber(pub, c2))
+        return total.ciphertext(be_secure=False)
+
+    def decrypt(self, c, pub, priv):
+        return priv.decrypt(paillier.EncryptedNumber(pub, c))
+
+
+class Gmpy2Engine(PaillierEngine):
+    """
+    Lean engine built on gmpy2.powmod, with g = n + 1 so that
+    g^m = 1 + m*n (mod n^2) and no encoding step is needed.
+    """
+    name = "gmpy2"
+
+    def __init__(self):
+        if gmpy2 is None:
+            raise RuntimeError("gmpy2 is not installed")
+
+    def encrypt(self, m, pub, r=None):
+        if not 0 <= m < pub.n:
+            raise ValueError("plaintext must be in [0, n)")
+        n, nsq = gmpy2.mpz(pub.n), gmpy2.mpz(pub.nsquare)
+        if r is None:
+            r = pub.get_random_lt_n()
+        return int((n * m + 1) * gmpy2.powmod(r, n, nsq) % nsq)
+
+    def add(self, c1, c2, pub):
+        return int(gmpy2.mpz(c1) * c2 % pub.nsquare)
+
+    def batch_add(self, cts, pub):
+        nsq = gmpy2.mpz(pub.nsquare)
+        acc = gmpy2.mpz(1)
+        for c in cts:
+            acc = acc * c % nsq
+        return int(acc)
+
+    def decrypt(self, c, pub, priv):
+        c = gmpy2.mpz(c)
+        p, q = gmpy2.mpz(priv.p), gmpy2.mpz(priv.q)
+        mp = (gmpy2.powmod(c, p - 1, priv.psquare) - 1) // p * priv.hp % p
+        mq = (gmpy2.powmod(c, q - 1, priv.qsquare) - 1) // q * priv.hq % q
+        # Chinese remainder theorem, as in PaillierPrivateKey.crt
+        return int(mp + (mq - mp) * priv.p_inverse % q * p)
+
+
+ENGINES = {
+    PheEngine.name: PheEngine,
+    Gmpy2Engine.name: Gmpy2Engine,
+}
+
+_engine_cache: Dict[str, PaillierEngine] = {}
+
+
+def get_engine(name: Optional[str] = None) -> PaillierEngine:
+    """Return the (shared) engine instance for `name` or the configured one."""
+    name = name or PAILLIER_ENGINE
+    if name not in _engine_cache:
+        try:
+            _engine_cache[name] = ENGINES[name]()
+        except KeyError:
+            raise ValueError(f"Unknown Paillier engine '{name}'") from None
+    return _engine_cache[name]
+
+
 # ---------- serialization helpers ----------------------------------------- #
 # EncryptedNumber needs both 'ciphertext' and 'exponent' to be restored.
 
@@ -29,27 +142,57 @@ def _b64_to_encnum(b64: str, pubkey: paillier.PaillierPublicKey):
                                     raw["c"],
                                     raw["e"])
 
+
+def _int_to_b64(c: int) -> str:
+    # same wire format as _encnum_to_b64 with exponent 0 (integer encoding)
+    payload = json.dumps({"c": c, "e": 0})
+    return base64.b64encode(payload.encode()).decode()
+
+
+def _b64_to_int(b64: str) -> Optional[int]:
+    """Raw ciphertext of an integer ballot, or None if it carries an exponent."""
+    raw = json.loads(base64.b64decode(b64).decode())
+    return raw["c"] if raw["e"] == 0 else None
+
+def ballot_ciphertext(b64: str) -> Optional[int]:
+    """Raw ciphertext of a serialized integer ballot (None for non-integer encodings)."""
+    return _b64_to_int(b64)
+
+def serialize_ballot(c: int) -> str:
+    """Wire format of a raw integer ciphertext (inverse of ballot_ciphertext)."""
+    return _int_to_b64(c)
+
 # ---------- Step 3: ballot encryption ------------------------------------- #
 
 def encrypt_ballot(vote: int,
-                   pub: paillier.PaillierPublicKey) -> str:
+                   pub: paillier.PaillierPublicKey,
+                   engine: Optional[PaillierEngine] = None) -> str:
     """
     Encrypt a single integer vote and return a Base64 string.
     """
-    enc = pub.encrypt(vote)
-    return _encnum_to_b64(enc)
+    engine = engine or get_engine()
+    return _int_to_b64(engine.encrypt(vote, pub))
 
 def decrypt_ballot(b64: str,
                    pub: paillier.PaillierPublicKey,
-                   priv: paillier.PaillierPrivateKey) -> int:
-    return priv.decrypt(_b64_to_encnum(b64, pub))
+                   priv: paillier.PaillierPrivateKey,
+                   engine: Optional[PaillierEngine] = None) -> int:
+    c = _b64_to_int(b64)
+    if c is None:
+        return priv.decrypt(_b64_to_encnum(b64, pub))
+    return (engine or get_engine()).decrypt(c, pub, priv)
 
 # ---------- Step 4: homomorphic tally ------------------------------------- #
 
 def homomorphic_sum(ciphertexts_b64: List[str],
-                    pub: paillier.PaillierPublicKey):
+                    pub: paillier.PaillierPublicKey,
+                    engine: Optional[PaillierEngine] = None):
     """
     Return an EncryptedNumber representing the sum of all encrypted ballots.
     """
-    encs = [_b64_to_encnum(b, pub) for b in ciphertexts_b64]
-    return reduce(lambda a, b: a + b, encs)
+    raw = [_b64_to_int(b) for b in ciphertexts_b64]
+    if any(c is None for c in raw):
+        encs = [_b64_to_encnum(b, pub) for b in ciphertexts_b64]
+        return reduce(lambda a, b: a + b, encs)
+    total = (engine or get_engine()).batch_add(raw, pub)
+    return paillier.EncryptedNumber(pub, total, 0)
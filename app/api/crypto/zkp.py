@@ -0,0 +1,198 @@
+"""
+Ballot-validity proofs: non-interactive (Fiat-Shamir) disjunctive proofs
+that a Paillier ciphertext encrypts one of a small set of allowed values,
+e.g. {0, 1} or a 1-of-k candidate index.
+
+For every allowed value m_j let u_j = c * g^-m_j (mod n^2).  The ballot is
+valid iff some u_j is an n-th residue, and each branch of the proof is a
+Sigma-protocol transcript (a_j, e_j, z_j) with
+
+    z_j^n == a_j * u_j^e_j   (mod n^2),    sum(e_j) == H(...) (mod 2^T)
+
+All but the real branch are simulated.
+
+Batch verification checks m proofs at once with random small exponents
+d_l, one per branch equation:
+
+    (prod z_l^d_l mod n)^n == prod a_l^d_l * prod u_l^(e_l*d_l)   (mod n^2)
+
+which costs one full n-th power instead of one per branch.  If the batch
+fails, the proofs are checked one by one to pinpoint the bad ones.
+"""
+import asyncio
+import hashlib
+import math
+import secrets
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from phe import paillier
+
+try:                                    # optional fast big-integer backend
+    import gmpy2
+    _powmod = gmpy2.powmod
+except ImportError:                     # pragma: no cover - depends on env
+    _powmod = pow
+
+CHALLENGE_BITS = 128        # T: challenge space 2^T, well below p and q
+BATCH_EXPONENT_BITS = 64    # size of the random batching exponents
+
+
+@dataclass
+class MembershipProof:
+    a: List[int]
+    e: List[int]
+    z: List[int]
+
+    def to_json(self) -> dict:
+        return {k: [format(x, "x") for x in getattr(self, k)] for k in ("a", "e", "z")}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "MembershipProof":
+        return cls(*([int(x, 16) for x in data[k]] for k in ("a", "e", "z")))
+
+
+def _challenge(pub: paillier.PaillierPublicKey, c: int,
+               allowed: Sequence[int], a: Sequence[int]) -> int:
+    h = hashlib.sha256()
+    for x in (pub.n, c, *allowed, *a):
+        h.update(x.to_bytes((x.bit_length() + 8) // 8, "big"))
+    return int.from_bytes(h.digest(), "big") % (1 << CHALLENGE_BITS)
+
+
+def _u(pub: paillier.PaillierPublicKey, c: int, m: int) -> int:
+    # g = n + 1  =>  g^-m = 1 - m*n  (mod n^2)
+    return c * (1 - m * pub.n) % pub.nsquare
+
+
+def prove_membership(pub: paillier.PaillierPublicKey, c: int, m: int, r: int,
+                     allowed: Sequence[int]) -> MembershipProof:
+    """Prove c = g^m * r^n encrypts a value in `allowed` (m itself stays hidden)."""
+    n, nsq, mod_e = pub.n, pub.nsquare, 1 << CHALLENGE_BITS
+    real = list(allowed).index(m)
+    a, e, z = [0] * len(allowed), [0] * len(allowed), [0] * len(allowed)
+
+    for j, mj in enumerate(allowed):
+        if j == real:
+            continue
+        e[j] = secrets.randbelow(mod_e)
+        z[j] = pub.get_random_lt_n()
+        u_inv = _powmod(_u(pub, c, mj), -1, nsq)
+        a[j] = int(_powmod(z[j], n, nsq) * _powmod(u_inv, e[j], nsq) % nsq)
+
+    omega = pub.get_random_lt_n()
+    a[real] = int(_powmod(omega, n, nsq))
+    e[real] = (_challenge(pub, c, allowed, a) - sum(e)) % mod_e
+    z[real] = int(omega * _powmod(r, e[real], n) % n)
+    return MembershipProof(a, e, z)
+
+
+def _well_formed(pub: paillier.PaillierPublicKey, c: int,
+                 allowed: Sequence[int], proof: MembershipProof) -> bool:
+    k = len(allowed)
+    if not (len(proof.a) == len(proof.e) == len(proof.z) == k):
+        return False
+    if not 0 < c < pub.nsquare or math.gcd(c, pub.n) != 1:
+        return False
+    if any(not 0 < x < pub.nsquare or math.gcd(x, pub.n) != 1 for x in proof.a):
+        return False
+    if any(not 0 < x < pub.n for x in proof.z):
+        return False
+    if any(not 0 <= x < 1 << CHALLENGE_BITS for x in proof.e):
+        return False
+    return sum(proof.e) % (1 << CHALLENGE_BITS) == _challenge(pub, c, allowed, proof.a)
+
+
+def verify_membership(pub: paillier.PaillierPublicKey, c: int,
+                      allowed: Sequence[int], proof: MembershipProof) -> bool:
+    """Check a single proof (k full n-th powers)."""
+    if not _well_formed(pub, c, allowed, proof):
+        return False
+    n, nsq = pub.n, pub.nsquare
+    return all(
+        _powmod(zj, n, nsq) == aj * _powmod(_u(pub, c, mj), ej, nsq) % nsq
+        for mj, aj, ej, zj in zip(allowed, proof.a, proof.e, proof.z)
+    )
+
+
+Statement = Tuple[int, Sequence[int], MembershipProof]      # (c, allowed, proof)
+
+
+def batch_verify(pub: paillier.PaillierPublicKey,
+                 statements: Sequence[Statement]) -> List[bool]:
+    """
+    Verify many proofs under one key.  One randomized combined check; only
+    if it fails are the proofs re-checked individually.
+    """
+    ok = [_well_formed(pub, c, allowed, p) for c, allowed, p in statements]
+    n, nsq = pub.n, pub.nsquare
+    z_acc, rhs = 1, 1
+    for good, (c, allowed, p) in zip(ok, statements):
+        if not good:
+            continue
+        for mj, aj, ej, zj in zip(allowed, p.a, p.e, p.z):
+            d = secrets.randbits(BATCH_EXPONENT_BITS) | 1
+            z_acc = z_acc * _powmod(zj, d, n) % n
+            rhs = rhs * _powmod(aj, d, nsq) % nsq
+            rhs = rhs * _powmod(_u(pub, c, mj), ej * d, nsq) % nsq
+    if _powmod(z_acc, n, nsq) == rhs:
+        return ok
+    return [good and verify_membership(pub, c, allowed, p)
+            for good, (c, allowed, p) in zip(ok, statements)]
+
+
+# ---------- request batching ----------------------------------------------- #
+
+class BatchVerifier:
+    """
+    Collects proofs from concurrent requests for up to `window` seconds (or
+    `max_batch` proofs) and verifies them together with `batch_verify`, on
+    `executor` or else the shared crypto process pool.
+    """
+
+    def __init__(self, window: float = 0.02, max_batch: int = 256, executor=None):
+        self.window = window
+        self.max_batch = max_batch
+        self.executor = executor
+        self._queue: List[Tuple[paillier.PaillierPublicKey, Statement, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def verify(self, pub: paillier.PaillierPublicKey, c: int,
+                     allowed: Sequence[int], proof: MembershipProof) -> bool:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._queue.append((pub, (c, tuple(allowed), proof), fut))
+        if len(self._queue) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+        return await fut
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        queue, self._queue = self._queue, []
+        by_key = {}
+        for pub, stmt, fut in queue:
+            by_key.setdefault(pub, []).append((stmt, fut))
+        for pub, items in by_key.items():
+            asyncio.ensure_future(self._run(pub, items))
+
+    async def _run(self, pub, items) -> None:
+        from app.api.crypto.executor import get_executor, run_in
+
+        try:
+            results = await run_in(self.executor or get_executor(),
+                                   batch_verify, pub, [s for s, _ in items])
+        except Exception as e:
+            for _, fut in items:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for ok, (_, fut) in zip(results, items):
+            if not fut.done():
+                fut.set_result(ok)
+
+
+verifier = BatchVerifier()
@@ -5,6 +5,7 @@ from app.api.auth.router import router as auth_router
 from app.api.auth.mfa_router import router as mfa_router
 from app.api.admin.router import router as admin_router
 from app.api.voting.router import router as voting_router
+from app.api.audit.router import router as audit_router
 
 app = FastAPI(title="SecureVote")
 
@@ -15,24 +16,78 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],   # keyset pagination of list endpoints
 )
 
 app.include_router(auth_router)
 app.include_router(mfa_router)
 app.include_router(admin_router)
 app.include_router(voting_router)  # Add voting router
+app.include_router(audit_router)
 
 
-@app.on_event("startup")
-async def on_startup():
-    # Create DB tables once; replace with Alembic in prod
-    from app.database import Base, engine
+# True once `prepare()` ran in this process, or in the run.py parent before fork
+_prepared = False
+
+
+async def prepare() -> int:
+    """One-off startup work; returns how many election keys were loaded."""
+    global _prepared
+    # Version check instead of create_all on every boot; upgrades run app.database.MIGRATIONS
+    from app.database import ensure_schema
     # Import all models to ensure they're registered
     from app.api.auth.models import User, Role
     from app.api.voting.models import Election, Candidate, VoterList, Vote
+    from app.api.audit.models import AuditEvent
+
+    await ensure_schema()
+
+    # Load every active election's key once; vote/tally paths reuse it
+    from sqlalchemy import select
+    from app.database import async_session
+    from app.api.crypto import key_store
+
+    async with async_session() as session:
+        ids = (await session.scalars(
+            select(Election.id).where(Election.is_active == True)
+        )).all()
+    loaded = key_store.preload(ids)
+
+    # Put votes committed but never appended (e.g. after a crash) on the board
+    from app.api.voting.bulletin import backfill
+    for election_id in ids:
+        await backfill(election_id)
+    _prepared = True
+    return loaded
+
+
+@app.on_event("startup")
+async def on_startup():
+    # pre-forked workers inherit the parent's preparation (see run.py)
+    if not _prepared:
+        await prepare()
+
+    # Tally elections as they close (and any that closed while we were down)
+    from app.api.voting.lifecycle import scheduler
+    scheduler.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # flush queued e-mails, bulletin board leaves and audit events before the worker exits
+    from app.email_dispatch import shutdown
+    from app.api.voting.bulletin import board
+    from app.api.audit.log import audit_log
+    from app.api.voting.lifecycle import scheduler
+    from app.api.voting.turnout import hub
+    await scheduler.stop()
+    await hub.stop()
+    await shutdown()
+    await board.stop()
+    await audit_log.stop()
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    from app.api.crypto import executor
+    executor.shutdown()
 
 
 @app.get("/ping")
@@ -0,0 +1,77 @@
+"""
+Opaque keyset cursors.
+
+A cursor is the URL-safe Base64 of the JSON-encoded sort key of the last
+row a client has seen, e.g. (created_at, id).  Listings continue with
+``WHERE (created_at, id) > cursor`` so every page costs the same no
+matter how deep the client has paged.
+"""
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+
+T = TypeVar("T")
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = [v.isoformat() if isinstance(v, datetime) else str(v) for v in values]
+    return base64.urlsafe_b64encode(json.dumps(raw).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> Tuple:
+    """Decode a cursor into values of the given types (datetime, uuid.UUID, int, str)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if len(raw) != len(types):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime
+            else uuid.UUID(v) if t is uuid.UUID
+            else t(v)
+            for t, v in zip(types, raw)
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# ---------- keyset pages ----------------------------------------------------- #
+
+PAGE_SIZE_DEFAULT = 50
+PAGE_SIZE_MAX = 200          # server-enforced, whatever the client asks for
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def page_limit(limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, description="page size")) -> int:
+    return min(limit, PAGE_SIZE_MAX)
+
+
+def keyset_page(query: Select, key: Sequence, after: Optional[str], limit: int) -> Select:
+    """
+    Order `query` by the `key` columns and seek past `after`.  One extra row
+    is fetched so `next_cursor` can tell whether another page exists.
+    """
+    if after:
+        types = [col.type.python_type for col in key]
+        query = query.where(tuple_(*key) > tuple_(*decode_cursor(after, types)))
+    return query.order_by(*key).limit(limit + 1)
+
+
+def next_cursor(rows: list, key: Callable[[Any], Sequence], limit: int) -> Optional[str]:
+    """Cursor after the last row of the page (and trim the look-ahead row), or None."""
+    if len(rows) <= limit:
+        return None
+    del rows[limit:]
+    return encode_cursor(*key(rows[-1]))
@@ -0,0 +1,208 @@
+"""
+Fixed-record ballot archive for closed elections.
+
+Layout (big-endian):
+
+  header      b"SVBA", version, election id, key fingerprint (32 bytes),
+              record count, ciphertext width W, candidate count,
+              has-root flag, Merkle root (32 bytes), created (unix time)
+  candidates  per candidate: id, first record, record count
+  records     leaf index (-1 if not on the board) | vote id | leaf hash
+              | ciphertext as a W-byte integer
+
+Records are grouped by candidate, so one candidate's ballots are one
+contiguous slice of the file.  Readers `mmap` it and hand (start, stop)
+record ranges to worker processes, which map the same pages and multiply
+ciphertexts straight out of the page cache; nothing goes through the ORM.
+"""
+import mmap
+import os
+import struct
+import time
+import uuid
+from dataclasses import dataclass
+from functools import reduce
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+try:                                    # optional fast big-integer backend
+    import gmpy2
+except ImportError:                     # pragma: no cover - depends on env
+    gmpy2 = None
+
+ARCHIVE_DIR = os.getenv("BALLOT_ARCHIVE_DIR", "./archive")
+
+MAGIC = b"SVBA"
+VERSION = 1
+_HEADER = struct.Struct(">4sB16s32sQIIB32sQ")
+_CANDIDATE = struct.Struct(">16sQQ")
+_RECORD_HEAD = struct.Struct(">q16s32s")    # leaf index, vote id, leaf hash
+
+
+def archive_path(election_id: uuid.UUID) -> str:
+    return os.path.join(ARCHIVE_DIR, f"{election_id}.ballots")
+
+
+def ciphertext_width(nsquare: int) -> int:
+    return (nsquare.bit_length() + 7) // 8
+
+
+@dataclass(frozen=True)
+class ArchiveHeader:
+    election_id: uuid.UUID
+    fingerprint: str
+    count: int
+    width: int
+    candidates: List[Tuple[uuid.UUID, int, int]]    # (id, first record, count)
+    root: Optional[bytes]
+    created: int
+
+    @property
+    def record_size(self) -> int:
+        return _RECORD_HEAD.size + self.width
+
+    @property
+    def data_offset(self) -> int:
+        return _HEADER.size + _CANDIDATE.size * len(self.candidates)
+
+
+# ---------- writing -------------------------------------------------------- #
+
+Record = Tuple[Optional[int], uuid.UUID, bytes, int]    # leaf index, vote id, leaf hash, c
+
+
+class ArchiveWriter:
+    """
+    Streams records into a temp file, one candidate group at a time; the
+    header is written on close, then the file is renamed into place.
+    """
+
+    def __init__(self, path: str, election_id: uuid.UUID, fingerprint: str,
+                 nsquare: int, candidate_ids: List[uuid.UUID],
+                 root: Optional[bytes] = None):
+        self.path = path
+        self.election_id = election_id
+        self.fingerprint = fingerprint
+        self.width = ciphertext_width(nsquare)
+        self.candidate_ids = list(candidate_ids)
+        self.root = root
+        self.table: List[Tuple[uuid.UUID, int, int]] = []
+        self.count = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._tmp = f"{path}.tmp"
+        self._f = open(self._tmp, "wb")
+        self._f.seek(_HEADER.size + _CANDIDATE.size * len(self.candidate_ids))
+
+    def begin_candidate(self, candidate_id: uuid.UUID) -> None:
+        if candidate_id != self.candidate_ids[len(self.table)]:
+            raise ValueError("candidate groups must follow candidate_ids order")
+        self.table.append((candidate_id, self.count, 0))
+
+    def write(self, leaf_index: Optional[int], vote_id: uuid.UUID,
+              leaf: Optional[bytes], c: int) -> None:
+        self._f.write(_RECORD_HEAD.pack(-1 if leaf_index is None else leaf_index,
+                                        vote_id.bytes, leaf or bytes(32)))
+        self._f.write(c.to_bytes(self.width, "big"))
+        self.count += 1
+        cid, first, _ = self.table[-1]
+        self.table[-1] = (cid, first, self.count - first)
+
+    def close(self) -> ArchiveHeader:
+        if len(self.table) != len(self.candidate_ids):
+            raise ValueError("not every candidate group was written")
+        header = ArchiveHeader(self.election_id, self.fingerprint, self.count, self.width,
+                               self.table, self.root, int(time.time()))
+        self._f.seek(0)
+        self._f.write(_pack_header(header))
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._f.close()
+        os.replace(self._tmp, self.path)
+        return header
+
+    def abort(self) -> None:
+        self._f.close()
+        os.unlink(self._tmp)
+
+
+def _pack_header(h: ArchiveHeader) -> bytes:
+    out = [_HEADER.pack(MAGIC, VERSION, h.election_id.bytes, bytes.fromhex(h.fingerprint),
+                        h.count, h.width, len(h.candidates), h.root is not None,
+                        h.root or bytes(32), h.created)]
+    out += [_CANDIDATE.pack(cid.bytes, first, n) for cid, first, n in h.candidates]
+    return b"".join(out)
+
+
+# ---------- reading -------------------------------------------------------- #
+
+class BallotArchive:
+    """Read-only, memory-mapped view of an archive file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.header = self._read_header()
+        except ValueError:
+            self.close()
+            raise
+        expected = self.header.data_offset + self.header.count * self.header.record_size
+        if len(self._mm) != expected:
+            self.close()
+            raise ValueError(f"{path}: truncated or corrupt archive")
+
+    def _read_header(self) -> ArchiveHeader:
+        try:
+            (magic, version, eid, fp, count, width, ncand, has_root, root,
+             created) = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path}: not a ballot archive")
+        candidates = [
+            (uuid.UUID(bytes=cid), first, n)
+            for cid, first, n in (_CANDIDATE.unpack_from(self._mm, _HEADER.size + i * _CANDIDATE.size)
+                                  for i in range(ncand))
+        ]
+        return ArchiveHeader(uuid.UUID(bytes=eid), fp.hex(), count, width, candidates,
+                             root if has_root else None, created)
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Record]:
+        h = self.header
+        stop = h.count if stop is None else stop
+        with memoryview(self._mm) as mv:
+            for i in range(start, stop):
+                off = h.data_offset + i * h.record_size
+                leaf_index, vid, leaf = _RECORD_HEAD.unpack_from(mv, off)
+                c = int.from_bytes(mv[off + _RECORD_HEAD.size:off + h.record_size], "big")
+                yield (None if leaf_index < 0 else leaf_index, uuid.UUID(bytes=vid), leaf, c)
+
+    def product(self, start: int, stop: int, nsquare: int) -> int:
+        """Homomorphic sum (product mod n^2) of records [start, stop)."""
+        h = self.header
+        skip, size = h.data_offset + _RECORD_HEAD.size, h.record_size
+        nsq = gmpy2.mpz(nsquare) if gmpy2 is not None else nsquare
+        acc = gmpy2.mpz(1) if gmpy2 is not None else 1
+        with memoryview(self._mm) as mv:
+            for off in range(skip + start * size, skip + stop * size, size):
+                acc = acc * int.from_bytes(mv[off:off + h.width], "big") % nsq
+        return int(acc)
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def chunk_product(path: str, start: int, stop: int, nsquare: int) -> int:
+    """Process-pool entry point: each worker maps the file itself."""
+    with BallotArchive(path) as archive:
+        return archive.product(start, stop, nsquare)
+
+
+def combine(products: Iterable[int], nsquare: int) -> int:
+    return reduce(lambda a, b: a * b % nsquare, products, 1)
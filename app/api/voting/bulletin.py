@@ -0,0 +1,296 @@
+"""
+Append-only bulletin board of encrypted ballots.
+
+Each committed vote gets a receipt: the Merkle leaf hash of its id and
+ciphertext, computed at cast time.  Leaves are appended in batches by a
+background task: one transaction per election and batch locks the
+`bulletin_head` row, extends the frontier, and writes the new leaves plus
+the perfect-subtree nodes they complete.  The head is signed (Ed25519) so
+voters and auditors can check inclusion proofs against a committed root.
+
+Votes that were committed but never appended (e.g. a worker died before
+its flush) are picked up by `backfill` at startup.  Appends skip votes
+that are already on the board, so a backfill racing a flush (or another
+backfill) appends each vote once.
+"""
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session
+from app.api.voting import merkle
+from app.api.voting.models import BulletinHead, BulletinLeaf, BulletinNode, Vote
+
+log = logging.getLogger(__name__)
+
+BULLETIN_FLUSH_INTERVAL = float(os.getenv("BULLETIN_FLUSH_INTERVAL", "0.2"))
+BULLETIN_BATCH_SIZE = int(os.getenv("BULLETIN_BATCH_SIZE", "5000"))
+
+Pending = Tuple[uuid.UUID, bytes]           # (vote_id, leaf hash)
+
+
+def receipt_for(vote_id: uuid.UUID, encrypted_vote: str) -> bytes:
+    return merkle.leaf_hash(vote_id.bytes + encrypted_vote.encode())
+
+
+# ---------- signed tree heads ---------------------------------------------- #
+
+_signing_key = None
+
+
+def _get_signing_key():
+    """Ed25519 key shared by all workers, stored next to the election keys."""
+    global _signing_key
+    if _signing_key is None:
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+        from app.api.crypto.key_store import KEY_DIR
+
+        path = KEY_DIR / "bulletin_signing.key"
+        if not path.exists():
+            _create_signing_key(path)
+        _signing_key = Ed25519PrivateKey.from_private_bytes(path.read_bytes())
+    return _signing_key
+
+
+def _create_signing_key(path) -> None:
+    """Write a new key unless another worker got there first (whose key wins)."""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex}")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(Ed25519PrivateKey.generate().private_bytes(
+            serialization.Encoding.Raw, serialization.PrivateFormat.Raw,
+            serialization.NoEncryption()))
+    try:
+        os.link(tmp, path)              # atomic, and fails if the key exists
+    except FileExistsError:
+        pass
+    finally:
+        os.unlink(tmp)
+
+
+def sign_head(head: BulletinHead) -> dict:
+    from cryptography.hazmat.primitives import serialization
+
+    body = {
+        "election_id": str(head.election_id),
+        "tree_size": head.tree_size,
+        "root": (head.root or merkle.EMPTY_ROOT).hex(),
+        "timestamp": head.updated_at.isoformat(),
+    }
+    key = _get_signing_key()
+    message = json.dumps(body, sort_keys=True, separators=(",", ":")).encode()
+    public = key.public_key().public_bytes(serialization.Encoding.Raw,
+                                           serialization.PublicFormat.Raw)
+    return {**body, "signature": key.sign(message).hex(), "public_key": public.hex()}
+
+
+# ---------- appending ------------------------------------------------------ #
+
+async def _locked_head(session: AsyncSession, election_id: uuid.UUID) -> BulletinHead:
+    head = (await session.execute(
+        select(BulletinHead)
+        .where(BulletinHead.election_id == election_id)
+        .with_for_update()
+    )).scalar_one_or_none()
+    if head is None:
+        head = BulletinHead(election_id=election_id, tree_size=0, frontier="[]")
+        session.add(head)
+    return head
+
+
+async def _not_on_board(session: AsyncSession, head: BulletinHead,
+                        pending: List[Pending]) -> List[Pending]:
+    if not head.tree_size:
+        return pending
+    present = set((await session.scalars(
+        select(BulletinLeaf.vote_id).where(
+            BulletinLeaf.election_id == head.election_id,
+            BulletinLeaf.vote_id.in_([vote_id for vote_id, _ in pending]))
+    )).all())
+    return [p for p in pending if p[0] not in present]
+
+
+async def append_leaves(session: AsyncSession, election_id: uuid.UUID,
+                        pending: List[Pending],
+                        head: Optional[BulletinHead] = None) -> BulletinHead:
+    """
+    Append leaves in one transaction; caller commits.  Leaves already on the
+    board are skipped, unless the caller passes the `head` it has locked and
+    chose `pending` under.
+    """
+    if head is None:
+        head = await _locked_head(session, election_id)
+        pending = await _not_on_board(session, head, pending)
+    if not pending:
+        return head
+
+    frontier = merkle.Frontier.from_json(head.tree_size, json.loads(head.frontier))
+    leaves, nodes = [], []
+    for vote_id, leaf in pending:
+        for level, index, h in frontier.append(leaf):
+            if level == 0:
+                leaves.append({"election_id": election_id, "leaf_index": index,
+                               "leaf_hash": h, "vote_id": vote_id})
+            else:
+                nodes.append({"election_id": election_id, "level": level,
+                              "node_index": index, "hash": h})
+
+    await session.execute(BulletinLeaf.__table__.insert(), leaves)
+    if nodes:
+        await session.execute(BulletinNode.__table__.insert(), nodes)
+    head.tree_size = frontier.size
+    head.frontier = json.dumps(frontier.to_json())
+    head.root = frontier.root()
+    head.updated_at = datetime.utcnow()
+    return head
+
+
+class BulletinBoard:
+    """Buffers receipts of committed votes and appends them in batches."""
+
+    def __init__(self, interval: float = BULLETIN_FLUSH_INTERVAL,
+                 batch_size: int = BULLETIN_BATCH_SIZE):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._pending: Dict[uuid.UUID, List[Pending]] = defaultdict(list)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, election_id: uuid.UUID, vote_id: uuid.UUID, leaf: bytes) -> None:
+        self._pending[election_id].append((vote_id, leaf))
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        if sum(map(len, self._pending.values())) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        batches, self._pending = self._pending, defaultdict(list)
+        for election_id, pending in batches.items():
+            for attempt in range(5):
+                try:
+                    async with async_session() as session:
+                        await append_leaves(session, election_id, pending)
+                        await session.commit()
+                    break
+                except IntegrityError:
+                    # another worker appended concurrently (no row locks on SQLite)
+                    await asyncio.sleep(0.01 * 2 ** attempt)
+            else:
+                log.error("Could not append %d leaves for %s; backfill will retry",
+                          len(pending), election_id)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._pending:
+                try:
+                    await self.flush()
+                except Exception:
+                    log.exception("Bulletin board flush failed")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._pending:
+            await self.flush()
+
+
+board = BulletinBoard()
+
+
+async def backfill(election_id: uuid.UUID) -> int:
+    """Append committed votes that are missing from the board, in cast order."""
+    for attempt in range(5):
+        try:
+            return await _backfill(election_id)
+        except IntegrityError:
+            # a concurrent append won (no row locks on SQLite); look again
+            await asyncio.sleep(0.01 * 2 ** attempt)
+    log.error("Could not backfill the board of %s", election_id)
+    return 0
+
+
+async def _backfill(election_id: uuid.UUID) -> int:
+    async with async_session() as session:
+        # under the head lock, so no other append interleaves with this one
+        head = await _locked_head(session, election_id)
+        votes = await session.scalar(
+            select(func.count()).select_from(Vote).where(Vote.election_id == election_id))
+        if votes == head.tree_size:         # the common case: nothing missing
+            return 0
+        rows = (await session.execute(
+            select(Vote.id, Vote.encrypted_vote)
+            .outerjoin(BulletinLeaf, BulletinLeaf.vote_id == Vote.id)
+            .where(Vote.election_id == election_id, BulletinLeaf.vote_id.is_(None))
+            .order_by(Vote.cast_at, Vote.id)
+        )).all()
+        if rows:
+            await append_leaves(session, election_id,
+                                [(vid, receipt_for(vid, ct)) for vid, ct in rows], head)
+            await session.commit()
+    return len(rows)
+
+
+# ---------- reading -------------------------------------------------------- #
+
+async def get_head(session: AsyncSession, election_id: uuid.UUID) -> BulletinHead:
+    head = await session.get(BulletinHead, election_id)
+    return head or BulletinHead(election_id=election_id, tree_size=0,
+                                root=merkle.EMPTY_ROOT, updated_at=datetime.utcnow())
+
+
+async def get_inclusion_proof(session: AsyncSession, election_id: uuid.UUID,
+                              receipt: bytes) -> Optional[dict]:
+    """Audit path for a receipt against the current head, or None if not (yet) on the board."""
+    leaf = (await session.execute(
+        select(BulletinLeaf).where(BulletinLeaf.election_id == election_id,
+                                   BulletinLeaf.leaf_hash == receipt)
+    )).scalar_one_or_none()
+    if leaf is None:
+        return None
+    head = await get_head(session, election_id)
+
+    needed = merkle.proof_nodes(leaf.leaf_index, head.tree_size)
+    nodes = {}
+    leaf_ids = [i for level, i in needed if level == 0]
+    inner = [(level, i) for level, i in needed if level > 0]
+    if leaf_ids:
+        rows = await session.execute(
+            select(BulletinLeaf.leaf_index, BulletinLeaf.leaf_hash)
+            .where(BulletinLeaf.election_id == election_id,
+                   BulletinLeaf.leaf_index.in_(leaf_ids)))
+        nodes.update({(0, i): h for i, h in rows})
+    if inner:
+        rows = await session.execute(
+            select(BulletinNode.level, BulletinNode.node_index, BulletinNode.hash)
+            .where(BulletinNode.election_id == election_id,
+                   tuple_(BulletinNode.level, BulletinNode.node_index).in_(inner)))
+        nodes.update({(lv, i): h for lv, i, h in rows})
+
+    proof = merkle.inclusion_proof(leaf.leaf_index, head.tree_size, nodes)
+    return {
+        "receipt": receipt.hex(),
+        "vote_id": leaf.vote_id,
+        "leaf_index": leaf.leaf_index,
+        "audit_path": [p.hex() for p in proof],
+        "tree_head": sign_head(head),
+    }
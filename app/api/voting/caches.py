@@ -0,0 +1,87 @@
+"""
+Host-wide caches for the voting read paths (see app/cache.py).
+
+  elections    election listing pages and per-election voting windows;
+               any Election or Candidate write invalidates the namespace
+  eligibility  (election id, email) -> on the voter list
+  voted        (election id, user id) -> has a vote; cast_vote invalidates
+               the key once its vote is committed
+
+ORM writes invalidate through the listeners below, after commit.  Scripts
+that bulk-insert with Core call `cache.invalidate(<namespace>)`.
+
+An election's tally mode never changes, so `tally_mode()` keeps it in a
+plain per-process dict with no invalidation at all.
+"""
+from datetime import datetime
+from typing import Dict, NamedTuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import object_session
+
+from app import cache
+from app.api.voting.models import Candidate, Election, Vote, VoterList
+
+elections = cache.Cache("elections", maxsize=4096, shared=True)
+eligibility = cache.Cache("eligibility", maxsize=65536, shared=True)
+voted = cache.Cache("voted", maxsize=65536, shared=True)
+_tally_modes: Dict[UUID, str] = {}
+
+
+class VotingWindow(NamedTuple):
+    """The part of an Election that decides whether voting is open."""
+    is_active: bool
+    start_date: datetime
+    end_date: datetime
+
+    @classmethod
+    def of(cls, election: Election) -> "VotingWindow":
+        return cls(election.is_active, election.start_date, election.end_date)
+
+    is_voting_open = Election.is_voting_open       # evaluated at read time
+
+
+async def tally_mode(session: AsyncSession, election_id: UUID) -> str:
+    """The election's tally mode; one query per election per process."""
+    mode = _tally_modes.get(election_id)
+    if mode is None:
+        mode = await session.scalar(select(Election.tally_mode).where(Election.id == election_id))
+        if mode is None:
+            raise HTTPException(status_code=404, detail="Election not found")
+        _tally_modes[election_id] = mode
+    return mode
+
+
+# ---------- invalidation --------------------------------------------------- #
+
+@event.listens_for(Election, "after_insert")
+@event.listens_for(Election, "after_update")
+@event.listens_for(Election, "after_delete")
+@event.listens_for(Candidate, "after_insert")
+@event.listens_for(Candidate, "after_update")
+@event.listens_for(Candidate, "after_delete")
+def _election_changed(mapper, connection, target):
+    cache.invalidate_after_commit(object_session(target), elections.namespace)
+
+
+@event.listens_for(VoterList, "after_insert")
+@event.listens_for(VoterList, "after_delete")
+def _voter_added_or_removed(mapper, connection, target):
+    cache.invalidate_after_commit(object_session(target), eligibility.namespace,
+                                  (target.election_id, target.email))
+
+
+@event.listens_for(VoterList, "after_update")
+def _voter_changed(mapper, connection, target):
+    # the old (election, email) key is gone by now; drop them all
+    cache.invalidate_after_commit(object_session(target), eligibility.namespace)
+
+
+@event.listens_for(Vote, "after_insert")
+@event.listens_for(Vote, "after_delete")
+def _vote_changed(mapper, connection, target):
+    cache.invalidate_after_commit(object_session(target), voted.namespace,
+                                  (target.election_id, target.user_id))
@@ -0,0 +1,148 @@
+"""
+Election lifecycle: final results are computed once, when voting closes.
+
+A background scheduler sleeps until the next `end_date` (re-checking at
+least every LIFECYCLE_POLL_SECONDS so new elections are noticed), waits a
+short grace period for in-flight votes to commit, then tallies the
+election and stores an immutable `ElectionResult` snapshot.  Closed
+elections are served from the snapshot instead of being re-counted.
+
+Every worker runs the scheduler; the snapshot's primary key makes the
+insert idempotent, so whichever worker gets there first wins.
+"""
+import asyncio
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session
+from app.api.voting.models import Candidate, Election, ElectionResult, Vote, VoterList
+
+log = logging.getLogger(__name__)
+
+LIFECYCLE_POLL_SECONDS = float(os.getenv("LIFECYCLE_POLL_SECONDS", "60"))
+# Votes whose transaction started before end_date may still be committing
+RESULT_GRACE_SECONDS = float(os.getenv("RESULT_GRACE_SECONDS", "5"))
+
+
+async def compute_tally(session: AsyncSession, election_id: uuid.UUID) -> dict:
+    """Per-candidate counts and turnout for an election, in one GROUP BY query."""
+    eligible = (
+        select(func.count()).select_from(VoterList)
+        .where(VoterList.election_id == election_id)
+        .scalar_subquery()
+    )
+    rows = (await session.execute(
+        select(Candidate.id, func.count(Vote.id), eligible)
+        .outerjoin(Vote, and_(Vote.candidate_id == Candidate.id,
+                              Vote.election_id == election_id))
+        .where(Candidate.election_id == election_id)
+        .group_by(Candidate.id)
+    )).all()
+    # one vote per user per election, so ballots cast == voters who voted
+    total = sum(n for _, n, _ in rows)
+    return {
+        "counts": {str(cid): n for cid, n, _ in rows},
+        "total_votes": total,
+        "eligible_voters": rows[0][2] if rows else await session.scalar(select(eligible)),
+        "voted": total,
+    }
+
+
+async def snapshot_election(election_id: uuid.UUID) -> Optional[ElectionResult]:
+    """Tally a closed election and store its snapshot (no-op if already stored)."""
+    async with async_session() as session:
+        existing = await session.get(ElectionResult, election_id)
+        if existing is not None:
+            return existing
+        election = await session.get(Election, election_id)
+        if election is None or election.end_date > datetime.utcnow():
+            return None
+
+        tally = await compute_tally(session, election_id)
+        snapshot = ElectionResult(
+            election_id=election_id,
+            counts=json.dumps(tally["counts"]),
+            total_votes=tally["total_votes"],
+            eligible_voters=tally["eligible_voters"],
+            voted=tally["voted"],
+            computed_at=datetime.utcnow(),
+        )
+        session.add(snapshot)
+        try:
+            await session.commit()
+        except IntegrityError:          # another worker stored it first
+            await session.rollback()
+            return await session.get(ElectionResult, election_id)
+    log.info("Stored final results for election %s", election_id)
+    return snapshot
+
+
+def _without_snapshot(*columns):
+    return (
+        select(*columns)
+        .select_from(Election)
+        .outerjoin(ElectionResult, ElectionResult.election_id == Election.id)
+        .where(ElectionResult.election_id.is_(None))
+    )
+
+
+class LifecycleScheduler:
+    """Background task that snapshots each election once its voting closes."""
+
+    def __init__(self, poll: float = LIFECYCLE_POLL_SECONDS,
+                 grace: float = RESULT_GRACE_SECONDS):
+        self.poll = poll
+        self.grace = grace
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> Optional[datetime]:
+        """Snapshot every due election; return the next end_date still ahead."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.grace)
+        async with async_session() as session:
+            due = (await session.scalars(
+                _without_snapshot(Election.id).where(Election.end_date <= cutoff)
+            )).all()
+            upcoming = await session.scalar(
+                _without_snapshot(func.min(Election.end_date))
+                .where(Election.end_date > cutoff)
+            )
+        for election_id in due:
+            try:
+                await snapshot_election(election_id)
+            except Exception:
+                log.exception("Could not snapshot results for %s", election_id)
+        return upcoming
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                upcoming = await self.run_once()
+            except Exception:
+                log.exception("Election lifecycle check failed")
+                upcoming = None
+            delay = self.poll
+            if upcoming is not None:
+                due_in = (upcoming - datetime.utcnow()).total_seconds() + self.grace
+                delay = max(0.0, min(delay, due_in))
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+scheduler = LifecycleScheduler()
@@ -0,0 +1,138 @@
+"""
+Incremental Merkle tree (RFC 6962 / 9162 hashing) for the bulletin board.
+
+The tree is never held in memory.  Appends only need the *frontier*: the
+roots of the perfect subtrees that make up the current tree, one per set
+bit of the tree size.  Every perfect subtree root that an append
+completes is reported as a (level, index, hash) node so callers can store
+it; inclusion proofs are then assembled from O(log n) stored nodes.
+"""
+import hashlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+Node = Tuple[int, int]                      # (level, index): leaves are level 0
+
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+
+class Frontier:
+    """Right edge of an append-only Merkle tree of `size` leaves."""
+
+    def __init__(self, size: int = 0, hashes: Optional[List[Optional[bytes]]] = None):
+        self.size = size
+        # hashes[level] is the root of a perfect subtree of 2**level leaves
+        self.hashes: List[Optional[bytes]] = list(hashes or [])
+
+    def append(self, leaf: bytes) -> List[Tuple[int, int, bytes]]:
+        """Append a leaf hash; returns every node completed by it (incl. the leaf)."""
+        index, h, level = self.size, leaf, 0
+        completed = [(0, index, leaf)]
+        while level < len(self.hashes) and self.hashes[level] is not None:
+            h = node_hash(self.hashes[level], h)
+            self.hashes[level] = None
+            level += 1
+            completed.append((level, index >> level, h))
+        if level == len(self.hashes):
+            self.hashes.append(None)
+        self.hashes[level] = h
+        self.size += 1
+        return completed
+
+    def root(self) -> bytes:
+        acc = None
+        for h in self.hashes:                   # smallest subtree first
+            if h is not None:
+                acc = h if acc is None else node_hash(h, acc)
+        return acc if acc is not None else EMPTY_ROOT
+
+    def to_json(self) -> List[Optional[str]]:
+        return [h.hex() if h else None for h in self.hashes]
+
+    @classmethod
+    def from_json(cls, size: int, data: List[Optional[str]]) -> "Frontier":
+        return cls(size, [bytes.fromhex(h) if h else None for h in data])
+
+
+# ---------- inclusion proofs ------------------------------------------------ #
+
+def _split(n: int) -> int:
+    """Largest power of two strictly smaller than n (n > 1)."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+
+def _range_nodes(start: int, size: int, out: List[Node]) -> None:
+    """Stored perfect-subtree nodes whose hashes make up MTH(D[start:start+size])."""
+    if size & (size - 1) == 0:
+        level = size.bit_length() - 1
+        out.append((level, start >> level))
+        return
+    k = _split(size)
+    _range_nodes(start, k, out)
+    _range_nodes(start + k, size - k, out)
+
+
+def _range_hash(start: int, size: int, get: Callable[[Node], bytes]) -> bytes:
+    if size & (size - 1) == 0:
+        level = size.bit_length() - 1
+        return get((level, start >> level))
+    k = _split(size)
+    return node_hash(_range_hash(start, k, get), _range_hash(start + k, size - k, get))
+
+
+def _path_ranges(m: int, n: int) -> List[Tuple[int, int]]:
+    """(start, size) of each sibling subtree in PATH(m, D[0:n]), leaf first."""
+    ranges, start = [], 0
+    while n > 1:
+        k = _split(n)
+        if m < k:
+            ranges.append((start + k, n - k))
+            n = k
+        else:
+            ranges.append((start, k))
+            start, m, n = start + k, m - k, n - k
+    return ranges[::-1]
+
+
+def proof_nodes(m: int, n: int) -> List[Node]:
+    """All stored nodes needed to prove leaf m in a tree of size n."""
+    nodes: List[Node] = []
+    for start, size in _path_ranges(m, n):
+        _range_nodes(start, size, nodes)
+    return nodes
+
+
+def inclusion_proof(m: int, n: int, nodes: Dict[Node, bytes]) -> List[bytes]:
+    """RFC 6962 audit path for leaf m, from the nodes listed by proof_nodes."""
+    return [_range_hash(start, size, nodes.__getitem__)
+            for start, size in _path_ranges(m, n)]
+
+
+def verify_inclusion(leaf: bytes, m: int, n: int,
+                     proof: List[bytes], root: bytes) -> bool:
+    """RFC 9162 section 2.1.3.2 verification."""
+    if m >= n:
+        return False
+    fn, sn, r = m, n - 1, leaf
+    for p in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            if not fn & 1:
+                while fn & 1 == 0 and fn != 0:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r == root
@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
 from sqlalchemy import (
-    String, Text, DateTime, Boolean, Integer, ForeignKey, UniqueConstraint, Column
+    String, Text, DateTime, Boolean, Integer, BigInteger, LargeBinary, ForeignKey,
+    UniqueConstraint, Column, Index
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -22,12 +23,22 @@ class Election(Base):
     end_date = Column(DateTime, nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # "homomorphic" (ballots encrypt 1, summed per candidate) or "mixnet"
+    # (ballots encrypt the candidate id, shuffled then decrypted one by one);
+    # fixed when the election is created
+    tally_mode = Column(String(16), nullable=False, default="homomorphic",
+                        server_default="homomorphic")
 
     # Relationships
     candidates = relationship("Candidate", back_populates="election", cascade="all, delete-orphan")
     voter_list = relationship("VoterList", back_populates="election", cascade="all, delete-orphan")
     votes = relationship("Vote", back_populates="election", cascade="all, delete-orphan")
 
+    # Keyset pagination order for listings
+    __table_args__ = (
+        Index("ix_election_active_created", "is_active", "created_at", "id"),
+    )
+
     @property
     def is_voting_open(self) -> bool:
         """Check if voting is currently open"""
@@ -54,34 +65,40 @@ class VoterList(Base):
     """VoterList model - predefined list of eligible voters for each election"""
     __tablename__ = "voter_list"
 
+    # election_id is part of the key so the table can be partitioned by it
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String(255), nullable=False)
-    election_id = Column(UUID(as_uuid=True), ForeignKey("election.id", ondelete="CASCADE"), nullable=False)
+    election_id = Column(UUID(as_uuid=True), ForeignKey("election.id", ondelete="CASCADE"),
+                         primary_key=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     election = relationship("Election", back_populates="voter_list")
 
-    # Ensure one entry per email per election
-    __table_args__ = (UniqueConstraint('email', 'election_id', name='unique_voter_per_election'),)
+    # Ensure one entry per email per election; one partition per election on Postgres
+    __table_args__ = (
+        UniqueConstraint('email', 'election_id', name='unique_voter_per_election'),
+        Index("ix_voter_list_election_created", "election_id", "created_at", "id"),
+        {"postgresql_partition_by": "LIST (election_id)"},
+    )
 
 
 class Vote(Base):
     """Vote model - represents a cast vote (encrypted for privacy)"""
     __tablename__ = "vote"
 
+    # election_id is part of the key so the table can be partitioned by it
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
-    election_id = Column(UUID(as_uuid=True), ForeignKey("election.id", ondelete="CASCADE"), nullable=False)
+    election_id = Column(UUID(as_uuid=True), ForeignKey("election.id", ondelete="CASCADE"),
+                         primary_key=True)
     candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidate.id", ondelete="CASCADE"), nullable=False)
 
     # Encrypted vote for privacy (using Paillier homomorphic encryption)
     encrypted_vote = Column(Text, nullable=False)  # Base64 encoded encrypted vote
 
-    # Security and audit fields
+    # Security fields; client address and user agent go to the audit log
     mfa_verified = Column(Boolean, default=False, nullable=False)
-    ip_address = Column(String(45), nullable=True)  # For audit trail
-    user_agent = Column(String(500), nullable=True)  # For audit trail
     cast_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
@@ -89,5 +106,60 @@ class Vote(Base):
     election = relationship("Election", back_populates="votes")
     candidate = relationship("Candidate", back_populates="votes")
 
-    # Ensure one vote per user per election
-    __table_args__ = (UniqueConstraint('user_id', 'election_id', name='one_vote_per_user_per_election'),)
\ No newline at end of file
+    # Ensure one vote per user per election; one partition per election on Postgres
+    __table_args__ = (
+        UniqueConstraint('user_id', 'election_id', name='one_vote_per_user_per_election'),
+        Index("ix_vote_election_cast", "election_id", "cast_at", "id"),
+        {"postgresql_partition_by": "LIST (election_id)"},
+    )
+
+
+class ElectionResult(Base):
+    """Final results of a closed election - written once, never updated"""
+    __tablename__ = "election_result"
+
+    election_id = Column(UUID(as_uuid=True), ForeignKey("election.id", ondelete="CASCADE"),
+                         primary_key=True)
+    counts = Column(Text, nullable=False)  # JSON {candidate_id: votes}
+    total_votes = Column(Integer, nullable=False)
+    eligible_voters = Column(Integer, nullable=False)
+    voted = Column(Integer, nullable=False)
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class BulletinLeaf(Base):
+    """Bulletin board leaf - hash of one stored ballot, in append order"""
+    __tablename__ = "bulletin_leaf"
+
+    election_id = Column(UUID(as_uuid=True), ForeignKey("election.id", ondelete="CASCADE"),
+                         primary_key=True)
+    leaf_index = Column(BigInteger, primary_key=True)
+    leaf_hash = Column(LargeBinary(32), nullable=False, index=True)  # = vote receipt
+    vote_id = Column(UUID(as_uuid=True), nullable=False, unique=True)
+
+
+class BulletinNode(Base):
+    """Bulletin board interior node - root of a perfect subtree (level >= 1)"""
+    __tablename__ = "bulletin_node"
+
+    election_id = Column(UUID(as_uuid=True), ForeignKey("election.id", ondelete="CASCADE"),
+                         primary_key=True)
+    level = Column(Integer, primary_key=True)
+    node_index = Column(BigInteger, primary_key=True)
+    hash = Column(LargeBinary(32), nullable=False)
+
+
+class BulletinHead(Base):
+    """Bulletin board head - tree size and frontier, the only state appends need"""
+    __tablename__ = "bulletin_head"
+
+    election_id = Column(UUID(as_uuid=True), ForeignKey("election.id", ondelete="CASCADE"),
+                         primary_key=True)
+    tree_size = Column(BigInteger, nullable=False, default=0)
+    frontier = Column(Text, nullable=False, default="[]")  # JSON list of hex hashes
+    root = Column(LargeBinary(32), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+# Per-election partitions are created alongside each new Election (Postgres only)
+from app.api.voting import partitions  # noqa: E402,F401
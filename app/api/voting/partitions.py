@@ -0,0 +1,72 @@
+"""
+Postgres list partitioning of `vote` and `voter_list` by election.
+
+Each Election gets its own partition of both tables, created in the same
+transaction as the election row.  Rows for elections created before
+partitioning was enabled land in the DEFAULT partition.  Once an election
+is closed its partitions can be detached into stand-alone tables, which can
+then be dumped and dropped without touching the live tables.
+
+Other dialects (SQLite in dev) are left unpartitioned; every helper here is
+a no-op for them.
+"""
+import uuid
+from typing import List
+
+from sqlalchemy import DDL, event, text
+from sqlalchemy.engine import Connection
+
+from app.api.voting.models import Election, Vote, VoterList
+
+PARTITIONED_TABLES = (Vote.__tablename__, VoterList.__tablename__)
+
+
+def partition_name(table: str, election_id: uuid.UUID) -> str:
+    return f"{table}_e_{election_id.hex}"
+
+
+def _is_postgres(conn: Connection) -> bool:
+    return conn.dialect.name == "postgresql"
+
+
+def create_partitions(conn: Connection, election_id: uuid.UUID) -> None:
+    if not _is_postgres(conn):
+        return
+    for table in PARTITIONED_TABLES:
+        conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{partition_name(table, election_id)}" '
+            f"PARTITION OF \"{table}\" FOR VALUES IN ('{election_id}')"
+        ))
+
+
+def detach_partitions(conn: Connection, election_id: uuid.UUID) -> List[str]:
+    """Detach an election's partitions; returns the now stand-alone table names."""
+    if not _is_postgres(conn):
+        return []
+    detached = []
+    for table in PARTITIONED_TABLES:
+        name = partition_name(table, election_id)
+        conn.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+        detached.append(name)
+    return detached
+
+
+def explain_vote_lookup(conn: Connection, election_id: uuid.UUID) -> List[str]:
+    """EXPLAIN of a per-election vote count; only one partition should appear."""
+    rows = conn.execute(
+        text("EXPLAIN SELECT count(*) FROM vote WHERE election_id = :eid"),
+        {"eid": election_id},
+    )
+    return [r[0] for r in rows]
+
+
+@event.listens_for(Election, "after_insert")
+def _create_election_partitions(mapper, connection, target):
+    create_partitions(connection, target.id)
+
+
+for _table in (Vote.__table__, VoterList.__table__):
+    event.listen(_table, "after_create", DDL(
+        f'CREATE TABLE IF NOT EXISTS "{_table.name}_default" '
+        f'PARTITION OF "{_table.name}" DEFAULT'
+    ).execute_if(dialect="postgresql"))
@@ -1,90 +1,118 @@
+import asyncio
+import json
 from datetime import datetime
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from uuid import UUID
+from sqlalchemy import and_, select, exists, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from uuid import UUID, uuid4
 import pyotp
 
-from app.database import get_async_session
+from app import cache
+from app.database import engine, get_async_session, get_read_session, mark_recent_write
 from app.api.auth.deps import current_active_user
 from app.api.auth.models import User
-from app.api.voting.models import Election, Candidate, VoterList, Vote
+from app.api.pagination import NEXT_CURSOR_HEADER, keyset_page, next_cursor, page_limit
+from app.api.voting.models import Election, Candidate, VoterList, Vote, ElectionResult
 from app.api.voting.schemas import (
-    ElectionRead, VoterStatusResponse, VoteRequest, VoteResponse,
-    ElectionResultsResponse, VoteConfirmationRequest
+    CandidateRead, ElectionRead, VoterStatusResponse, VoteRequest, VoteResponse,
+    ElectionResultsResponse, VoteConfirmationRequest, SignedTreeHead,
+    InclusionProofResponse, BatchVoteRequest, BatchVoteResponse, CastBallot
 )
-from app.api.crypto.paillier_utils import encrypt_ballot, generate_keypair
+from app.api.voting import bulletin, caches, turnout
+from app.api.audit import log as audit
 
 router = APIRouter(prefix="/voting", tags=["voting"])
 
 
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
 @router.get("/elections", response_model=List[ElectionRead])
 async def list_elections(
-        session: AsyncSession = Depends(get_async_session),
+        response: Response,
+        after: Optional[str] = Query(None, description="cursor from X-Next-Cursor"),
+        limit: int = Depends(page_limit),
+        active: bool = True,
+        title: Optional[str] = Query(None, max_length=200, description="title contains"),
+        session: AsyncSession = Depends(get_read_session),
         user: User = Depends(current_active_user)
 ):
-    """Get list of all active elections"""
-    query = (
-        select(Election)
-        .where(Election.is_active == True)
-        .options(selectinload(Election.candidates))
-    )
-    result = await session.execute(query)
-    elections = result.scalars().all()
-    return elections
+    """Get one page of elections (active ones by default), oldest first"""
+
+    async def load():
+        query = (
+            select(Election)
+            .where(Election.is_active == active)
+            .options(selectinload(Election.candidates))
+        )
+        if title:
+            query = query.where(Election.title.contains(title, autoescape=True))
+        query = keyset_page(query, (Election.created_at, Election.id), after, limit)
+        elections = list((await session.execute(query)).scalars().all())
+        cursor = next_cursor(elections, lambda e: (e.created_at, e.id), limit)
+        return [ElectionRead.model_validate(e) for e in elections], cursor
 
+    elections, cursor = await caches.elections.get_or_load(
+        ("page", active, title, after, limit), load)
+
+    # the body stays a plain list; the cursor for the next page goes in a header
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    # cached pages outlive the voting window; recompute it per request
+    return [e.model_copy(update={"is_voting_open": Election.is_voting_open.fget(e)})
+            for e in elections]
 
 
 @router.get("/elections/{election_id}/status", response_model=VoterStatusResponse)
 async def get_voter_status(
         election_id: UUID,
-        session: AsyncSession = Depends(get_async_session),
+        session: AsyncSession = Depends(get_read_session),
         user: User = Depends(current_active_user)
 ):
     """Check if user can vote in this election and if they have already voted"""
 
-    # Check if election exists and is active
-    election_query = select(Election).where(Election.id == election_id)
-    election_result = await session.execute(election_query)
-    election = election_result.scalar_one_or_none()
-
-    if not election:
-        raise HTTPException(status_code=404, detail="Election not found")
-
-    if not election.is_voting_open:
+    keys = ((caches.elections, ("window", election_id)),
+            (caches.eligibility, (election_id, user.email)),
+            (caches.voted, (election_id, user.id)))
+    window, eligible, has_voted = (c.get(k) for c, k in keys)
+    if cache.MISSING in (window, eligible, has_voted):
+        stamps = [c.stamp(k) for c, k in keys]
+        # Election, voter-list membership and an existing vote in one query
+        row = (await session.execute(
+            select(
+                Election,
+                exists().where(VoterList.election_id == election_id,
+                               VoterList.email == user.email),
+                exists().where(Vote.user_id == user.id,
+                               Vote.election_id == election_id),
+            ).where(Election.id == election_id)
+        )).first()
+
+        if not row:
+            raise HTTPException(status_code=404, detail="Election not found")
+        window, eligible, has_voted = caches.VotingWindow.of(row[0]), row[1], row[2]
+        for (c, k), stamp, value in zip(keys, stamps, (window, eligible, has_voted)):
+            # a lagging replica may not have this user's vote yet
+            if c is not caches.voted or session.bind is engine:
+                c.set(k, value, stamp)
+
+    if not window.is_voting_open:
         return VoterStatusResponse(
             can_vote=False,
             has_voted=False,
             message="Voting is not currently open for this election"
         )
 
-    # Check if user is in voter list
-    voter_query = select(VoterList).where(
-        VoterList.election_id == election_id,
-        VoterList.email == user.email
-    )
-    voter_result = await session.execute(voter_query)
-    voter_entry = voter_result.scalar_one_or_none()
-
-    if not voter_entry:
+    if not eligible:
         return VoterStatusResponse(
             can_vote=False,
             has_voted=False,
             message="You are not eligible to vote in this election"
         )
 
-    # Check if user has already voted
-    vote_query = select(Vote).where(
-        Vote.user_id == user.id,
-        Vote.election_id == election_id
-    )
-    vote_result = await session.execute(vote_query)
-    existing_vote = vote_result.scalar_one_or_none()
-
-    if existing_vote:
+    if has_voted:
         return VoterStatusResponse(
             can_vote=False,
             has_voted=True,
@@ -111,6 +139,7 @@ async def cast_vote(
         election_id: UUID,
         vote_request: VoteConfirmationRequest,
         request: Request,
+        response: Response,
         session: AsyncSession = Depends(get_async_session),
         user: User = Depends(current_active_user)
 ):
@@ -124,74 +153,354 @@ async def cast_vote(
         )
 
     if not pyotp.TOTP(user.mfa_secret).verify(vote_request.mfa_code):
+        audit.record("vote.mfa_failed", user_id=user.id, request=request,
+                     election_id=election_id)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid MFA code"
         )
 
-    # Check voter status
-    voter_status = await get_voter_status(election_id, session, user)
-    if not voter_status.can_vote:
+    # crypto modules load on first vote, not at import time
+    from app.api.crypto import executor
+    from app.api.crypto.paillier_utils import encrypt_ballot
+
+    election_key = await _election_key(session, election_id)
+    mode = await caches.tally_mode(session, election_id)
+
+    if vote_request.encrypted_vote is not None:
+        _check_client_ballot_mode(mode)
+        encrypted_vote_data = await _verified_client_ballot(vote_request, election_key.public)
+    else:
+        # Encrypt "1" (one vote) under the election's Paillier key, or the
+        # candidate itself when the ballots are mixed and decrypted one by one;
+        # on the crypto pool, so the exponentiation doesn't block the event loop
+        encrypted_vote_data = await executor.run(
+            encrypt_ballot, _ballot_plaintext(mode, vote_request.candidate_id),
+            election_key.public)
+
+    # One round trip: eligibility, voting window, candidate membership and
+    # the one-vote-per-user constraint are all checked by the INSERT itself
+    vote_id = uuid4()
+    receipt = bulletin.receipt_for(vote_id, encrypted_vote_data)
+    stmt = _insert_vote_stmt(
+        session.bind.dialect.name,
+        vote_id=vote_id,
+        user=user,
+        election_id=election_id,
+        candidate_id=vote_request.candidate_id,
+        encrypted_vote=encrypted_vote_data,
+    )
+    try:
+        inserted = (await session.execute(stmt)).scalar_one_or_none()
+        await session.commit()
+    except Exception:
+        await session.rollback()
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=voter_status.message
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to cast vote. Please try again."
         )
 
-    # Verify candidate exists in this election
-    candidate_query = select(Candidate).where(
-        Candidate.id == vote_request.candidate_id,
-        Candidate.election_id == election_id
+    if inserted is None:
+        # Slow path, only on rejection: find out which check failed
+        rejection = await _vote_rejection(session, user, election_id, vote_request.candidate_id)
+        audit.record("vote.rejected", user_id=user.id, request=request,
+                     election_id=election_id, reason=rejection.detail)
+        raise rejection
+
+    caches.voted.invalidate((election_id, user.id))   # a Core insert: no ORM events
+    bulletin.board.submit(election_id, vote_id, receipt)
+    turnout.hub.record_vote(election_id)
+    # who voted and from where lives in the audit log, not in the vote row
+    audit.record("vote.cast", user_id=user.id, request=request, election_id=election_id)
+    mark_recent_write(request, response)
+    return VoteResponse(
+        success=True,
+        message="Your vote was cast successfully",
+        vote_id=vote_id,
+        receipt=receipt.hex()
     )
-    candidate_result = await session.execute(candidate_query)
-    candidate = candidate_result.scalar_one_or_none()
 
-    if not candidate:
+
+@router.post("/ballots", response_model=BatchVoteResponse)
+async def cast_ballots(
+        ballot: BatchVoteRequest,
+        request: Request,
+        response: Response,
+        session: AsyncSession = Depends(get_async_session),
+        user: User = Depends(current_active_user)
+):
+    """Cast votes in several elections at once: one MFA code, all or nothing"""
+    choices = {c.election_id: c for c in ballot.choices}
+    if len(choices) != len(ballot.choices):
+        raise HTTPException(status_code=422, detail="One choice per election")
+
+    if not user.mfa_secret:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate not found in this election"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="MFA not enabled"
         )
+    if not pyotp.TOTP(user.mfa_secret).verify(ballot.mfa_code):
+        audit.record("vote.mfa_failed", user_id=user.id, request=request,
+                     elections=",".join(map(str, choices)))
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid MFA code"
+        )
+
+    # Eligibility for every contest in one query, before spending any CPU
+    rejections = await _vote_rejections(
+        session, user, {eid: c.candidate_id for eid, c in choices.items()})
+    if rejections:
+        raise _batch_rejection(rejections)
+
+    from app.api.crypto import executor
+    from app.api.crypto.paillier_utils import encrypt_ballot
+
+    keys = {eid: await _election_key(session, eid) for eid in choices}
+    modes = {eid: await caches.tally_mode(session, eid) for eid in choices}
+
+    async def ciphertext(eid, choice):
+        if choice.encrypted_vote is not None:
+            _check_client_ballot_mode(modes[eid])
+            return await _verified_client_ballot(choice, keys[eid].public)
+        return await executor.run(encrypt_ballot, _ballot_plaintext(modes[eid], choice.candidate_id),
+                                  keys[eid].public)
+
+    encrypted = dict(zip(choices, await asyncio.gather(
+        *(ciphertext(eid, c) for eid, c in choices.items()))))
 
-    # Create encrypted vote (for demo, we'll use simple encryption)
-    # In production, you'd use the Paillier cryptosystem
+    # Same guarded INSERT as cast_vote, once per contest, in one transaction
+    cast = []
     try:
-        # For simplicity, we'll encrypt the value "1" (representing one vote)
-        # In a real system, you'd use proper homomorphic encryption
-        pub_key, priv_key = generate_keypair()
-        encrypted_vote_data = encrypt_ballot(1, pub_key)
-
-        # Create vote record
-        vote = Vote(
-            user_id=user.id,
-            election_id=election_id,
-            candidate_id=vote_request.candidate_id,
-            encrypted_vote=encrypted_vote_data,
-            mfa_verified=True,
-            ip_address=request.client.host if request.client else None,
-            user_agent=request.headers.get("user-agent", "")[:500]
+        for eid, choice in choices.items():
+            vote_id = uuid4()
+            stmt = _insert_vote_stmt(
+                session.bind.dialect.name,
+                vote_id=vote_id,
+                user=user,
+                election_id=eid,
+                candidate_id=choice.candidate_id,
+                encrypted_vote=encrypted[eid],
+            )
+            if (await session.execute(stmt)).scalar_one_or_none() is None:
+                break
+            cast.append((eid, vote_id, bulletin.receipt_for(vote_id, encrypted[eid])))
+        else:
+            await session.commit()
+    except Exception:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to cast ballot. Please try again."
         )
 
-        session.add(vote)
-        await session.commit()
-        await session.refresh(vote)
+    if len(cast) != len(choices):
+        # lost a race (e.g. a concurrent vote or an election closing)
+        await session.rollback()
+        rejections = await _vote_rejections(
+            session, user, {eid: c.candidate_id for eid, c in choices.items()})
+        audit.record("vote.rejected", user_id=user.id, request=request,
+                     elections=",".join(map(str, choices)))
+        raise _batch_rejection(rejections) if rejections else HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Ballot could not be recorded, please check your status")
+
+    for eid, vote_id, receipt in cast:
+        caches.voted.invalidate((eid, user.id))
+        bulletin.board.submit(eid, vote_id, receipt)
+        turnout.hub.record_vote(eid)
+        audit.record("vote.cast", user_id=user.id, request=request, election_id=eid)
+    mark_recent_write(request, response)
+    return BatchVoteResponse(
+        success=True,
+        message=f"Your votes in {len(cast)} elections were cast successfully",
+        ballots=[CastBallot(election_id=eid, vote_id=vid, receipt=r.hex())
+                 for eid, vid, r in cast]
+    )
+
+
+async def _election_key(session: AsyncSession, election_id: UUID):
+    """Preloaded key; keys are created with their election, never here."""
+    from app.api.crypto import key_store
+
+    try:
+        return key_store.get_election_key(election_id)
+    except key_store.KeyNotFound:
+        pass
+    if not await session.get(Election, election_id):
+        raise HTTPException(status_code=404, detail="Election not found")
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Election key has not been provisioned"
+    )
 
-        return VoteResponse(
-            success=True,
-            message=f"Vote successfully cast for {candidate.name}",
-            vote_id=vote.id
+
+def _ballot_plaintext(mode: str, candidate_id: UUID) -> int:
+    if mode == "mixnet":
+        from app.api.crypto.mixnet import encode_choice
+        return encode_choice(candidate_id)
+    return 1
+
+
+def _check_client_ballot_mode(mode: str) -> None:
+    # the ballot proofs only cover 0/1 plaintexts
+    if mode != "homomorphic":
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Client-encrypted ballots are not accepted in mixnet elections"
         )
 
-    except Exception as e:
-        await session.rollback()
+
+# Plaintexts a client-encrypted ballot may carry
+BALLOT_VALUES = (0, 1)
+
+
+async def _verified_client_ballot(vote_request, pub) -> str:
+    """
+    Accept a client-encrypted ballot (VoteConfirmationRequest or BallotChoice)
+    only with a valid 0/1 proof (batch-verified).
+    """
+    from app.api.crypto.paillier_utils import ballot_ciphertext
+    from app.api.crypto.zkp import MembershipProof, verifier
+
+    try:
+        c = ballot_ciphertext(vote_request.encrypted_vote)
+        proof = MembershipProof.from_json(vote_request.ballot_proof.model_dump())
+    except Exception:
+        c = proof = None
+    if c is None or proof is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to cast vote. Please try again."
+            status_code=422,
+            detail="Encrypted ballots must be integer ciphertexts with a ballot_proof"
         )
+    if not await verifier.verify(pub, c, BALLOT_VALUES, proof):
+        raise HTTPException(
+            status_code=422,
+            detail="Ballot validity proof rejected"
+        )
+    return vote_request.encrypted_vote
+
+
+def _insert_vote_stmt(dialect: str, *, vote_id: UUID, user: User, election_id: UUID,
+                      candidate_id: UUID, encrypted_vote: str):
+    """
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING id.
+
+    The SELECT yields a row only if the candidate belongs to the election,
+    voting is open and the user is on the voter list; a second ballot from
+    the same user hits the unique constraint and is skipped.  No row
+    returned means the vote was rejected.
+    """
+    insert = pg_insert if dialect == "postgresql" else sqlite_insert
+    now = datetime.utcnow()
+    eligible = (
+        select(
+            literal(vote_id, Vote.id.type),
+            literal(user.id, Vote.user_id.type),
+            Candidate.election_id,
+            Candidate.id,
+            literal(encrypted_vote, Vote.encrypted_vote.type),
+            literal(True, Vote.mfa_verified.type),
+            literal(now, Vote.cast_at.type),
+        )
+        .join(Election, Election.id == Candidate.election_id)
+        .where(
+            Candidate.id == candidate_id,
+            Candidate.election_id == election_id,
+            Election.is_active == True,
+            Election.start_date <= now,
+            Election.end_date >= now,
+            exists().where(VoterList.election_id == election_id,
+                           VoterList.email == user.email),
+        )
+    )
+    columns = ["id", "user_id", "election_id", "candidate_id", "encrypted_vote",
+               "mfa_verified", "cast_at"]
+    return (
+        insert(Vote)
+        .from_select(columns, eligible)
+        .on_conflict_do_nothing(index_elements=["user_id", "election_id"])
+        .returning(Vote.id)
+    )
+
+
+async def _vote_rejection(session: AsyncSession, user: User,
+                          election_id: UUID, candidate_id: UUID) -> HTTPException:
+    """Map a rejected vote insert to a precise 403/404/409 in one query."""
+    rejections = await _vote_rejections(session, user, {election_id: candidate_id})
+    # e.g. the election closed between the insert and this check
+    return rejections.get(election_id) or HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Vote could not be recorded, please check your status")
+
+
+async def _vote_rejections(session: AsyncSession, user: User,
+                           choices: Dict[UUID, UUID]) -> Dict[UUID, HTTPException]:
+    """
+    Check {election_id: candidate_id} choices in one query; returns the
+    reason each failing election would reject the vote (empty if none).
+    """
+    rows = (await session.execute(
+        select(
+            Election,
+            exists().where(VoterList.election_id == Election.id,
+                           VoterList.email == user.email),
+            exists().where(Vote.user_id == user.id,
+                           Vote.election_id == Election.id),
+            Candidate.id,
+        )
+        .outerjoin(Candidate, and_(Candidate.election_id == Election.id,
+                                   Candidate.id.in_(list(choices.values()))))
+        .where(Election.id.in_(list(choices)))
+    )).all()
+
+    # one row per election (more if a candidate id was sent for the wrong one)
+    found = {}
+    for election, eligible, has_voted, candidate_id in rows:
+        prev = found.get(election.id)
+        candidate_ok = candidate_id == choices[election.id] or (prev is not None and prev[3])
+        found[election.id] = (election, eligible, has_voted, candidate_ok)
+
+    rejections = {}
+    for election_id in choices:
+        if election_id not in found:
+            rejections[election_id] = HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Election not found")
+            continue
+        election, eligible, has_voted, candidate_ok = found[election_id]
+        if not election.is_voting_open:
+            rejections[election_id] = HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Voting is not currently open for this election")
+        elif not eligible:
+            rejections[election_id] = HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You are not eligible to vote in this election")
+        elif has_voted:
+            rejections[election_id] = HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="You have already voted in this election")
+        elif not candidate_ok:
+            rejections[election_id] = HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Candidate not found in this election")
+    return rejections
+
+
+def _batch_rejection(rejections: Dict[UUID, HTTPException]) -> HTTPException:
+    """One error for a rejected batch: the first status, every reason."""
+    first = next(iter(rejections.values()))
+    return HTTPException(
+        status_code=first.status_code,
+        detail=[{"election_id": str(eid), "detail": e.detail}
+                for eid, e in rejections.items()]
+    )
 
 
 @router.get("/elections/{election_id}/results", response_model=ElectionResultsResponse)
 async def get_election_results(
         election_id: UUID,
-        session: AsyncSession = Depends(get_async_session),
+        session: AsyncSession = Depends(get_read_session),
         user: User = Depends(current_active_user)
 ):
     """Get election results (admin only or after election ends)"""
@@ -203,56 +512,44 @@ async def get_election_results(
             detail="Only election administrators can view results"
         )
 
-    # Get election
-    election_query = select(Election).where(Election.id == election_id)
-    election_result = await session.execute(election_query)
-    election = election_result.scalar_one_or_none()
+    # Election, its candidates and the final snapshot (if any) in one query
+    row = (await session.execute(
+        select(Election, ElectionResult)
+        .outerjoin(ElectionResult, ElectionResult.election_id == Election.id)
+        .where(Election.id == election_id)
+        .options(joinedload(Election.candidates))
+    )).unique().first()
 
-    if not election:
+    if not row:
         raise HTTPException(status_code=404, detail="Election not found")
+    election, snapshot = row
+
+    # Closed elections are served from their final snapshot; open ones are
+    # counted live with one GROUP BY
+    from app.api.voting.lifecycle import compute_tally
+
+    if snapshot is not None:
+        tally = {
+            "counts": json.loads(snapshot.counts),
+            "total_votes": snapshot.total_votes,
+            "eligible_voters": snapshot.eligible_voters,
+            "voted": snapshot.voted,
+        }
+    else:
+        tally = await compute_tally(session, election_id)
 
-    # Get candidates
-    candidates_query = select(Candidate).where(Candidate.election_id == election_id)
-    candidates_result = await session.execute(candidates_query)
-    candidates = candidates_result.scalars().all()
-
-    # Count votes for each candidate
+    total_votes = tally["total_votes"]
     results = []
-    total_votes = 0
-
-    for candidate in candidates:
-        vote_count_query = select(func.count(Vote.id)).where(
-            Vote.candidate_id == candidate.id,
-            Vote.election_id == election_id
-        )
-        vote_count_result = await session.execute(vote_count_query)
-        vote_count = vote_count_result.scalar() or 0
-        total_votes += vote_count
-
+    for candidate in election.candidates:
+        votes = tally["counts"].get(str(candidate.id), 0)
         results.append({
-            "candidate": candidate,
-            "votes": vote_count,
-            "percentage": 0.0  # Will calculate after we have total
+            "candidate": CandidateRead.model_validate(candidate),
+            "votes": votes,
+            "percentage": (votes / total_votes * 100) if total_votes > 0 else 0.0
         })
 
-    # Calculate percentages
-    for result in results:
-        if total_votes > 0:
-            result["percentage"] = (result["votes"] / total_votes) * 100
-
-    # Get voter turnout
-    eligible_voters_query = select(func.count(VoterList.id)).where(
-        VoterList.election_id == election_id
-    )
-    eligible_result = await session.execute(eligible_voters_query)
-    eligible_voters = eligible_result.scalar() or 0
-
-    voted_count_query = select(func.count(Vote.id.distinct())).where(
-        Vote.election_id == election_id
-    )
-    voted_result = await session.execute(voted_count_query)
-    voted_count = voted_result.scalar() or 0
-
+    eligible_voters = tally["eligible_voters"]
+    voted_count = tally["voted"]
     turnout_percentage = (voted_count / eligible_voters * 100) if eligible_voters > 0 else 0
 
     return ElectionResultsResponse(
@@ -263,5 +560,40 @@ async def get_election_results(
             "eligible": eligible_voters,
             "voted": voted_count,
             "percentage": turnout_percentage
-        }
-    )
\ No newline at end of file
+        },
+        final=snapshot is not None,
+        computed_at=snapshot.computed_at if snapshot is not None else None
+    )
+
+
+@router.get("/elections/{election_id}/board/head", response_model=SignedTreeHead)
+async def get_board_head(
+        election_id: UUID,
+        session: AsyncSession = Depends(get_read_session),
+        user: User = Depends(current_active_user)
+):
+    """Signed head (size and Merkle root) of the election's ballot bulletin board"""
+    return bulletin.sign_head(await bulletin.get_head(session, election_id))
+
+
+@router.get("/elections/{election_id}/board/proof/{receipt}",
+            response_model=InclusionProofResponse)
+async def get_inclusion_proof(
+        election_id: UUID,
+        receipt: str,
+        session: AsyncSession = Depends(get_read_session),
+        user: User = Depends(current_active_user)
+):
+    """O(log n) inclusion proof for a vote receipt against the current signed head"""
+    try:
+        leaf = bytes.fromhex(receipt)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Receipt must be hex")
+
+    proof = await bulletin.get_inclusion_proof(session, election_id, leaf)
+    if proof is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Receipt not on the bulletin board (yet)"
+        )
+    return proof
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class CandidateRead(BaseModel):
@@ -22,12 +22,33 @@ class ElectionRead(BaseModel):
     end_date: datetime
     is_active: bool
     is_voting_open: bool
+    tally_mode: str = "homomorphic"
     candidates: List[CandidateRead] = []
 
     class Config:
         from_attributes = True
 
 
+class VoterListEntryRead(BaseModel):
+    id: uuid.UUID
+    email: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class VoteRead(BaseModel):
+    """Admin view of a stored vote (who cast it is deliberately left out)"""
+    id: uuid.UUID
+    candidate_id: uuid.UUID
+    mfa_verified: bool
+    cast_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class VoterStatusResponse(BaseModel):
     can_vote: bool
     has_voted: bool
@@ -43,6 +64,7 @@ class VoteResponse(BaseModel):
     success: bool
     message: str
     vote_id: Optional[uuid.UUID] = None
+    receipt: Optional[str] = None  # hex Merkle leaf hash, checkable on the bulletin board
 
 
 class ElectionResultsResponse(BaseModel):
@@ -50,9 +72,64 @@ class ElectionResultsResponse(BaseModel):
     total_votes: int
     results: List[dict]  # [{"candidate": CandidateRead, "votes": int, "percentage": float}]
     voter_turnout: dict  # {"eligible": int, "voted": int, "percentage": float}
+    final: bool = False  # True once served from the closed election's snapshot
+    computed_at: Optional[datetime] = None
+
+
+class BallotProof(BaseModel):
+    """Disjunctive validity proof, hex-encoded (see app.api.crypto.zkp)"""
+    a: List[str]
+    e: List[str]
+    z: List[str]
 
 
 class VoteConfirmationRequest(BaseModel):
     """Request model for confirming vote with MFA"""
     candidate_id: uuid.UUID
-    mfa_code: str
\ No newline at end of file
+    mfa_code: str
+    # Optional client-side encryption; requires a proof that it encrypts 0 or 1
+    encrypted_vote: Optional[str] = None
+    ballot_proof: Optional[BallotProof] = None
+
+
+class BallotChoice(BaseModel):
+    """One contest of a multi-election ballot"""
+    election_id: uuid.UUID
+    candidate_id: uuid.UUID
+    encrypted_vote: Optional[str] = None
+    ballot_proof: Optional[BallotProof] = None
+
+
+class BatchVoteRequest(BaseModel):
+    """Several contests cast together, confirmed with one MFA code"""
+    mfa_code: str
+    choices: List[BallotChoice] = Field(min_length=1, max_length=20)
+
+
+class CastBallot(BaseModel):
+    election_id: uuid.UUID
+    vote_id: uuid.UUID
+    receipt: str
+
+
+class BatchVoteResponse(BaseModel):
+    success: bool
+    message: str
+    ballots: List[CastBallot]
+
+
+class SignedTreeHead(BaseModel):
+    election_id: uuid.UUID
+    tree_size: int
+    root: str
+    timestamp: datetime
+    signature: str
+    public_key: str
+
+
+class InclusionProofResponse(BaseModel):
+    receipt: str
+    vote_id: uuid.UUID
+    leaf_index: int
+    audit_path: List[str]
+    tree_head: SignedTreeHead
@@ -0,0 +1,156 @@
+"""
+Live turnout feed for admin dashboards.
+
+Each committed vote bumps an in-memory counter (only for elections somebody
+is watching).  A single producer task wakes every TURNOUT_PUSH_INTERVAL
+seconds and, for each election whose counter moved, fans one event out to
+all of its subscribers, so a burst of votes costs one push, not one per
+vote.  Subscriber queues are small and drop their oldest event when full:
+events carry absolute counts, so a slow client just skips ahead.
+
+Counters are reconciled against the database every
+TURNOUT_RECONCILE_SECONDS.  That also picks up votes committed by other
+worker processes, which this process never sees.
+"""
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+log = logging.getLogger(__name__)
+
+TURNOUT_PUSH_INTERVAL = float(os.getenv("TURNOUT_PUSH_INTERVAL", "1.0"))
+TURNOUT_RECONCILE_SECONDS = float(os.getenv("TURNOUT_RECONCILE_SECONDS", "30"))
+TURNOUT_KEEPALIVE_SECONDS = 15.0
+SUBSCRIBER_QUEUE_SIZE = 16
+
+Loader = Callable[[Iterable[uuid.UUID]], Awaitable[Dict[uuid.UUID, Tuple[int, int]]]]
+
+
+async def load_counts(election_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, Tuple[int, int]]:
+    """(votes, eligible voters) per election, two GROUP BY queries in total."""
+    from sqlalchemy import func, select
+    from app.database import async_read_session
+    from app.api.voting.models import Vote, VoterList
+
+    ids = list(election_ids)
+    async with async_read_session() as session:
+        votes = dict((await session.execute(
+            select(Vote.election_id, func.count())
+            .where(Vote.election_id.in_(ids)).group_by(Vote.election_id)
+        )).all())
+        eligible = dict((await session.execute(
+            select(VoterList.election_id, func.count())
+            .where(VoterList.election_id.in_(ids)).group_by(VoterList.election_id)
+        )).all())
+    return {eid: (votes.get(eid, 0), eligible.get(eid, 0)) for eid in ids}
+
+
+class TurnoutHub:
+    """In-memory turnout counters with coalesced fan-out to SSE subscribers."""
+
+    def __init__(self, loader: Loader = load_counts,
+                 interval: float = TURNOUT_PUSH_INTERVAL,
+                 reconcile_every: float = TURNOUT_RECONCILE_SECONDS):
+        self.loader = loader
+        self.interval = interval
+        self.reconcile_every = reconcile_every
+        self._votes: Dict[uuid.UUID, int] = {}
+        self._eligible: Dict[uuid.UUID, int] = {}
+        self._pushed: Dict[uuid.UUID, int] = {}     # vote count at the last push
+        self._dirty: Set[uuid.UUID] = set()
+        self._subscribers: Dict[uuid.UUID, Set[asyncio.Queue]] = {}
+        # subscribe() loads fresh counts, so the first reconcile is one period away
+        self._last_reconcile = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def record_vote(self, election_id: uuid.UUID, n: int = 1) -> None:
+        """Called after a vote commits; a dict lookup when nobody is watching."""
+        if election_id in self._votes:
+            self._votes[election_id] += n
+            self._dirty.add(election_id)
+
+    def snapshot(self, election_id: uuid.UUID) -> dict:
+        votes, eligible = self._votes[election_id], self._eligible[election_id]
+        return {
+            "election_id": str(election_id),
+            "votes": votes,
+            "delta": votes - self._pushed.get(election_id, votes),
+            "eligible": eligible,
+            "turnout": round(votes / eligible * 100, 2) if eligible else 0.0,
+            "at": datetime.utcnow().isoformat(),
+        }
+
+    async def subscribe(self, election_id: uuid.UUID,
+                        keepalive: float = TURNOUT_KEEPALIVE_SECONDS) -> AsyncIterator[Optional[dict]]:
+        """
+        Current state first, then one event per push interval in which the
+        count changed; None after `keepalive` quiet seconds.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(election_id, set()).add(queue)
+        try:
+            if election_id not in self._votes:
+                await self.reconcile([election_id])
+            yield self.snapshot(election_id)
+            if self._task is None:
+                self._task = asyncio.create_task(self._run())
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            subs = self._subscribers.get(election_id, set())
+            subs.discard(queue)
+            if not subs:
+                self._subscribers.pop(election_id, None)
+                for d in (self._votes, self._eligible, self._pushed):
+                    d.pop(election_id, None)
+                self._dirty.discard(election_id)
+
+    async def reconcile(self, election_ids: Iterable[uuid.UUID]) -> None:
+        """Reset counters to the database's numbers (marking changes for push)."""
+        for eid, (votes, eligible) in (await self.loader(election_ids)).items():
+            if self._votes.get(eid) != votes or self._eligible.get(eid) != eligible:
+                self._dirty.add(eid)
+            self._votes[eid], self._eligible[eid] = votes, eligible
+            self._pushed.setdefault(eid, votes)
+
+    def publish(self) -> None:
+        """Fan one event per changed election out to its subscribers."""
+        dirty, self._dirty = self._dirty, set()
+        for eid in dirty:
+            subs = self._subscribers.get(eid)
+            if not subs or eid not in self._votes:
+                continue
+            event = self.snapshot(eid)
+            self._pushed[eid] = self._votes[eid]
+            for queue in subs:
+                if queue.full():                # slow client: drop its oldest event
+                    queue.get_nowait()
+                queue.put_nowait(event)
+
+    async def _run(self) -> None:
+        while self._subscribers:
+            await asyncio.sleep(self.interval)
+            if time.monotonic() - self._last_reconcile >= self.reconcile_every:
+                self._last_reconcile = time.monotonic()
+                try:
+                    await self.reconcile(list(self._subscribers))
+                except Exception:
+                    log.exception("Turnout reconciliation failed")
+            self.publish()
+        self._task = None
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+hub = TurnoutHub()
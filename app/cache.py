@@ -0,0 +1,237 @@
+"""
+Process-local caches that stay coherent across the workers of one host.
+
+Every `Cache` is a per-process LRU in front of the database.  Invalidation
+goes through a table of version counters in a small memory-mapped file
+that all workers (and scripts) on the host map:
+
+  * each namespace and each (namespace, key) hashes to a counter slot;
+  * an entry remembers the two counters it was loaded under and is only
+    served while both are unchanged;
+  * `invalidate()` increments the counter (under an flock), which every
+    other process sees on its next lookup: a memory read, no syscall.
+
+Colliding slots only cause extra misses.  With ``shared=True`` misses are
+first looked up in a SQLite file next to the counters, so a value loaded by
+one worker is reused by the others without another database query; values
+are pickled and validated against the same counters.  Keep secrets (users,
+keys) out of shared caches.
+
+ORM writes invalidate after commit: model listeners call
+`invalidate_after_commit(session, ...)`.  Core bulk writes have to call
+`invalidate()` themselves; `ttl` bounds the damage if one forgets.
+
+Counters are host-local: run several hosts behind one database and each
+needs its own invalidation source (or CACHE_TTL as the only bound).
+"""
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import sqlite3
+import struct
+import tempfile
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.database import DATABASE_URL
+
+# one directory per database, so test and dev databases don't share counters
+CACHE_DIR = os.getenv("CACHE_DIR") or os.path.join(
+    tempfile.gettempdir(),
+    "securevote-cache-" + hashlib.sha256(DATABASE_URL.encode()).hexdigest()[:12])
+CACHE_SLOTS = int(os.getenv("CACHE_SLOTS", "65536"))
+CACHE_TTL = float(os.getenv("CACHE_TTL", "300"))
+# 0: every lookup misses (invalidations are still published)
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "1") == "1"
+
+MISSING = object()
+_SLOT = struct.Struct("<Q")
+
+
+def _slot(*parts: Any) -> int:
+    return zlib.crc32(repr(parts).encode()) % CACHE_SLOTS
+
+
+class VersionTable:
+    """Host-wide counters in a memory-mapped file (mapped lazily, per process)."""
+
+    def __init__(self, path: str, slots: int = CACHE_SLOTS):
+        self.path = path
+        self.slots = slots
+        self._mm: Optional[mmap.mmap] = None
+        self._fd: Optional[int] = None
+
+    def _map(self) -> mmap.mmap:
+        if self._mm is None:
+            os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            size = self.slots * _SLOT.size
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._fd, self._mm = fd, mmap.mmap(fd, size)   # MAP_SHARED
+        return self._mm
+
+    def read(self, slot: int) -> int:
+        return _SLOT.unpack_from(self._map(), slot * _SLOT.size)[0]
+
+    def bump(self, slot: int) -> None:
+        mm = self._map()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            _SLOT.pack_into(mm, slot * _SLOT.size, (self.read(slot) + 1) % 2 ** 64)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+class SharedStore:
+    """Pickled values in a SQLite file; one connection per process."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():            # never reuse a connection across fork
+            os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=0.05, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")     # it's a cache
+            conn.execute("CREATE TABLE IF NOT EXISTS entry (ns TEXT, key TEXT, stamp TEXT,"
+                         " expires REAL, value BLOB, PRIMARY KEY (ns, key))")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, ns: str, key: Hashable, stamp: Tuple[int, int]) -> Any:
+        try:
+            row = self._db().execute(
+                "SELECT value FROM entry WHERE ns = ? AND key = ? AND stamp = ? AND expires > ?",
+                (ns, repr(key), repr(stamp), time.time())).fetchone()
+        except sqlite3.OperationalError:        # locked: treat as a miss
+            return MISSING
+        return MISSING if row is None else pickle.loads(row[0])
+
+    def set(self, ns: str, key: Hashable, stamp: Tuple[int, int], value: Any,
+            ttl: Optional[float]) -> None:
+        expires = time.time() + ttl if ttl is not None else float("inf")
+        try:
+            self._db().execute("INSERT OR REPLACE INTO entry VALUES (?, ?, ?, ?, ?)",
+                               (ns, repr(key), repr(stamp), expires, pickle.dumps(value)))
+        except sqlite3.OperationalError:
+            pass
+
+    def clear(self, ns: str) -> None:
+        try:
+            self._db().execute("DELETE FROM entry WHERE ns = ?", (ns,))
+        except sqlite3.OperationalError:
+            pass
+
+
+versions = VersionTable(os.path.join(CACHE_DIR, "versions"))
+store = SharedStore(os.path.join(CACHE_DIR, "values.sqlite"))
+
+
+class Cache:
+    """
+    LRU of at most `maxsize` entries for one namespace.  Take the `stamp()`
+    before loading a value and pass it to `set()`: an invalidation that
+    lands while the value is being loaded then makes it stale at once.
+    """
+
+    def __init__(self, namespace: str, maxsize: int = 1024,
+                 ttl: Optional[float] = CACHE_TTL, shared: bool = False):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.shared = shared
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[int, int], float, Any]]" = OrderedDict()
+        self.stats = {"hits": 0, "shared_hits": 0, "misses": 0}
+
+    def stamp(self, key: Hashable) -> Tuple[int, int]:
+        return (versions.read(_slot(self.namespace)),
+                versions.read(_slot(self.namespace, key)))
+
+    def get(self, key: Hashable) -> Any:
+        """Cached value for `key`, or MISSING."""
+        if not CACHE_ENABLED:
+            return MISSING
+        stamp = self.stamp(key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == stamp and (self.ttl is None or entry[1] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[2]
+            del self._entries[key]
+        if self.shared:
+            value = store.get(self.namespace, key, stamp)
+            if value is not MISSING:
+                self.stats["shared_hits"] += 1
+                self._put(key, stamp, value)
+                return value
+        self.stats["misses"] += 1
+        return MISSING
+
+    def set(self, key: Hashable, value: Any, stamp: Tuple[int, int]) -> None:
+        if not CACHE_ENABLED:
+            return
+        self._put(key, stamp, value)
+        if self.shared:
+            store.set(self.namespace, key, stamp, value, self.ttl)
+
+    def _put(self, key, stamp, value) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl is not None else 0.0
+        self._entries[key] = (stamp, expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key)
+        if value is MISSING:
+            stamp = self.stamp(key)
+            value = await loader()
+            self.set(key, value, stamp)
+        return value
+
+    def invalidate(self, key: Hashable = MISSING) -> None:
+        invalidate(self.namespace, key)
+
+    def clear(self) -> None:
+        """Drop this process's entries (no invalidation)."""
+        self._entries.clear()
+
+
+def invalidate(namespace: str, key: Hashable = MISSING) -> None:
+    """Invalidate one key, or the whole namespace, in every process on the host."""
+    if key is MISSING:
+        versions.bump(_slot(namespace))
+        store.clear(namespace)
+    else:
+        versions.bump(_slot(namespace, key))
+
+
+# ---------- invalidation after commit ------------------------------------- #
+
+def invalidate_after_commit(session: Session, namespace: str, key: Hashable = MISSING) -> None:
+    """Queue an invalidation that runs once `session` commits."""
+    session.info.setdefault("cache_invalidations", set()).add((namespace, key))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_invalidations(session: Session) -> None:
+    for namespace, key in session.info.pop("cache_invalidations", ()):
+        invalidate(namespace, key)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_invalidations(session: Session, previous_transaction) -> None:
+    session.info.pop("cache_invalidations", None)
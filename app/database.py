@@ -1,16 +1,34 @@
 from __future__ import annotations
+import hashlib
 import os
-from typing import AsyncGenerator
+import time
+from typing import AsyncGenerator, Callable, Dict, Optional
+from fastapi import Request, Response
+from sqlalchemy import Column, Integer, inspect, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.ext.asyncio import (
     AsyncSession, async_sessionmaker, create_async_engine
 )
 from sqlalchemy.orm import DeclarativeBase
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./data.db")
+# Optional read replica; read-only endpoints use it via get_read_session.
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+# After a write, the same client reads from the primary for this long.
+READ_STICKY_SECONDS = float(os.getenv("READ_STICKY_SECONDS", "5"))
+
+# Bump whenever a model adds or changes a table/column, and add the step
+# that upgrades existing databases to MIGRATIONS (end of this module).
+SCHEMA_VERSION = 7
 
 engine = create_async_engine(DATABASE_URL, echo=False)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
 
+read_engine = (create_async_engine(READ_DATABASE_URL, echo=False)
+               if READ_DATABASE_URL else engine)
+async_read_session = async_sessionmaker(read_engine, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     """Declarative base for all ORM models."""
@@ -20,3 +38,152 @@ class Base(DeclarativeBase):
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
+
+
+# ---------- read/write routing ---------------------------------------------- #
+# Read-your-writes: a client that just wrote is pinned to the primary for
+# READ_STICKY_SECONDS.  The pin is kept in-process (keyed on its credentials)
+# and in a cookie, so it also holds when another worker serves the next read.
+
+STICKY_COOKIE = "rw_primary"
+_sticky_until: Dict[str, float] = {}
+
+
+def _client_key(request: Request) -> Optional[str]:
+    cred = request.headers.get("authorization") or request.cookies.get("token")
+    return hashlib.sha256(cred.encode()).hexdigest() if cred else None
+
+
+def mark_recent_write(request: Request, response: Optional[Response] = None) -> None:
+    """Route this client's reads to the primary for the sticky window."""
+    key = _client_key(request)
+    if key:
+        if len(_sticky_until) > 10_000:
+            now = time.monotonic()
+            for k in [k for k, t in _sticky_until.items() if t < now]:
+                del _sticky_until[k]
+        _sticky_until[key] = time.monotonic() + READ_STICKY_SECONDS
+    if response is not None:
+        response.set_cookie(STICKY_COOKIE, str(int(time.time() + READ_STICKY_SECONDS)),
+                            max_age=max(1, int(READ_STICKY_SECONDS)), httponly=True)
+
+
+def _pinned_to_primary(request: Request) -> bool:
+    key = _client_key(request)
+    if key and _sticky_until.get(key, 0) > time.monotonic():
+        return True
+    cookie = request.cookies.get(STICKY_COOKIE)
+    return bool(cookie and cookie.isdigit() and int(cookie) > time.time())
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session on the read replica, or the primary if none / client is pinned."""
+    use_primary = read_engine is engine or _pinned_to_primary(request)
+    maker = async_session if use_primary else async_read_session
+    async with maker() as session:
+        yield session
+
+
+class SchemaVersion(Base):
+    """Single-row marker of the schema version the database was built with."""
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)
+
+
+class SchemaMismatch(RuntimeError):
+    """The database can't be brought to SCHEMA_VERSION automatically."""
+
+
+# ---------- migrations ------------------------------------------------------ #
+# create_all only creates missing tables (with their indexes); every change to
+# an existing table needs a step here, keyed by the version it upgrades to.
+# Steps run synchronously on the connection of the upgrade transaction.
+
+def _add_column(table: str, name: str) -> Callable:
+    def step(conn) -> None:
+        if name not in {c["name"] for c in inspect(conn).get_columns(table)}:
+            column = Base.metadata.tables[table].c[name]
+            ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {ddl}"))
+    return step
+
+
+def _drop_columns(table: str, *names: str) -> Callable:
+    def step(conn) -> None:
+        existing = {c["name"] for c in inspect(conn).get_columns(table)}
+        for name in names:
+            if name in existing:
+                conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {name}"))
+    return step
+
+
+def _create_indexes(*names: str) -> Callable:
+    def step(conn) -> None:
+        for table in Base.metadata.tables.values():
+            for index in table.indexes:
+                if index.name in names:
+                    index.create(conn, checkfirst=True)
+    return step
+
+
+def _partition_by_election(conn) -> None:
+    # SQLite only widened the primary keys, which changes nothing for the app
+    if conn.dialect.name == "postgresql":
+        raise SchemaMismatch(
+            "Version 2 partitions vote and voter_list by election: move their rows "
+            "into partitioned tables by hand, then set schema_version to 2")
+
+
+def _new_tables(conn) -> None:
+    """Nothing to alter: create_all adds the tables."""
+
+
+MIGRATIONS: Dict[int, Callable] = {
+    2: _partition_by_election,
+    3: _new_tables,                                     # bulletin board
+    4: _drop_columns("vote", "ip_address", "user_agent"),  # now in audit_event
+    5: _create_indexes("ix_election_active_created", "ix_voter_list_election_created",
+                       "ix_vote_election_cast"),
+    6: _new_tables,                                     # election_result
+    7: _add_column("election", "tally_mode"),
+}
+
+
+def _upgrade(conn, current: Optional[int]) -> None:
+    if current is None and inspect(conn).has_table("election"):
+        current = 1             # built by create_all before versions were tracked
+    if current is not None:
+        if current > SCHEMA_VERSION:
+            raise SchemaMismatch(f"Database schema version {current} is newer than "
+                                 f"this code ({SCHEMA_VERSION})")
+        missing = [v for v in range(current + 1, SCHEMA_VERSION + 1) if v not in MIGRATIONS]
+        if missing:
+            raise SchemaMismatch(f"No migration from schema version {current} to {missing[0]}")
+    Base.metadata.create_all(conn)
+    if current is not None:
+        for version in range(current + 1, SCHEMA_VERSION + 1):
+            MIGRATIONS[version](conn)
+    conn.execute(SchemaVersion.__table__.delete())
+    conn.execute(SchemaVersion.__table__.insert().values(version=SCHEMA_VERSION))
+
+
+async def ensure_schema() -> bool:
+    """
+    Cheap startup check: one SELECT against `schema_version`.  A new
+    database gets `create_all`; a stale one gets `create_all` plus every
+    step in MIGRATIONS up to SCHEMA_VERSION, in one transaction.  Raises
+    SchemaMismatch (and changes nothing) when that isn't possible.
+    Returns True if the schema was built or upgraded.
+    """
+    try:
+        async with engine.connect() as conn:
+            current = await conn.scalar(select(SchemaVersion.version))
+    except DBAPIError:          # table does not exist yet
+        current = None
+    if current == SCHEMA_VERSION:
+        return False
+
+    async with engine.begin() as conn:
+        await conn.run_sync(_upgrade, current)
+    return True
@@ -0,0 +1,258 @@
+"""
+Batched asynchronous e-mail dispatch.
+
+Messages are queued on a bounded asyncio.Queue and drained by a few worker
+tasks.  Workers group messages that share subject and body template and
+send each group as one request with one personalization per recipient
+(SendGrid accepts up to 1000 per request).  Failed batches are retried with
+exponential backoff, and a token bucket caps overall throughput.
+
+Transports:
+  sendgrid       one reused SendGridAPIClient on a dedicated thread pool
+  console        print to stdout (dev default when SENDGRID_API_KEY is unset)
+  file:<path>    append one JSON request body per line (local stand-in)
+  memory         keep request bodies in a list (tests)
+"""
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+SENDGRID_KEY = os.getenv("SENDGRID_API_KEY")      # put in .env / secrets
+EMAIL_FROM = os.getenv("EMAIL_FROM", "no-reply@vote.local")
+EMAIL_TRANSPORT = os.getenv("EMAIL_TRANSPORT", "sendgrid" if SENDGRID_KEY else "console")
+EMAIL_QUEUE_SIZE = int(os.getenv("EMAIL_QUEUE_SIZE", "10000"))
+EMAIL_MAX_PER_SECOND = float(os.getenv("EMAIL_MAX_PER_SECOND", "1000"))
+
+MAX_PERSONALIZATIONS = 1000                        # SendGrid per-request limit
+
+
+@dataclass
+class EmailMessage:
+    """One recipient; `substitutions` fill placeholders in the shared body."""
+    to: str
+    subject: str
+    html: str
+    substitutions: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def group_key(self) -> Tuple[str, str]:
+        return self.subject, self.html
+
+
+def build_request_body(batch: List[EmailMessage]) -> dict:
+    """SendGrid v3 mail/send body for messages sharing one template."""
+    first = batch[0]
+    personalizations = []
+    for msg in batch:
+        p = {"to": [{"email": msg.to}]}
+        if msg.substitutions:
+            p["substitutions"] = msg.substitutions
+        personalizations.append(p)
+    return {
+        "from": {"email": EMAIL_FROM},
+        "subject": first.subject,
+        "content": [{"type": "text/html", "value": first.html}],
+        "personalizations": personalizations,
+    }
+
+
+# ---------- transports ----------------------------------------------------- #
+
+class Transport:
+    async def send(self, body: dict) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class SendGridTransport(Transport):
+    def __init__(self, api_key: str, max_workers: int = 4):
+        from sendgrid import SendGridAPIClient  # lazy: only when actually sending
+
+        self._client = SendGridAPIClient(api_key)
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="sendgrid")
+
+    async def send(self, body):
+        loop = asyncio.get_running_loop()
+        resp = await loop.run_in_executor(self._pool, self._client.send, body)
+        if resp.status_code >= 300:
+            raise RuntimeError(f"SendGrid returned {resp.status_code}")
+
+    async def close(self):
+        self._pool.shutdown(wait=False)
+
+
+class ConsoleTransport(Transport):
+    async def send(self, body):
+        for p in body["personalizations"]:
+            print(f"[DEV] mail to {p['to'][0]['email']}: {body['subject']} "
+                  f"{p.get('substitutions', {})}")
+
+
+class FileTransport(Transport):
+    def __init__(self, path: str):
+        self.path = path
+
+    async def send(self, body):
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(body) + "\n")
+
+
+class MemoryTransport(Transport):
+    def __init__(self):
+        self.bodies: List[dict] = []
+
+    async def send(self, body):
+        self.bodies.append(body)
+
+
+def make_transport(spec: str = EMAIL_TRANSPORT) -> Transport:
+    if spec == "sendgrid":
+        return SendGridTransport(SENDGRID_KEY)
+    if spec == "console":
+        return ConsoleTransport()
+    if spec == "memory":
+        return MemoryTransport()
+    if spec.startswith("file:"):
+        return FileTransport(spec[len("file:"):])
+    raise ValueError(f"Unknown e-mail transport '{spec}'")
+
+
+# ---------- rate limiting -------------------------------------------------- #
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, MAX_PERSONALIZATIONS)
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, n: int) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return
+                await asyncio.sleep((n - self._tokens) / self.rate)
+
+
+# ---------- dispatcher ----------------------------------------------------- #
+
+class EmailDispatcher:
+    def __init__(self,
+                 transport: Transport,
+                 queue_size: int = EMAIL_QUEUE_SIZE,
+                 batch_size: int = MAX_PERSONALIZATIONS,
+                 workers: int = 4,
+                 max_per_second: float = EMAIL_MAX_PER_SECOND,
+                 max_retries: int = 5,
+                 backoff: float = 0.5,
+                 linger: float = 0.05):
+        self.transport = transport
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.batch_size = min(batch_size, MAX_PERSONALIZATIONS)
+        self.n_workers = workers
+        self.bucket = TokenBucket(max_per_second)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.linger = linger
+        self.stats = {"sent": 0, "failed": 0, "requests": 0, "retries": 0}
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker())
+                           for _ in range(self.n_workers)]
+
+    async def submit(self, msg: EmailMessage) -> None:
+        """Queue a message; waits while the queue is full (backpressure)."""
+        self.start()
+        await self.queue.put(msg)
+
+    async def stop(self, drain: bool = True) -> None:
+        if drain and self._tasks:
+            await self.queue.join()
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.transport.close()
+
+    async def _collect(self) -> List[EmailMessage]:
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _worker(self) -> None:
+        while True:
+            batch = await self._collect()
+            try:
+                groups: Dict[Tuple[str, str], List[EmailMessage]] = {}
+                for msg in batch:
+                    groups.setdefault(msg.group_key, []).append(msg)
+                for msgs in groups.values():
+                    await self._send_with_retry(msgs)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _send_with_retry(self, msgs: List[EmailMessage]) -> None:
+        await self.bucket.acquire(len(msgs))
+        body = build_request_body(msgs)
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.transport.send(body)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    log.error("Dropping %d e-mails after %d attempts: %s",
+                              len(msgs), attempt + 1, e)
+                    self.stats["failed"] += len(msgs)
+                    return
+                self.stats["retries"] += 1
+                delay = self.backoff * 2 ** attempt
+                await asyncio.sleep(delay + random.uniform(0, delay / 2))
+            else:
+                self.stats["requests"] += 1
+                self.stats["sent"] += len(msgs)
+                return
+
+
+_dispatcher: Optional[EmailDispatcher] = None
+
+
+def get_dispatcher() -> EmailDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = EmailDispatcher(make_transport())
+    return _dispatcher
+
+
+async def shutdown() -> None:
+    global _dispatcher
+    if _dispatcher is not None:
+        await _dispatcher.stop()
+        _dispatcher = None
@@ -0,0 +1,180 @@
+"""
+On-demand statistical profiler for a live worker.
+
+While a profile runs, a sampler thread wakes up every `interval` seconds
+and records the Python stack of every other thread in the process (the
+event loop, the default thread pool, to_thread helpers) as a collapsed
+stack.  Calls shipped to the crypto process pool through
+`app.api.crypto.executor` are sampled inside the pool process with a
+SIGPROF CPU timer and merged in under a "crypto-worker" root.
+
+Output is in the collapsed format of flamegraph.pl / speedscope / inferno:
+
+  MainThread;run (asyncio/base_events.py);cast_vote (app/api/voting/router.py) 17
+
+Overhead is measured, not guessed: every sample is timed and the time
+spent sampling is reported as a fraction of the wall time.  The sampler
+stretches its interval so that fraction stays under `max_overhead`
+(PROFILE_MAX_OVERHEAD); pool processes back off the same way.
+"""
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+# opt-in: the admin endpoint answers 404 unless PROFILER_ENABLED=1
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "0") == "1"
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+PROFILE_MAX_OVERHEAD = float(os.getenv("PROFILE_MAX_OVERHEAD", "0.02"))
+_MAX_DEPTH = 128
+
+_active: Optional["Profile"] = None
+_lock = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    """A profile is already running in this process."""
+
+
+def _label(code) -> str:
+    path = code.co_filename
+    if "site-packages" + os.sep in path:      # third-party: from the package down
+        path = path.split("site-packages" + os.sep, 1)[1]
+    elif os.sep + "python3" in path and not path.startswith(os.getcwd()):
+        path = path.split(os.sep + "python3", 1)[1].split(os.sep, 1)[-1]    # stdlib
+    elif os.path.isabs(path):
+        path = os.path.relpath(path)
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({path})".replace(";", ":")
+
+
+def collapse(frame, root: str) -> str:
+    stack = []
+    while frame is not None and len(stack) < _MAX_DEPTH:
+        stack.append(_label(frame.f_code))
+        frame = frame.f_back
+    stack.append(root)
+    return ";".join(reversed(stack))
+
+
+class Profile:
+    """Collapsed-stack counts plus what collecting them cost."""
+
+    def __init__(self, interval: float, max_overhead: float = PROFILE_MAX_OVERHEAD):
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.worker_samples = 0
+        self.worker_sampling_seconds = 0.0
+        self.worker_seconds = 0.0
+        self.effective_interval = interval
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def merge_worker(self, stacks: Dict[str, int], spent: float, wall: float) -> None:
+        self.stacks.update(stacks)
+        self.worker_samples += sum(stacks.values())
+        self.worker_sampling_seconds += spent
+        self.worker_seconds += wall
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+    def stats(self) -> dict:
+        elapsed = self.elapsed or time.perf_counter() - self.started
+        return {
+            "seconds": round(elapsed, 3),
+            "interval_ms": self.interval * 1e3,
+            "effective_interval_ms": round(self.effective_interval * 1e3, 3),
+            "samples": self.samples,
+            "overhead": round(self.sampling_seconds / elapsed, 5) if elapsed else 0.0,
+            "max_overhead": self.max_overhead,
+            "worker_samples": self.worker_samples,
+            "worker_overhead": (round(self.worker_sampling_seconds / self.worker_seconds, 5)
+                                if self.worker_seconds else 0.0),
+        }
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, profile: Profile):
+        super().__init__(name="profiler", daemon=True)
+        self.profile = profile
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        p, me, delay = self.profile, threading.get_ident(), self.profile.interval
+        while not self.stopped.wait(delay):
+            t0 = time.perf_counter()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            frames = sys._current_frames()
+            for ident, frame in frames.items():
+                if ident != me:
+                    p.stacks[collapse(frame, names.get(ident, f"thread-{ident}"))] += 1
+            del frames, frame                   # don't keep other threads' frames alive
+            cost = time.perf_counter() - t0
+            p.samples += 1
+            p.sampling_seconds += cost
+            # sleep long enough that cost / (cost + sleep) <= max_overhead
+            delay = max(p.interval, cost / p.max_overhead - cost)
+            p.effective_interval = delay + cost
+
+
+def active() -> Optional[Profile]:
+    return _active
+
+
+def start(interval: float, max_overhead: float = PROFILE_MAX_OVERHEAD) -> _Sampler:
+    global _active
+    with _lock:
+        if _active is not None:
+            raise ProfilerBusy("A profile is already running in this worker")
+        _active = Profile(interval, max_overhead)
+    sampler = _Sampler(_active)
+    sampler.start()
+    return sampler
+
+
+def stop(sampler: _Sampler) -> Profile:
+    global _active
+    sampler.stopped.set()
+    sampler.join()
+    profile = sampler.profile
+    profile.elapsed = time.perf_counter() - profile.started
+    with _lock:
+        _active = None
+    return profile
+
+
+# ---------- process-pool side ---------------------------------------------- #
+
+def sampled_call(interval: float, max_overhead: float,
+                 fn: Callable[..., Any], *args: Any, **kwargs: Any):
+    """
+    Pool entry point: run fn under a SIGPROF timer (CPU time) and return
+    (result, collapsed stacks, seconds spent sampling, wall seconds).
+    """
+    stacks: Counter = Counter()
+    spent = [0.0, interval]
+    t_start = time.perf_counter()
+
+    def handler(signum, frame):
+        t0 = time.perf_counter()
+        stacks[collapse(frame, "crypto-worker")] += 1
+        spent[0] += time.perf_counter() - t0
+        if spent[0] > max_overhead * (time.perf_counter() - t_start):
+            spent[1] *= 2                   # back off
+            signal.setitimer(signal.ITIMER_PROF, spent[1], spent[1])
+
+    previous = signal.signal(signal.SIGPROF, handler)
+    signal.setitimer(signal.ITIMER_PROF, interval, interval)
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous)
+    return result, dict(stacks), spent[0], time.perf_counter() - t_start
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Write a closed election's ballots to a fixed-record archive file (see
+app.api.voting.archive) and optionally drop them from the live `vote` table.
+
+Rows are only dropped once the election's final results snapshot exists and
+the archive has been re-read and its count checked.
+
+Example:
+  python -m app.scripts.archive_ballots --election-id <uuid>
+  python -m app.scripts.archive_ballots --election-id <uuid> --drop-rows
+"""
+import argparse
+import asyncio
+import uuid
+from datetime import datetime
+
+from sqlalchemy import delete, func, select
+
+from app.database import async_session
+from app.api.crypto import key_store
+from app.api.crypto.paillier_utils import ballot_ciphertext
+from app.api.voting import archive, bulletin
+from app.api.voting.models import (
+    BulletinHead, BulletinLeaf, Candidate, Election, ElectionResult, Vote
+)
+
+STREAM_ROWS = 5000
+
+
+async def write(election_id: uuid.UUID, path: str) -> archive.ArchiveHeader:
+    key = key_store.get_election_key(election_id)
+
+    # every committed vote on the board first, so the stored root covers them all
+    await bulletin.backfill(election_id)
+    async with async_session() as session:
+        head = await session.get(BulletinHead, election_id)
+        candidate_ids = (await session.scalars(
+            select(Candidate.id).where(Candidate.election_id == election_id)
+            .order_by(Candidate.id)
+        )).all()
+
+        writer = archive.ArchiveWriter(path, election_id, key.fingerprint,
+                                       key.public.nsquare, candidate_ids,
+                                       root=head.root if head else None)
+        try:
+            for candidate_id in candidate_ids:
+                writer.begin_candidate(candidate_id)
+                result = await session.stream(
+                    select(BulletinLeaf.leaf_index, Vote.id, BulletinLeaf.leaf_hash,
+                           Vote.encrypted_vote)
+                    .outerjoin(BulletinLeaf, BulletinLeaf.vote_id == Vote.id)
+                    .where(Vote.election_id == election_id,
+                           Vote.candidate_id == candidate_id)
+                    .order_by(Vote.cast_at, Vote.id)
+                    .execution_options(yield_per=STREAM_ROWS)
+                )
+                async for leaf_index, vote_id, leaf, ciphertext in result:
+                    c = ballot_ciphertext(ciphertext)
+                    if c is None:
+                        raise ValueError(f"vote {vote_id} is not an integer ciphertext")
+                    writer.write(leaf_index, vote_id, leaf, c)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.close()
+
+
+async def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--election-id", type=uuid.UUID, required=True)
+    ap.add_argument("--out", help="archive file (default: BALLOT_ARCHIVE_DIR/<id>.ballots)")
+    ap.add_argument("--drop-rows", action="store_true",
+                    help="delete the archived rows from the vote table")
+    args = ap.parse_args()
+    path = args.out or archive.archive_path(args.election_id)
+
+    async with async_session() as session:
+        election = await session.get(Election, args.election_id)
+        if election is None or election.end_date > datetime.utcnow():
+            print("❌ Election not found or not closed yet.")
+            return
+
+    header = await write(args.election_id, path)
+    with archive.BallotArchive(path) as check:
+        assert check.header.count == header.count
+    print(f"✅ Archived {header.count} ballots to {path} "
+          f"({len(header.candidates)} candidates, "
+          f"root {'present' if header.root else 'absent'})")
+
+    if args.drop_rows:
+        async with async_session() as session:
+            if await session.get(ElectionResult, args.election_id) is None:
+                print("❌ No final results snapshot yet; keeping the rows.")
+                return
+            live = await session.scalar(
+                select(func.count()).select_from(Vote)
+                .where(Vote.election_id == args.election_id))
+            if live != header.count:
+                print(f"❌ {live} rows in the table but {header.count} archived; keeping the rows.")
+                return
+            await session.execute(delete(Vote).where(Vote.election_id == args.election_id))
+            await session.commit()
+        print(f"🗑️  Dropped {header.count} rows from the vote table.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
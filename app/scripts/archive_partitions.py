@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Detach the `vote` / `voter_list` partitions of a closed election (Postgres).
+
+The detached tables keep their data and can be archived with e.g.
+`pg_dump -t vote_e_<hex>` and then dropped with --drop.
+
+Example:
+  python -m app.scripts.archive_partitions --election-id <uuid> --explain
+"""
+import argparse
+import asyncio
+import uuid
+from datetime import datetime
+
+from sqlalchemy import select, text
+
+from app.database import engine
+from app.api.voting.models import Election
+from app.api.voting import partitions
+
+
+async def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--election-id", type=uuid.UUID, required=True)
+    ap.add_argument("--explain", action="store_true",
+                    help="show the plan of a per-election query (partition pruning)")
+    ap.add_argument("--drop", action="store_true",
+                    help="drop the detached tables after detaching")
+    args = ap.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("❗ Partitioning is only used on PostgreSQL; nothing to do.")
+        return
+
+    async with engine.begin() as conn:
+        if args.explain:
+            plan = await conn.run_sync(partitions.explain_vote_lookup, args.election_id)
+            print("\n".join(plan))
+
+        end_date = await conn.scalar(
+            select(Election.end_date).where(Election.id == args.election_id)
+        )
+        if end_date is None or end_date > datetime.utcnow():
+            print("❌ Election not found or not closed yet.")
+            return
+
+        detached = await conn.run_sync(partitions.detach_partitions, args.election_id)
+        print(f"✅ Detached: {', '.join(detached)}")
+        if args.drop:
+            for name in detached:
+                await conn.execute(text(f'DROP TABLE "{name}"'))
+            print("🗑️  Dropped detached tables.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Micro-benchmarks for the crypto layer.
+
+Example:
+  python -m app.scripts.bench_crypto engines --ballots 200
+  python -m app.scripts.bench_crypto proofs --proofs 100
+  python -m app.scripts.bench_crypto mixnet --ballots 10000 --workers 8
+"""
+import argparse
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from random import randint
+
+from app.api.crypto.paillier_utils import ENGINES, generate_keypair, get_engine
+from app.api.crypto import mixnet, zkp
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def bench_engines(args):
+    pub, priv = generate_keypair()
+    votes = [randint(0, 1) for _ in range(args.ballots)]
+
+    print(f"{'engine':<8} {'encrypt/op':>12} {'batch_add':>12} {'decrypt/op':>12}")
+    for name in ENGINES:
+        try:
+            eng = get_engine(name)
+        except RuntimeError as e:          # e.g. gmpy2 not installed
+            print(f"{name:<8} skipped ({e})")
+            continue
+
+        cts, t_enc = _timed(lambda: [eng.encrypt(v, pub) for v in votes])
+        total, t_add = _timed(eng.batch_add, cts, pub)
+        _, t_dec = _timed(lambda: [eng.decrypt(c, pub, priv) for c in cts[:20]])
+        assert eng.decrypt(total, pub, priv) == sum(votes)
+
+        print(f"{name:<8} {t_enc / len(votes) * 1e3:>10.3f}ms "
+              f"{t_add * 1e3:>10.3f}ms {t_dec / 20 * 1e3:>10.3f}ms")
+
+
+def bench_proofs(args):
+    pub, _ = generate_keypair()
+    eng = get_engine()
+    allowed = tuple(range(args.choices))
+    stmts = []
+    for _ in range(args.proofs):
+        m, r = randint(0, args.choices - 1), pub.get_random_lt_n()
+        c = eng.encrypt(m, pub, r)
+        stmts.append((c, allowed, zkp.prove_membership(pub, c, m, r, allowed)))
+
+    _, t_single = _timed(lambda: [zkp.verify_membership(pub, *s) for s in stmts])
+    ok, t_batch = _timed(zkp.batch_verify, pub, stmts)
+    assert all(ok)
+
+    print(f"{args.proofs} proofs, 1-of-{args.choices}")
+    print(f"individual  {t_single / args.proofs * 1e3:>9.3f}ms/proof")
+    print(f"batched     {t_batch / args.proofs * 1e3:>9.3f}ms/proof "
+          f"({t_single / t_batch:.1f}x)")
+
+
+def bench_mixnet(args):
+    pub, priv = generate_keypair()
+    eng = get_engine()
+    choices = [uuid.uuid4() for _ in range(3)]
+    votes = [choices[randint(0, 2)] for _ in range(args.ballots)]
+    cts = [eng.encrypt(mixnet.encode_choice(v), pub) for v in votes]
+
+    pool = ProcessPoolExecutor(args.workers) if args.workers else None
+    try:
+        if pool is not None:
+            list(pool.map(abs, range(args.workers)))    # start the workers untimed
+        print(f"{args.ballots} ballots, {args.servers} servers, {args.rounds} rounds, "
+              f"{args.workers or 'no'} workers")
+        print(f"{'stage':<10} {'seconds':>9} {'ballots/s':>11}")
+
+        def report(stage, seconds, count=args.ballots):
+            print(f"{stage:<10} {seconds:>9.2f} {count / seconds:>11.0f}")
+
+        # one shuffle is 1 + rounds re-encryptions of the list plus the openings
+        _, t = _timed(mixnet._reencrypt_all, pub, cts, args.chunk, pool)
+        report("reencrypt", t)
+        source = cts
+        for k in range(args.servers):
+            result, t_mix = _timed(mixnet.shuffle, pub, source, args.rounds, args.chunk, pool)
+            ok, t_verify = _timed(mixnet.verify_shuffle, pub, source, result, pool)
+            assert ok
+            report(f"mix {k + 1}", t_mix)
+            report(f"verify {k + 1}", t_verify)
+            source = result.output
+        plain, t = _timed(mixnet.decrypt_all, pub, priv, source, args.chunk, pool)
+        report("decrypt", t)
+        assert sorted(map(mixnet.decode_choice, plain)) == sorted(votes)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("engines", help="compare Paillier engines")
+    p.add_argument("--ballots", type=int, default=200)
+    p.set_defaults(func=bench_engines)
+
+    p = sub.add_parser("proofs", help="individual vs batch ballot-proof verification")
+    p.add_argument("--proofs", type=int, default=100)
+    p.add_argument("--choices", type=int, default=2)
+    p.set_defaults(func=bench_proofs)
+
+    p = sub.add_parser("mixnet", help="throughput of each mixnet stage")
+    p.add_argument("--ballots", type=int, default=1000)
+    p.add_argument("--servers", type=int, default=mixnet.MIXNET_SERVERS)
+    p.add_argument("--rounds", type=int, default=mixnet.MIXNET_PROOF_ROUNDS)
+    p.add_argument("--workers", type=int, default=0, help="processes (0 = this one)")
+    p.add_argument("--chunk", type=int, default=mixnet.MIXNET_CHUNK)
+    p.set_defaults(func=bench_mixnet)
+
+    args = ap.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
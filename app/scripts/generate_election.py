@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+"""
+Generate production-sized synthetic elections for benchmarks.
+
+Creates `--elections` elections with `--candidates` candidates each,
+`--voters` users who are eligible in every election, and a `--turnout`
+share of them voting in each one.  Ballots are real encryptions under the
+election's key (created in ELECTION_KEY_DIR as usual), computed on a
+process pool while earlier batches are being inserted; rows go in with
+bulk INSERTs, `--batch` at a time.  Each chunk pays for RANDOMIZERS
+exponentiations rather than one per ballot (see `encrypt_chunk`).
+With `--tally-mode mixnet` each ballot encrypts its candidate's id
+instead of 1, ready for app/scripts/mixnet_tally.py.
+
+Everything (ids, emails, who votes for whom, the encryption randomness) is
+derived from `--seed`, so the same command rebuilds the same data.  That
+also makes the ballots worthless as secrets: use it for test databases
+only.
+
+Example:
+  python -m app.scripts.generate_election --voters 1000000 --turnout 0.6 --workers 8
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import select
+
+from app.database import async_session, ensure_schema
+from app.api.auth.models import User
+from app.api.voting import caches
+from app.api.voting.models import Candidate, Election, Vote, VoterList
+
+RANDOMIZERS = 64        # encryptions of 0 per chunk; see encrypt_chunk
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _email(i: int, domain: str) -> str:
+    return f"voter{i:08d}@{domain}"
+
+
+def encrypt_chunk(pub, count: int, seed: int, factors: int = RANDOMIZERS,
+                  plaintexts: Optional[List[int]] = None) -> List[str]:
+    """
+    Process-pool entry point: `count` encryptions of 1 (or of `plaintexts`)
+    with seeded randomness.
+
+    A full encryption is one r^n mod n^2 exponentiation.  Here each chunk
+    computes `factors` encryptions of 0 (= r^n) and builds every ballot as
+    E(1) * E0_a * E0_b, i.e. an encryption of 1 with r = r_a * r_b: two
+    multiplications instead of an exponentiation.  The ballots decrypt and
+    tally like any others; their randomness is merely correlated.
+    """
+    from app.api.crypto.paillier_utils import get_engine, serialize_ballot
+
+    rng = random.Random(seed)
+    engine = get_engine()
+    zeros = [engine.encrypt(0, pub, rng.randrange(1, pub.n))
+             for _ in range(min(factors, count))]
+    # E(m) with r = 1 is 1 + m*n (g = n + 1): no exponentiation either
+    bases = ([(1 + m * pub.n) % pub.nsquare for m in plaintexts] if plaintexts is not None
+             else [engine.encrypt(1, pub, 1)] * count)
+    return [serialize_ballot(engine.add(engine.add(base, rng.choice(zeros), pub),
+                                        rng.choice(zeros), pub))
+            for base in bases]
+
+
+class _Encryptor:
+    """Keeps at most `window` chunks in flight and yields them in order."""
+
+    def __init__(self, pool: Optional[ProcessPoolExecutor], pub, window: int):
+        self.pool, self.pub, self.window = pool, pub, window
+
+    async def chunks(self, sizes: List[int], seeds: List[int],
+                     plaintexts: Optional[List[List[int]]] = None):
+        loop = asyncio.get_running_loop()
+        pending = deque()
+        for k, (size, seed) in enumerate(zip(sizes, seeds)):
+            args = (self.pub, size, seed, RANDOMIZERS, plaintexts[k] if plaintexts else None)
+            if self.pool is None:
+                yield encrypt_chunk(*args)
+                continue
+            pending.append(loop.run_in_executor(self.pool, encrypt_chunk, *args))
+            if len(pending) >= self.window:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+
+
+async def _insert(table, rows: list) -> None:
+    if rows:
+        async with async_session() as session:
+            await session.execute(table.insert(), rows)
+            await session.commit()
+
+
+async def generate_users(rng: random.Random, voters: int, domain: str, password: str,
+                         batch: int) -> List[uuid.UUID]:
+    from app.api.auth.deps import password_helper
+
+    hashed = password_helper.hash(password)     # one hash: argon2 per row would take hours
+    ids = [_uuid(rng) for _ in range(voters)]
+    for start in range(0, voters, batch):
+        await _insert(User.__table__, [
+            {"id": ids[i], "email": _email(i, domain), "hashed_password": hashed,
+             "is_active": True, "is_superuser": False, "is_verified": True}
+            for i in range(start, min(start + batch, voters))
+        ])
+    return ids
+
+
+async def generate_election(rng: random.Random, index: int, user_ids: List[uuid.UUID],
+                            args, pool: Optional[ProcessPoolExecutor]) -> Election:
+    from app.api.crypto import key_store
+
+    now = datetime.utcnow()
+    start, end = ((now - timedelta(days=8), now - timedelta(days=1)) if args.closed
+                  else (now - timedelta(days=1), now + timedelta(days=7)))
+    election = Election(id=_uuid(rng), title=f"Synthetic election {index + 1} (seed {args.seed})",
+                        description=f"{len(user_ids)} voters, {args.turnout:.0%} turnout",
+                        start_date=start, end_date=end, tally_mode=args.tally_mode)
+    candidates = [Candidate(id=_uuid(rng), name=f"Candidate {j + 1}", election_id=election.id)
+                  for j in range(args.candidates)]
+    async with async_session() as session:
+        session.add_all([election, *candidates])    # ORM insert: creates partitions on Postgres
+        await session.commit()
+    pub = key_store.create_election_key(election.id).public
+
+    voters = len(user_ids)
+    for lo in range(0, voters, args.batch):
+        await _insert(VoterList.__table__, [
+            {"id": _uuid(rng), "email": _email(i, args.domain), "election_id": election.id,
+             "created_at": start}
+            for i in range(lo, min(lo + args.batch, voters))
+        ])
+
+    # who votes, for whom (skewed support) and when
+    voting = sorted(rng.sample(range(voters), round(voters * args.turnout)))
+    weights = [rng.random() ** 2 for _ in candidates]
+    choices = rng.choices(range(len(candidates)), weights=weights, k=len(voting))
+    window = (min(now, end) - start) / max(1, len(voting))
+    sizes = [min(args.batch, len(voting) - lo) for lo in range(0, len(voting), args.batch)]
+    seeds = [rng.getrandbits(64) for _ in sizes]
+    plaintexts = None
+    if args.tally_mode == "mixnet":
+        from app.api.crypto.mixnet import encode_choice
+        plaintexts = [[encode_choice(candidates[c].id) for c in choices[lo:lo + args.batch]]
+                      for lo in range(0, len(voting), args.batch)]
+
+    encryptor = _Encryptor(pool, pub, window=2 * max(1, args.workers))
+    lo = 0
+    async for ballots in encryptor.chunks(sizes, seeds, plaintexts):
+        await _insert(Vote.__table__, [
+            {"id": _uuid(rng), "user_id": user_ids[voting[k]], "election_id": election.id,
+             "candidate_id": candidates[choices[k]].id, "encrypted_vote": ballot,
+             "mfa_verified": True, "cast_at": start + window * k}
+            for k, ballot in zip(range(lo, lo + len(ballots)), ballots)
+        ])
+        lo += len(ballots)
+        print(f"   {lo}/{len(voting)} ballots", end="\r", flush=True)
+    print()
+    # Core inserts don't fire the ORM listeners that keep the caches in sync
+    caches.eligibility.invalidate()
+    caches.voted.invalidate()
+    return election
+
+
+async def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--elections", type=int, default=1)
+    ap.add_argument("--candidates", type=int, default=3)
+    ap.add_argument("--voters", type=int, default=10000)
+    ap.add_argument("--turnout", type=float, default=0.6)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=4,
+                    help="encryption processes (0 = encrypt in this process)")
+    ap.add_argument("--batch", type=int, default=5000, help="rows per INSERT")
+    ap.add_argument("--domain", default="synthetic.invalid")
+    ap.add_argument("--password", default="synthetic-voter")
+    ap.add_argument("--closed", action="store_true",
+                    help="elections have already ended (and get a result snapshot)")
+    ap.add_argument("--tally-mode", choices=("homomorphic", "mixnet"), default="homomorphic")
+    ap.add_argument("--bulletin", action="store_true",
+                    help="also append the ballots to the bulletin board")
+    args = ap.parse_args(argv)
+    if not 0 <= args.turnout <= 1:
+        ap.error("--turnout must be between 0 and 1")
+
+    await ensure_schema()
+    async with async_session() as session:
+        if await session.scalar(select(User.id).where(User.email == _email(0, args.domain))):
+            print(f"❗ Voters @{args.domain} already exist. Use another --domain.")
+            return
+
+    rng = random.Random(args.seed)
+    t0 = time.perf_counter()
+    user_ids = await generate_users(rng, args.voters, args.domain, args.password, args.batch)
+    print(f"✅ {args.voters} voters ({time.perf_counter() - t0:.1f}s)")
+
+    pool = ProcessPoolExecutor(args.workers) if args.workers > 0 else None
+    try:
+        for k in range(args.elections):
+            t0 = time.perf_counter()
+            election = await generate_election(rng, k, user_ids, args, pool)
+            print(f"✅ {election.title}: {election.id} ({time.perf_counter() - t0:.1f}s)")
+            if args.bulletin:
+                from app.api.voting import bulletin
+                print(f"   {await bulletin.backfill(election.id)} leaves on the board")
+            if args.closed:
+                from app.api.voting.lifecycle import snapshot_election
+                await snapshot_election(election.id)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    print(f"🔑 Password for every voter: {args.password}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,11 +3,13 @@
 Interactive key-ceremony helper.
 
 Example:
-  ./generate_keys.py --shares 5 --threshold 3 --out master_key.bin
+  ./generate_keys.py --election-id <uuid> --shares 5 --threshold 3 --out master_key.bin
 """
 import argparse
 import pathlib
+import uuid
 
+from app.api.crypto import key_store
 from app.api.crypto.paillier_utils import generate_keypair
 from app.api.crypto.shamir_utils import split_secret
 
@@ -16,13 +18,17 @@ def main():
     ap.add_argument("--shares", type=int, required=True)
     ap.add_argument("--threshold", type=int, required=True)
     ap.add_argument("--out", type=pathlib.Path, default="master_privkey.bin")
+    ap.add_argument("--election-id", type=uuid.UUID, required=True)
+    ap.add_argument("--key-dir", type=pathlib.Path, default=key_store.KEY_DIR)
     args = ap.parse_args()
 
     pub, priv = generate_keypair()
 
-    # -> store public key in clear text (safe to publish)
-    (args.out.parent / "pubkey.json").write_text(
-        f"{pub.n}\n")          # one-liner for MVP
+    # -> store public key where the app preloads it (safe to publish)
+    args.key_dir.mkdir(parents=True, exist_ok=True)
+    pub_path = args.key_dir / f"{args.election_id}.pub"
+    pub_path.write_bytes(key_store.dump_public_key(args.election_id, pub))
+    print(f"Wrote {pub_path} (fingerprint {key_store.public_key_fingerprint(pub)})")
 
     # -> split private key
     priv_bytes = priv.p.to_bytes(512, "big") + priv.q.to_bytes(512, "big")
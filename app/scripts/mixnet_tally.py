@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Tally a "mixnet" election: shuffle its ballots through simulated mix
+servers, verify every shuffle proof, then decrypt the ballots one by one.
+
+Needs the election's private key in ELECTION_KEY_DIR.  Every stage runs in
+`--chunk`-sized pieces on `--workers` processes and reports its throughput.
+
+Example:
+  python -m app.scripts.mixnet_tally --election-id <uuid> --servers 3 --workers 8
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import select
+
+from app.database import async_session
+from app.api.crypto import key_store, mixnet
+from app.api.crypto.paillier_utils import ballot_ciphertext
+from app.api.voting.lifecycle import compute_tally
+from app.api.voting.models import Candidate, Election, Vote
+
+
+async def load(election_id: uuid.UUID):
+    async with async_session() as session:
+        election = await session.get(Election, election_id)
+        if election is None:
+            return None, [], {}, None
+        cts = [ballot_ciphertext(b) for b in await session.scalars(
+            select(Vote.encrypted_vote).where(Vote.election_id == election_id))]
+        names = dict((await session.execute(
+            select(Candidate.id, Candidate.name).where(Candidate.election_id == election_id))).all())
+        recorded = await compute_tally(session, election_id)
+    return election, cts, names, recorded
+
+
+def _rate(count: int, seconds: float) -> str:
+    return f"{seconds:8.2f}s  {count / seconds if seconds else float('inf'):>10.0f} ballots/s"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--election-id", type=uuid.UUID, required=True)
+    ap.add_argument("--servers", type=int, default=mixnet.MIXNET_SERVERS)
+    ap.add_argument("--rounds", type=int, default=mixnet.MIXNET_PROOF_ROUNDS,
+                    help="shuffle proof rounds (soundness 2^-rounds)")
+    ap.add_argument("--workers", type=int, default=None, help="0 = run in this process")
+    ap.add_argument("--chunk", type=int, default=mixnet.MIXNET_CHUNK, help="ballots per task")
+    args = ap.parse_args()
+
+    election, cts, names, recorded = asyncio.run(load(args.election_id))
+    if election is None:
+        print("❌ No such election.")
+        return
+    if election.tally_mode != "mixnet":
+        print(f"❌ {election.title} is a {election.tally_mode} election.")
+        return
+    if election.is_voting_open:
+        print("⚠️  Voting is still open: this tally is not final.")
+    if any(c is None for c in cts):
+        print("❌ Some ballots are not integer ciphertexts.")
+        return
+    key = key_store.get_election_key(args.election_id)
+    if key.private is None:
+        print("❌ The private key is needed to decrypt the mixed ballots.")
+        return
+
+    n = len(cts)
+    print(f"Election {election.id}: {n} ballots, {args.servers} mix servers, "
+          f"{args.rounds} proof rounds")
+    pool = ProcessPoolExecutor(args.workers) if args.workers != 0 else None
+    try:
+        shuffles, source = [], cts
+        for k in range(args.servers):
+            t0 = time.perf_counter()
+            shuffles.append(mixnet.shuffle(key.public, source, args.rounds, args.chunk, pool))
+            t_mix = time.perf_counter() - t0
+            ok = mixnet.verify_shuffle(key.public, source, shuffles[-1], pool)
+            t_verify = time.perf_counter() - t0 - t_mix
+            print(f"  mix {k + 1}     {_rate(n, t_mix)}")
+            print(f"  verify {k + 1}  {_rate(n, t_verify)}  {'✅' if ok else '❌'}")
+            if not ok:
+                print("❌ Shuffle proof rejected; not decrypting.")
+                return
+            source = shuffles[-1].output
+
+        t0 = time.perf_counter()
+        plaintexts = mixnet.decrypt_all(key.public, key.private, source, args.chunk, pool)
+        print(f"  decrypt   {_rate(n, time.perf_counter() - t0)}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    counts = Counter(mixnet.decode_choice(m) for m in plaintexts)
+    invalid = sum(v for cid, v in counts.items() if cid not in names)
+    for cid, name in names.items():
+        print(f"  {name:<30} {counts.get(cid, 0)}")
+    if invalid:
+        print(f"  {'(invalid)':<30} {invalid}")
+    matches = all(counts.get(cid, 0) == recorded["counts"].get(str(cid), 0) for cid in names)
+    print("✅ Matches the recorded tally." if matches and not invalid
+          else "❌ Differs from the recorded tally!")
+
+if __name__ == "__main__":
+    main()
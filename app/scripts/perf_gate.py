@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+"""
+Performance gate: per-endpoint SQL statement counts and latency.
+
+Runs the app in-process (httpx ASGITransport) against a freshly seeded
+SQLite database in a temp directory, calls every gated endpoint
+PERF_ROUNDS times and reports, per endpoint, the statements issued by one
+call (authentication included) and the median latency.
+
+app/tests/test_perf.py compares the report with app/tests/perf_baselines.json.
+After an intended change, refresh the stored statements and latencies with
+
+  python -m app.scripts.perf_gate --update
+
+(`max_statements` budgets in the baselines file are kept as they are).
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+BASELINES = os.path.join(os.path.dirname(__file__), "..", "tests", "perf_baselines.json")
+PERF_ROUNDS = int(os.getenv("PERF_ROUNDS", "25"))
+
+_captured: contextvars.ContextVar = contextvars.ContextVar("perf_statements", default=None)
+
+
+def _normalize(sql: str) -> str:
+    sql = " ".join(sql.split())
+    return re.sub(r"\(\?(?:, \?)+\)", "(?, ...)", sql)     # expanded IN lists
+
+
+def _configure_env(tmp: str) -> None:
+    # must happen before app.database is imported
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/perf.db"
+    os.environ.pop("READ_DATABASE_URL", None)
+    os.environ["ELECTION_KEY_DIR"] = f"{tmp}/keys"
+    os.environ["AUDIT_SINK"] = "memory"
+    os.environ["BULLETIN_FLUSH_INTERVAL"] = "3600"     # no background writes mid-measurement
+    os.environ["LIFECYCLE_POLL_SECONDS"] = "3600"
+    os.environ["EMAIL_TRANSPORT"] = "memory"
+    os.environ["CRYPTO_WORKERS"] = "0"
+    # budgets are for the database work of a request, so measure cache misses
+    os.environ["CACHE_ENABLED"] = "0"
+    os.environ["CACHE_DIR"] = f"{tmp}/cache"
+
+
+async def _seed(voters: int):
+    import pyotp
+    from app.database import async_session
+    from app.api.auth.deps import password_helper
+    from app.api.auth.models import Role, User
+    from app.api.crypto import key_store
+    from app.api.crypto.paillier_utils import encrypt_ballot
+    from app.api.voting.lifecycle import snapshot_election
+    from app.api.voting.models import Candidate, Election, Vote, VoterList
+
+    now = datetime.utcnow()
+    secret = pyotp.random_base32()
+    hashed = password_helper.hash("perf-password")
+    async with async_session() as s:
+        admin = Role(name="election-admin")
+        users = [User(id=uuid.uuid4(), email=f"voter{i}@perf.local", hashed_password=hashed,
+                      is_active=True, is_verified=True, mfa_secret=secret,
+                      roles=[admin] if i == 0 else [])
+                 for i in range(voters)]
+        open_e = Election(id=uuid.uuid4(), title="Open", start_date=now - timedelta(days=1),
+                          end_date=now + timedelta(days=1))
+        closed_e = Election(id=uuid.uuid4(), title="Closed", start_date=now - timedelta(days=9),
+                            end_date=now - timedelta(days=2))
+        elections = [open_e, closed_e] + [
+            Election(title=f"Other {i}", start_date=now, end_date=now + timedelta(days=3))
+            for i in range(20)]
+        cands = {e.id: [Candidate(id=uuid.uuid4(), name=f"C{j}", election_id=e.id)
+                        for j in range(3)] for e in (open_e, closed_e)}
+        s.add_all([admin, *users, *elections, *(c for cs in cands.values() for c in cs)])
+        for e in (open_e, closed_e):
+            s.add_all(VoterList(email=u.email, election_id=e.id) for u in users)
+            s.add_all(VoterList(email=f"extra{i}@perf.local", election_id=e.id)
+                      for i in range(200))
+        await s.flush()
+
+        for e in (open_e, closed_e):
+            ciphertext = encrypt_ballot(1, key_store.create_election_key(e.id).public)
+            s.add_all(Vote(user_id=uuid.uuid4(), election_id=e.id,
+                           candidate_id=cands[e.id][i % 3].id, encrypted_vote=ciphertext,
+                           mfa_verified=True) for i in range(150))
+        await s.commit()
+    await snapshot_election(closed_e.id)
+    return users, secret, open_e.id, closed_e.id, cands[open_e.id]
+
+
+async def measure(rounds: int = PERF_ROUNDS) -> dict:
+    import httpx
+    import pyotp
+    from sqlalchemy import event
+    from app.api.main import app
+    from app.database import engine
+    from app.api.auth.deps import get_jwt_strategy
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        captured = _captured.get()
+        if captured is not None:
+            captured.append(_normalize(statement))
+
+    for handler in app.router.on_startup:
+        await handler()
+    users, secret, open_id, closed_id, candidates = await _seed(rounds + 2)
+    strategy = get_jwt_strategy()
+    tokens = [await strategy.write_token(u) for u in users]
+    auth = lambda i: {"Authorization": f"Bearer {tokens[i]}"}
+
+    # name -> (method, path, body(i), headers(i)); i = call number
+    endpoints = {
+        "GET /voting/elections": ("GET", "/voting/elections", None, lambda i: auth(0)),
+        "GET /voting/elections/{id}/status": (
+            "GET", f"/voting/elections/{open_id}/status", None, lambda i: auth(0)),
+        "POST /voting/elections/{id}/vote": (
+            "POST", f"/voting/elections/{open_id}/vote",
+            lambda i: {"candidate_id": str(candidates[i % 3].id),
+                       "mfa_code": pyotp.TOTP(secret).now()},
+            lambda i: auth(i + 1)),                     # a fresh voter every call
+        "GET /voting/elections/{id}/results (open)": (
+            "GET", f"/voting/elections/{open_id}/results", None, lambda i: auth(0)),
+        "GET /voting/elections/{id}/results (closed)": (
+            "GET", f"/voting/elections/{closed_id}/results", None, lambda i: auth(0)),
+        "GET /voting/elections/{id}/board/head": (
+            "GET", f"/voting/elections/{open_id}/board/head", None, lambda i: auth(0)),
+        "GET /admin/elections/{id}/votes": (
+            "GET", f"/admin/elections/{open_id}/votes", None, lambda i: auth(0)),
+    }
+
+    report = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://perf") as client:
+        for name, (method, path, body, headers) in endpoints.items():
+            latencies, statements = [], []
+            for i in range(rounds + 1):                 # first call warms up
+                captured = []
+                token = _captured.set(captured)
+                t0 = time.perf_counter()
+                r = await client.request(method, path, headers=headers(i),
+                                         json=body(i) if body else None)
+                elapsed = time.perf_counter() - t0
+                _captured.reset(token)
+                if r.status_code != 200:
+                    raise RuntimeError(f"{name}: HTTP {r.status_code} {r.text[:200]}")
+                if i:
+                    latencies.append(elapsed * 1e3)
+                    statements = captured
+            report[name] = {
+                "statements": statements,
+                "median_ms": round(statistics.median(latencies), 3),
+            }
+
+    for handler in app.router.on_shutdown:
+        await handler()
+    return report
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--update", action="store_true",
+                    help="store statements and latencies as the new baselines")
+    ap.add_argument("--rounds", type=int, default=PERF_ROUNDS)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _configure_env(tmp)
+        report = asyncio.run(measure(args.rounds))
+
+    if not args.update:
+        json.dump(report, sys.stdout, indent=2)
+        return
+    try:
+        with open(BASELINES) as f:
+            baselines = json.load(f)
+    except FileNotFoundError:
+        baselines = {}
+    for name, result in report.items():
+        budget = baselines.get(name, {}).get("max_statements", len(result["statements"]))
+        baselines[name] = {"max_statements": budget, **result}
+    with open(BASELINES, "w") as f:
+        json.dump(baselines, f, indent=2)
+        f.write("\n")
+    print(f"✅ Updated {os.path.normpath(BASELINES)}")
+
+if __name__ == "__main__":
+    main()
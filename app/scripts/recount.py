@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Recount an archived election straight from its memory-mapped ballot file.
+
+Each candidate's records are split into chunks and multiplied in parallel
+worker processes (each maps the same file); the partial products are
+combined and, if the private key is available, decrypted.
+
+Example:
+  python -m app.scripts.recount --election-id <uuid> --workers 8
+  python -m app.scripts.recount --archive archive/<uuid>.ballots --verify-root
+"""
+import argparse
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from app.api.crypto import key_store
+from app.api.crypto.paillier_utils import get_engine
+from app.api.voting import archive, merkle
+
+
+def recount(path: str, pub, workers: int, chunk: int) -> dict:
+    """{candidate_id: encrypted total}, computed in parallel over the mmap."""
+    with archive.BallotArchive(path) as a:
+        candidates = a.header.candidates
+    nsq = pub.nsquare
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            cid: [pool.submit(archive.chunk_product, path, lo, min(lo + chunk, first + n), nsq)
+                  for lo in range(first, first + n, chunk)]
+            for cid, first, n in candidates
+        }
+        return {cid: archive.combine((f.result() for f in fs), nsq)
+                for cid, fs in futures.items()}
+
+
+def verify_root(path: str) -> bool:
+    """Rebuild the bulletin board tree from the archived leaf hashes."""
+    with archive.BallotArchive(path) as a:
+        leaves = sorted((i, leaf) for i, _, leaf, _ in a.records() if i is not None)
+        root = a.header.root
+    if [i for i, _ in leaves] != list(range(len(leaves))):
+        return False
+    frontier = merkle.Frontier()
+    for _, leaf in leaves:
+        frontier.append(leaf)
+    return frontier.root() == root
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--election-id", type=uuid.UUID)
+    src.add_argument("--archive")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--chunk", type=int, default=50_000, help="records per task")
+    ap.add_argument("--verify-root", action="store_true",
+                    help="check the archived leaves against the stored Merkle root")
+    args = ap.parse_args()
+    path = args.archive or archive.archive_path(args.election_id)
+
+    with archive.BallotArchive(path) as a:
+        header = a.header
+    key = key_store.get_election_key(header.election_id)
+    if key.fingerprint != header.fingerprint:
+        print("❌ Archive was written under a different election key.")
+        return
+
+    t0 = time.perf_counter()
+    totals = recount(path, key.public, args.workers, args.chunk)
+    elapsed = time.perf_counter() - t0
+    engine = get_engine()
+
+    print(f"Election {header.election_id}: {header.count} ballots, "
+          f"recounted in {elapsed:.2f}s")
+    for cid, total in totals.items():
+        votes = engine.decrypt(total, key.public, key.private) if key.private else "(encrypted)"
+        print(f"  {cid}  {votes}")
+
+    if args.verify_root:
+        if header.root is None:
+            print("⚠️  No Merkle root stored in the archive.")
+        else:
+            print("✅ Merkle root matches." if verify_root(path) else "❌ Merkle root mismatch!")
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,8 @@ import asyncio
 import uuid
 from datetime import datetime, timedelta
 from sqlalchemy import select
-from app.database import async_session, engine
-from app.database import Base
+from app.database import async_session, ensure_schema
+from app.api.crypto import key_store
 
 # Import ALL models to ensure they're registered with SQLAlchemy
 from app.api.auth.models import User, Role
@@ -15,8 +15,7 @@ async def seed_election_data():
 
     # Ensure all tables exist
     print("Creating database tables...")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await ensure_schema()
     print("✅ Database tables created!")
 
     async with async_session() as session:
@@ -93,6 +92,7 @@ async def seed_election_data():
             session.add(voter_entry)
 
         await session.commit()
+        key_store.create_election_key(election.id)
 
         print("✅ Election data seeded successfully!")
         print(f"📊 Election: {election.title}")
@@ -162,6 +162,7 @@ async def create_more_elections():
             session.add(voter_entry)
 
         await session.commit()
+        key_store.create_election_key(past_election.id)
         print("✅ Additional elections created!")
 
 
@@ -1,15 +1,15 @@
 import asyncio, uuid
 from sqlalchemy import select
-from app.database import async_session, engine
-from app.api.auth.models import Role, Base
+from app.database import async_session, ensure_schema
+from app.api.auth.models import Role
+from app.api.voting import models  # noqa: F401 - register all tables
 
 DEFAULT_ROLES = ("voter", "election-admin", "auditor")
 
 async def main():
     # ensure tables exist (dev); use Alembic in prod
     print("Creating database tables (if they do not exist)...")
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await ensure_schema()
     print("✅ Tables ensured.")
 
     async with async_session() as session:
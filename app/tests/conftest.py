@@ -0,0 +1,100 @@
+"""
+`api` fixture: the FastAPI app on a throwaway SQLite database, called in
+process through httpx.  Authentication is replaced by `api.login(user)`;
+audit events are collected in `api.audit` instead of being written, and
+election keys are small (512-bit) and live in tmp_path.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    import httpx
+    import pyotp
+    from phe import paillier
+
+    from app import database
+    from app.api.main import app
+    from app.api.audit import log as audit_log, router as audit_router
+    from app.api.auth.deps import current_active_user
+    from app.api.auth.models import Role, User
+    from app.api.crypto import executor, key_store
+    from app.api.voting import bulletin
+    from app.api.voting.models import Candidate, Election, VoterList
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/api.db")
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(database.Base.metadata.create_all)
+    asyncio.run(create_tables())
+
+    async def session():
+        async with maker() as s:
+            yield s
+
+    state = SimpleNamespace(user=None)
+    app.dependency_overrides.update({
+        database.get_async_session: session,
+        database.get_read_session: session,
+        current_active_user: lambda: state.user,
+    })
+    events = []
+    monkeypatch.setattr(audit_log, "record", lambda event, **kw: events.append((event, kw)))
+    monkeypatch.setattr(audit_router, "async_read_session", maker)
+    monkeypatch.setattr(bulletin.board, "submit", lambda *args: None)
+    monkeypatch.setattr(executor, "CRYPTO_WORKERS", 0)
+    monkeypatch.setattr(key_store, "KEY_DIR", tmp_path / "keys")
+    monkeypatch.setattr(key_store, "generate_keypair",
+                        lambda: paillier.generate_paillier_keypair(n_length=512))
+    key_store.clear_cache()
+
+    async def add(*rows):
+        async with maker() as s:
+            s.add_all(rows)
+            await s.commit()
+        return rows[0] if len(rows) == 1 else rows
+
+    def user(email="voter@example.com", roles=()):
+        u = User(id=uuid.uuid4(), email=email, hashed_password="x", is_active=True,
+                 is_superuser=False, is_verified=True, mfa_secret=pyotp.random_base32(),
+                 roles=[Role(name=r) for r in roles])
+        return asyncio.run(add(u))
+
+    def election(candidates=2, voters=(), closed=False, **fields):
+        now = datetime.utcnow()
+        start, end = ((now - timedelta(days=2), now - timedelta(days=1)) if closed
+                      else (now - timedelta(days=1), now + timedelta(days=1)))
+        e = Election(id=uuid.uuid4(), title="Test", start_date=start, end_date=end, **fields)
+        cands = [Candidate(id=uuid.uuid4(), name=f"C{i}", election_id=e.id)
+                 for i in range(candidates)]
+        asyncio.run(add(e, *cands, *(VoterList(email=v, election_id=e.id) for v in voters)))
+        key_store.create_election_key(e.id)
+        return e, [c.id for c in cands]
+
+    def call(method, url, **kwargs):
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.request(method, url, **kwargs)
+        return asyncio.run(run())
+
+    def mfa_code(u):
+        return pyotp.TOTP(u.mfa_secret).now()
+
+    def login(u):
+        state.user = u
+
+    yield SimpleNamespace(call=call, user=user, election=election, login=login,
+                          mfa_code=mfa_code, session=maker, audit=events)
+
+    app.dependency_overrides.clear()
+    key_store.clear_cache()
+    asyncio.run(engine.dispose())
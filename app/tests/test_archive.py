@@ -0,0 +1,53 @@
+import uuid
+
+import pytest
+
+from app.api.crypto.key_store import public_key_fingerprint
+from app.api.crypto.paillier_utils import generate_keypair, get_engine
+from app.api.voting import archive, merkle
+from app.scripts.recount import recount, verify_root
+
+
+def test_archive_roundtrip_and_parallel_recount(tmp_path):
+    pub, priv = generate_keypair()
+    eng = get_engine()
+    eid, cands = uuid.uuid4(), sorted(uuid.uuid4() for _ in range(3))
+    votes = {cands[0]: 7, cands[1]: 0, cands[2]: 12}
+    path = str(tmp_path / "e.ballots")
+
+    frontier, index = merkle.Frontier(), 0
+    w = archive.ArchiveWriter(path, eid, public_key_fingerprint(pub), pub.nsquare, cands)
+    for cid in cands:
+        w.begin_candidate(cid)
+        for _ in range(votes[cid]):
+            vid = uuid.uuid4()
+            leaf = merkle.leaf_hash(vid.bytes)
+            frontier.append(leaf)
+            w.write(index, vid, leaf, eng.encrypt(1, pub))
+            index += 1
+    w.root = frontier.root()
+    header = w.close()
+    assert header.count == 19
+
+    with archive.BallotArchive(path) as a:
+        assert a.header.candidates == [(cands[0], 0, 7), (cands[1], 7, 0), (cands[2], 7, 12)]
+        assert a.header.fingerprint == public_key_fingerprint(pub)
+        assert len(list(a.records(7, 9))) == 2
+
+    totals = recount(path, pub, workers=2, chunk=5)
+    assert {cid: eng.decrypt(t, pub, priv) for cid, t in totals.items()} == votes
+    assert verify_root(path)
+
+
+def test_truncated_archive_is_rejected(tmp_path):
+    pub, _ = generate_keypair()
+    path = str(tmp_path / "e.ballots")
+    cid = uuid.uuid4()
+    w = archive.ArchiveWriter(path, uuid.uuid4(), public_key_fingerprint(pub), pub.nsquare, [cid])
+    w.begin_candidate(cid)
+    w.write(None, uuid.uuid4(), None, 12345)
+    w.close()
+    with open(path, "r+b") as f:
+        f.truncate(200)
+    with pytest.raises(ValueError):
+        archive.BallotArchive(path)
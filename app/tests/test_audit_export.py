@@ -0,0 +1,94 @@
+import asyncio
+import gzip
+import json
+import struct
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.api.audit.router import BINARY_MAGIC, _RECORD
+from app.api.voting.models import Vote
+
+
+def _election_with_votes(api, count=5):
+    voters = [api.user(f"v{i}@example.com") for i in range(count)]
+    election, (cid, _) = api.election(voters=[v.email for v in voters])
+    for v in voters:
+        api.login(v)
+        r = api.call("POST", f"/voting/elections/{election.id}/vote",
+                     json={"candidate_id": str(cid), "mfa_code": api.mfa_code(v)})
+        assert r.status_code == 200
+
+    async def stored():
+        async with api.session() as s:
+            return (await s.execute(
+                select(Vote.id, Vote.encrypted_vote, Vote.cast_at)
+                .where(Vote.election_id == election.id)
+                .order_by(Vote.cast_at, Vote.id))).all()
+    return election, asyncio.run(stored())
+
+
+def _binary_records(data):
+    assert data.startswith(BINARY_MAGIC)
+    off, records = len(BINARY_MAGIC), []
+    while off < len(data):
+        (length,) = struct.unpack_from(">I", data, off)
+        body = data[off + 4:off + 4 + length]
+        vote_id, micros, leaf_index, leaf_hash = _RECORD.unpack_from(body)
+        records.append((uuid.UUID(bytes=vote_id),
+                        datetime(1970, 1, 1) + timedelta(microseconds=micros),
+                        leaf_index, leaf_hash, body[_RECORD.size:].decode()))
+        off += 4 + length
+    return records
+
+
+def test_export_is_for_auditors_only(api):
+    election, _ = _election_with_votes(api, 1)
+    url = f"/auditor/elections/{election.id}/ballots"
+    api.login(api.user("admin@example.com", roles=["election-admin"]))
+    assert api.call("GET", url).status_code == 403
+    api.login(api.user("auditor@example.com", roles=["auditor"]))
+    assert api.call("GET", url).status_code == 200
+    assert api.audit[-1][0] == "auditor.export"
+
+
+def test_ndjson_rows_match_stored_votes_and_resume(api):
+    election, votes = _election_with_votes(api)
+    api.login(api.user("auditor@example.com", roles=["auditor"]))
+    url = f"/auditor/elections/{election.id}/ballots"
+
+    r = api.call("GET", url)
+    assert r.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [(uuid.UUID(x["vote_id"]), x["ciphertext"], datetime.fromisoformat(x["cast_at"]))
+            for x in rows] == [tuple(v) for v in votes]
+    assert all(x["leaf_index"] is None for x in rows)       # board flushes are stubbed out
+
+    rest = api.call("GET", url, params={"after": rows[1]["cursor"]})
+    assert [json.loads(line)["vote_id"] for line in rest.text.splitlines()] == \
+        [x["vote_id"] for x in rows[2:]]
+
+
+def test_binary_export_round_trips(api):
+    election, votes = _election_with_votes(api)
+    api.login(api.user("auditor@example.com", roles=["auditor"]))
+    url = f"/auditor/elections/{election.id}/ballots"
+
+    r = api.call("GET", url, params={"format": "binary"})
+    records = _binary_records(r.content)
+    assert [(vid, ct, at) for vid, at, _, _, ct in records] == [tuple(v) for v in votes]
+    assert all(index == -1 and leaf == bytes(32) for _, _, index, leaf, _ in records)
+
+    # httpx decodes Content-Encoding: gzip itself, so ask for the raw body
+    async def raw():
+        import httpx
+        from app.api.main import app
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            async with client.stream("GET", url, params={"format": "binary",
+                                                         "compression": "gzip"}) as resp:
+                return resp.headers["content-encoding"], b"".join(
+                    [chunk async for chunk in resp.aiter_raw()])
+    encoding, body = asyncio.run(raw())
+    assert encoding == "gzip" and _binary_records(gzip.decompress(body)) == records
@@ -0,0 +1,69 @@
+import asyncio
+import glob
+import gzip
+import json
+
+from app.api.audit.log import AuditLog, FileSink, MemorySink
+
+
+def test_events_are_flushed_in_batches():
+    async def run():
+        sink = MemorySink()
+        audit = AuditLog(sink, batch_size=100, interval=0.05)
+        for i in range(250):
+            audit.record("auth.login", user_id=i)
+        await asyncio.sleep(0.2)
+        return sink, audit.metrics()
+
+    sink, metrics = asyncio.run(run())
+    assert [e["user_id"] for e in sink.events] == list(range(250))
+    assert metrics["written"] == 250 and metrics["buffered"] == 0
+    assert metrics["dropped"] == 0
+
+
+def test_full_buffer_drops_oldest_and_counts():
+    audit = AuditLog(MemorySink(), capacity=10)
+    for i in range(25):
+        audit.record("vote.cast", user_id=i, election_id="e")
+    asyncio.run(audit.stop())
+    assert [e["user_id"] for e in audit.sink.events] == list(range(15, 25))
+    assert audit.sink.events[0]["detail"] == {"election_id": "e"}
+    assert audit.stats["dropped"] == 15 and audit.stats["high_water"] == 10
+
+
+def test_failed_flush_keeps_events():
+    class Flaky(MemorySink):
+        fail = True
+
+        async def write(self, events):
+            if self.fail:
+                self.fail = False
+                raise RuntimeError("disk full")
+            await super().write(events)
+
+    audit = AuditLog(Flaky(), batch_size=5)
+    for i in range(12):
+        audit.record("mfa.failed", user_id=i)
+    try:
+        asyncio.run(audit.flush())
+    except RuntimeError:
+        pass
+    asyncio.run(audit.stop())
+    assert [e["user_id"] for e in audit.sink.events] == list(range(12))
+    assert audit.stats["flush_failures"] == 1
+
+
+def test_file_sink_rotates_gzip_files(tmp_path):
+    path = str(tmp_path / "audit.log.gz")
+    audit = AuditLog(FileSink(path, max_bytes=200), batch_size=10)
+    for i in range(50):
+        audit.record("admin.tally", user_id=i)
+    asyncio.run(audit.stop())
+
+    files = sorted(glob.glob(path + "*"))
+    assert len(files) > 1
+    users = []
+    for f in files:
+        with gzip.open(f, "rt") as fh:
+            users += [json.loads(line)["user_id"] for line in fh]
+    assert sorted(users) == list(range(50))
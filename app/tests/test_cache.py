@@ -0,0 +1,103 @@
+import asyncio
+import multiprocessing
+import uuid
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app import cache
+from app.database import Base
+from app.api.auth import deps
+from app.api.auth.models import Role, User
+
+
+@pytest.fixture
+def tmp_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "versions", cache.VersionTable(str(tmp_path / "versions")))
+    monkeypatch.setattr(cache, "store", cache.SharedStore(str(tmp_path / "values.sqlite")))
+
+
+def test_invalidation_reaches_other_processes(tmp_cache):
+    c = cache.Cache("t")
+    c.set("k", 1, c.stamp("k"))
+    c.set("other", 2, c.stamp("other"))
+    assert c.get("k") == 1
+
+    child = multiprocessing.get_context("fork").Process(target=cache.invalidate, args=("t", "k"))
+    child.start()
+    child.join()
+    assert c.get("k") is cache.MISSING
+    assert c.get("other") == 2
+
+    cache.invalidate("t")                       # whole namespace
+    assert c.get("other") is cache.MISSING
+
+
+def test_shared_tier_and_load_race(tmp_cache):
+    worker_a, worker_b = cache.Cache("s", shared=True), cache.Cache("s", shared=True)
+
+    async def load():
+        return "v1"
+
+    async def load_racing():
+        cache.invalidate("s", "k")              # a write lands mid-load
+        return "v2"
+
+    async def run():
+        assert await worker_a.get_or_load("k", load) == "v1"
+        assert worker_b.get("k") == "v1"        # filled from the shared store
+        assert worker_b.stats["shared_hits"] == 1
+        worker_b.invalidate("k")
+        assert worker_a.get("k") is cache.MISSING
+        assert await worker_a.get_or_load("k", load_racing) == "v2"
+        assert worker_a.get("k") is cache.MISSING      # stamped before the write
+
+    asyncio.run(run())
+
+
+def test_invalidate_after_commit_only(tmp_cache):
+    c = cache.Cache("c")
+    for commit in (False, True):
+        c.set("k", 1, c.stamp("k"))
+        session = Session()
+        cache.invalidate_after_commit(session, "c", "k")
+        assert c.get("k") == 1
+        session.commit() if commit else session.rollback()
+        assert (c.get("k") is cache.MISSING) == commit
+
+
+def test_cached_user_lookup(tmp_cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(deps, "users", cache.Cache("users", ttl=60))
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/t.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        uid = uuid.uuid4()
+        async with maker() as s:
+            s.add(User(id=uid, email="a@x.org", hashed_password="-", mfa_secret="S",
+                       roles=[Role(name="auditor")]))
+            await s.commit()
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda *args: statements.append(args[2]))
+        for _ in range(2):
+            async with maker() as s:
+                user = await deps.CachedUserDatabase(s, User).get(uid)
+        assert len(statements) == 1             # second lookup came from the cache
+        assert user.has_role("auditor") and user.mfa_secret == "S"
+
+        async with maker() as s:                # a write through the cached object
+            user = await deps.CachedUserDatabase(s, User).get(uid)
+            user.mfa_secret = None
+            await s.commit()
+        async with maker() as s:
+            user = await deps.CachedUserDatabase(s, User).get(uid)
+        await engine.dispose()
+        return user
+
+    assert asyncio.run(run()).mfa_secret is None
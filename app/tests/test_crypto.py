@@ -1,7 +1,11 @@
+import uuid
 from random import randint
 
+import pytest
+
 from app.api.crypto.paillier_utils import (
-    generate_keypair, encrypt_ballot, decrypt_ballot, homomorphic_sum
+    generate_keypair, encrypt_ballot, decrypt_ballot, homomorphic_sum,
+    get_engine
 )
 
 def test_encrypt_decrypt_roundtrip():
@@ -19,3 +23,109 @@ def test_homomorphic_tally():
     total_dec = priv.decrypt(total_enc)
 
     assert total_dec == sum(votes)
+
+def test_engines_are_equivalent():
+    pytest.importorskip("gmpy2")
+    pub, priv = generate_keypair()
+    ref, fast = get_engine("phe"), get_engine("gmpy2")
+    votes = [randint(0, 5) for _ in range(10)]
+
+    # same obfuscator -> bit-identical ciphertexts
+    r = pub.get_random_lt_n()
+    assert ref.encrypt(3, pub, r) == fast.encrypt(3, pub, r)
+
+    for enc_eng in (ref, fast):
+        cts = [enc_eng.encrypt(v, pub) for v in votes]
+        for dec_eng in (ref, fast):
+            assert [dec_eng.decrypt(c, pub, priv) for c in cts] == votes
+            assert dec_eng.decrypt(dec_eng.batch_add(cts, pub),
+                                   pub, priv) == sum(votes)
+        assert ref.add(cts[0], cts[1], pub) == fast.add(cts[0], cts[1], pub)
+
+def test_ballot_format_is_engine_independent():
+    pytest.importorskip("gmpy2")
+    pub, priv = generate_keypair()
+    enc = encrypt_ballot(1, pub, get_engine("gmpy2"))
+    assert decrypt_ballot(enc, pub, priv, get_engine("phe")) == 1
+    assert priv.decrypt(homomorphic_sum([enc, enc], pub)) == 2
+
+def test_key_store_roundtrip(tmp_path, monkeypatch):
+    from app.api.crypto import key_store
+    monkeypatch.setattr(key_store, "KEY_DIR", tmp_path)
+    monkeypatch.setattr(key_store, "KEY_AUTOGEN", False)
+    key_store.clear_cache()
+
+    eid = uuid.uuid4()
+    pub, priv = generate_keypair()
+    key_store.save_key(eid, pub, priv)
+    assert key_store.preload([eid, uuid.uuid4()]) == 1
+
+    key = key_store.get_election_key(eid)
+    assert key.public == pub
+    assert (key.private.p, key.private.q) == (priv.p, priv.q)
+    assert decrypt_ballot(encrypt_ballot(1, key.public), key.public, key.private) == 1
+    key_store.clear_cache()
+
+def test_election_key_is_created_once(tmp_path, monkeypatch):
+    import stat
+    from concurrent.futures import ThreadPoolExecutor
+    from phe import paillier
+    from app.api.crypto import key_store
+    monkeypatch.setattr(key_store, "KEY_DIR", tmp_path)
+    monkeypatch.setattr(key_store, "generate_keypair",
+                        lambda: paillier.generate_paillier_keypair(n_length=512))
+    key_store.clear_cache()
+
+    eid = uuid.uuid4()
+    with ThreadPoolExecutor(4) as pool:         # concurrent first votes used to race here
+        keys = list(pool.map(lambda _: key_store.create_election_key(eid), range(4)))
+    assert len({k.public.n for k in keys}) == 1
+    key_store.clear_cache()
+    assert key_store.get_election_key(eid).public == keys[0].public
+    assert stat.S_IMODE((tmp_path / f"{eid}.priv").stat().st_mode) == 0o600
+    with pytest.raises(FileExistsError):
+        key_store.save_key(eid, *paillier.generate_paillier_keypair(n_length=512))
+    assert key_store.preload([uuid.uuid4()], create=False) == 0
+    key_store.clear_cache()
+
+def test_ballot_validity_proofs_batch_and_pinpoint():
+    from app.api.crypto.zkp import (
+        MembershipProof, batch_verify, prove_membership, verify_membership
+    )
+    pub, _ = generate_keypair()
+    eng = get_engine()
+    statements = []
+    for m in (0, 1, 1, 0, 1):
+        r = pub.get_random_lt_n()
+        c = eng.encrypt(m, pub, r)
+        proof = MembershipProof.from_json(
+            prove_membership(pub, c, m, r, (0, 1)).to_json())
+        assert verify_membership(pub, c, (0, 1), proof)
+        statements.append((c, (0, 1), proof))
+    assert batch_verify(pub, statements) == [True] * 5
+
+    # a "1000 votes" ballot cannot be proven valid; a tampered proof fails alone
+    r = pub.get_random_lt_n()
+    bad_c = eng.encrypt(1000, pub, r)
+    forged = prove_membership(pub, eng.encrypt(1, pub, r), 1, r, (0, 1))
+    statements[2] = (bad_c, (0, 1), forged)
+    # passes the Fiat-Shamir check, fails the combined equation
+    c4, allowed4, p4 = statements[4]
+    statements[4] = (c4, allowed4, MembershipProof(p4.a, p4.e, [p4.z[0] + 1, p4.z[1]]))
+    assert batch_verify(pub, statements) == [True, True, False, True, False]
+
+
+def test_crypto_pool_encrypts_concurrently():
+    import asyncio
+    from app.api.crypto import executor
+
+    pub, priv = generate_keypair()
+
+    async def run():
+        return await asyncio.gather(*(executor.run(encrypt_ballot, v, pub)
+                                      for v in (0, 1, 1, 0, 1)))
+    try:
+        cts = asyncio.run(run())
+    finally:
+        executor.shutdown()
+    assert [decrypt_ballot(c, pub, priv) for c in cts] == [0, 1, 1, 0, 1]
@@ -0,0 +1,119 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.requests import Request
+
+from app import database
+
+
+def _request(token="Bearer abc", cookies=""):
+    headers = [(b"authorization", token.encode())]
+    if cookies:
+        headers.append((b"cookie", cookies.encode()))
+    return Request({"type": "http", "headers": headers})
+
+
+async def _db_name(request):
+    gen = database.get_read_session(request)
+    session = await gen.__anext__()
+    name = await session.scalar(text("SELECT name FROM whoami"))
+    await gen.aclose()
+    return name
+
+
+def test_reads_go_to_replica_until_client_writes(tmp_path, monkeypatch):
+    async def run():
+        engines = {}
+        for name in ("primary", "replica"):
+            eng = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/{name}.db")
+            async with eng.begin() as conn:
+                await conn.execute(text("CREATE TABLE whoami (name TEXT)"))
+                await conn.execute(text(f"INSERT INTO whoami VALUES ('{name}')"))
+            engines[name] = eng
+        monkeypatch.setattr(database, "engine", engines["primary"])
+        monkeypatch.setattr(database, "read_engine", engines["replica"])
+        monkeypatch.setattr(database, "async_session",
+                            async_sessionmaker(engines["primary"]))
+        monkeypatch.setattr(database, "async_read_session",
+                            async_sessionmaker(engines["replica"]))
+
+        before = await _db_name(_request())
+        database.mark_recent_write(_request())
+        after = await _db_name(_request())
+        other_client = await _db_name(_request("Bearer xyz"))
+        for eng in engines.values():
+            await eng.dispose()
+        return before, after, other_client
+
+    assert asyncio.run(run()) == ("replica", "primary", "replica")
+
+
+def test_sticky_cookie_pins_primary_across_workers():
+    from fastapi import Response
+
+    response = Response()
+    database.mark_recent_write(_request("Bearer cookie-only"), response)
+    cookie = response.headers["set-cookie"].split(";")[0]
+    database._sticky_until.clear()          # simulate a different worker
+    assert database._pinned_to_primary(_request("Bearer cookie-only", cookie))
+    assert not database._pinned_to_primary(_request("Bearer cookie-only"))
+
+
+def _schema_db(tmp_path, monkeypatch, name):
+    eng = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/{name}.db")
+    monkeypatch.setattr(database, "engine", eng)
+    return eng
+
+
+def _stored_version(eng):
+    async def run():
+        async with eng.connect() as conn:
+            return await conn.scalar(text("SELECT version FROM schema_version"))
+    return asyncio.run(run())
+
+
+def test_stale_schema_is_migrated(tmp_path, monkeypatch):
+    import app.api.voting.models  # noqa: F401  register the tables
+    eng = _schema_db(tmp_path, monkeypatch, "stale")
+
+    async def run():
+        assert await database.ensure_schema()
+        async with eng.begin() as conn:         # what a version 3 database lacks
+            await conn.execute(text("DROP INDEX ix_vote_election_cast"))
+            await conn.execute(text("ALTER TABLE vote ADD COLUMN ip_address VARCHAR(45)"))
+            await conn.execute(text("UPDATE schema_version SET version = 3"))
+        assert await database.ensure_schema()
+        assert not await database.ensure_schema()
+        async with eng.connect() as conn:
+            indexes = await conn.scalars(text("SELECT name FROM sqlite_master WHERE type = 'index'"))
+            columns = await conn.scalars(text("SELECT name FROM pragma_table_info('vote')"))
+            return set(indexes), set(columns)
+
+    indexes, columns = asyncio.run(run())
+    assert "ix_vote_election_cast" in indexes and "ip_address" not in columns
+    assert _stored_version(eng) == database.SCHEMA_VERSION
+    asyncio.run(eng.dispose())
+
+
+def test_schema_without_migration_is_refused(tmp_path, monkeypatch):
+    import pytest
+    import app.api.voting.models  # noqa: F401
+    eng = _schema_db(tmp_path, monkeypatch, "refused")
+
+    async def run():
+        await database.ensure_schema()
+        async with eng.begin() as conn:
+            await conn.execute(text("UPDATE schema_version SET version = :v"),
+                               {"v": database.SCHEMA_VERSION + 1})
+        with pytest.raises(database.SchemaMismatch):
+            await database.ensure_schema()
+        monkeypatch.delitem(database.MIGRATIONS, 3)
+        async with eng.begin() as conn:
+            await conn.execute(text("UPDATE schema_version SET version = 2"))
+        with pytest.raises(database.SchemaMismatch):
+            await database.ensure_schema()
+
+    asyncio.run(run())
+    assert _stored_version(eng) == 2                # not bumped without a migration
+    asyncio.run(eng.dispose())
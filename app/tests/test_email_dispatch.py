@@ -0,0 +1,48 @@
+import asyncio
+
+from app.email_dispatch import EmailDispatcher, EmailMessage, MemoryTransport
+
+
+def _msg(i, subject="Polls are open"):
+    return EmailMessage(to=f"voter{i}@example.com", subject=subject,
+                        html="Vote at -link-", substitutions={"-link-": f"/v/{i}"})
+
+
+def test_messages_are_batched_per_template():
+    async def run():
+        transport = MemoryTransport()
+        d = EmailDispatcher(transport, workers=1, linger=0.2)
+        for i in range(2500):
+            await d.submit(_msg(i))
+        await d.submit(_msg(0, subject="Other"))
+        await d.stop()
+        return transport.bodies, d.stats
+
+    bodies, stats = asyncio.run(run())
+    sizes = sorted(len(b["personalizations"]) for b in bodies)
+    assert max(sizes) <= 1000
+    assert sum(sizes) == 2501 and stats["sent"] == 2501
+    assert len(bodies) <= 5
+    assert bodies[0]["personalizations"][0]["substitutions"] == {"-link-": "/v/0"}
+
+
+def test_failed_sends_are_retried():
+    class Flaky(MemoryTransport):
+        calls = 0
+
+        async def send(self, body):
+            self.calls += 1
+            if self.calls < 3:
+                raise RuntimeError("503")
+            await super().send(body)
+
+    async def run():
+        transport = Flaky()
+        d = EmailDispatcher(transport, workers=1, backoff=0.001, linger=0)
+        await d.submit(_msg(1))
+        await d.stop()
+        return transport, d.stats
+
+    transport, stats = asyncio.run(run())
+    assert len(transport.bodies) == 1
+    assert stats["retries"] == 2 and stats["failed"] == 0
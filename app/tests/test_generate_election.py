@@ -0,0 +1,70 @@
+import asyncio
+import random
+from argparse import Namespace
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.api.crypto import key_store, mixnet
+from app.api.crypto.paillier_utils import ballot_ciphertext, decrypt_ballot, homomorphic_sum
+from app.api.voting.models import Vote, VoterList
+from app.scripts import generate_election as gen
+
+
+def _generate(tmp_path, monkeypatch, name, workers, tally_mode="homomorphic"):
+    args = Namespace(candidates=3, turnout=0.5, seed=7, workers=workers, batch=7,
+                     domain="t.invalid", password="pw", closed=False, tally_mode=tally_mode)
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/{name}.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        monkeypatch.setattr(gen, "async_session", async_sessionmaker(engine, expire_on_commit=False))
+        rng = random.Random(args.seed)
+        users = await gen.generate_users(rng, 40, args.domain, args.password, args.batch)
+        pool = gen.ProcessPoolExecutor(workers) if workers else None
+        try:
+            election = await gen.generate_election(rng, 0, users, args, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        async with gen.async_session() as s:
+            votes = (await s.execute(
+                select(Vote.id, Vote.user_id, Vote.candidate_id, Vote.encrypted_vote)
+                .order_by(Vote.cast_at))).all()
+            eligible = await s.scalar(select(func.count()).select_from(VoterList))
+        await engine.dispose()
+        return election.id, votes, eligible
+
+    return asyncio.run(run())
+
+
+def test_generation_is_deterministic(tmp_path, monkeypatch):
+    monkeypatch.setattr(key_store, "KEY_DIR", tmp_path / "keys")
+    key_store.clear_cache()
+    eid, votes, eligible = _generate(tmp_path, monkeypatch, "a", workers=0)
+    eid2, votes2, _ = _generate(tmp_path, monkeypatch, "b", workers=2)
+
+    assert eligible == 40 and len(votes) == 20
+    assert len({v.user_id for v in votes}) == 20
+    assert (eid, votes) == (eid2, votes2)        # pool or not, same seed, same rows
+    key = key_store.get_election_key(eid)
+    assert decrypt_ballot(votes[0].encrypted_vote, key.public, key.private) == 1
+    total = homomorphic_sum([v.encrypted_vote for v in votes], key.public)
+    assert key.private.decrypt(total) == 20
+    key_store.clear_cache()
+
+
+def test_generated_mixnet_election_tallies(tmp_path, monkeypatch):
+    monkeypatch.setattr(key_store, "KEY_DIR", tmp_path / "keys")
+    key_store.clear_cache()
+    eid, votes, _ = _generate(tmp_path, monkeypatch, "m", workers=0, tally_mode="mixnet")
+    key = key_store.get_election_key(eid)
+    cts = [ballot_ciphertext(v.encrypted_vote) for v in votes]
+
+    shuffles = mixnet.mix(key.public, cts, servers=1, rounds=4)
+    assert mixnet.verify_mix(key.public, cts, shuffles)
+    plain = mixnet.decrypt_all(key.public, key.private, shuffles[-1].output)
+    assert sorted(map(mixnet.decode_choice, plain)) == sorted(v.candidate_id for v in votes)
+    key_store.clear_cache()
@@ -0,0 +1,47 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.api.voting import lifecycle
+from app.api.voting.models import Candidate, Election, ElectionResult, Vote, VoterList
+
+
+def test_closed_elections_are_snapshotted_once(tmp_path, monkeypatch):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/t.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(lifecycle, "async_session", maker)
+
+        now = datetime.utcnow()
+        closed = Election(id=uuid.uuid4(), title="closed", start_date=now - timedelta(days=2),
+                          end_date=now - timedelta(days=1))
+        running = Election(id=uuid.uuid4(), title="running", start_date=now,
+                           end_date=now + timedelta(hours=1))
+        yes, no = (Candidate(id=uuid.uuid4(), name=n, election_id=closed.id) for n in "YN")
+        async with maker() as s:
+            s.add_all([closed, running, yes, no])
+            s.add_all(VoterList(email=f"v{i}@x.org", election_id=closed.id) for i in range(5))
+            s.add_all(Vote(user_id=uuid.uuid4(), election_id=closed.id, candidate_id=yes.id,
+                           encrypted_vote="-") for _ in range(3))
+            await s.commit()
+
+        scheduler = lifecycle.LifecycleScheduler(grace=0)
+        upcoming = await scheduler.run_once()
+        await scheduler.run_once()
+        async with maker() as s:
+            results = (await s.scalars(Base.metadata.tables["election_result"].select())).all()
+            snap = await s.get(ElectionResult, closed.id)
+        await engine.dispose()
+        return upcoming, results, snap, running, yes, no
+
+    upcoming, results, snap, running, yes, no = asyncio.run(run())
+    assert len(results) == 1
+    assert json.loads(snap.counts) == {str(yes.id): 3, str(no.id): 0}
+    assert (snap.total_votes, snap.eligible_voters, snap.voted) == (3, 5, 3)
+    assert upcoming == running.end_date
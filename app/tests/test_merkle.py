@@ -0,0 +1,97 @@
+from app.api.voting.merkle import (
+    EMPTY_ROOT, Frontier, inclusion_proof, leaf_hash, node_hash, proof_nodes,
+    verify_inclusion,
+)
+
+
+def _mth(leaves):
+    """Reference RFC 6962 tree hash."""
+    if not leaves:
+        return EMPTY_ROOT
+    if len(leaves) == 1:
+        return leaves[0]
+    k = 1 << ((len(leaves) - 1).bit_length() - 1)
+    return node_hash(_mth(leaves[:k]), _mth(leaves[k:]))
+
+
+def test_frontier_root_matches_reference_tree():
+    f, leaves = Frontier(), []
+    assert f.root() == EMPTY_ROOT
+    for i in range(70):
+        leaves.append(leaf_hash(str(i).encode()))
+        f.append(leaves[-1])
+        assert f.root() == _mth(leaves)
+
+    restored = Frontier.from_json(f.size, f.to_json())
+    assert restored.root() == f.root()
+
+
+def test_inclusion_proofs_from_stored_nodes():
+    f, nodes, leaves = Frontier(), {}, []
+    for i in range(37):
+        leaves.append(leaf_hash(b"ballot-%d" % i))
+        for level, index, h in f.append(leaves[-1]):
+            nodes[(level, index)] = h
+
+    for n in (1, 2, 5, 16, 37):
+        root = _mth(leaves[:n])
+        for m in range(n):
+            needed = proof_nodes(m, n)
+            assert len(needed) <= 2 * n.bit_length() ** 2
+            proof = inclusion_proof(m, n, {k: nodes[k] for k in needed})
+            assert verify_inclusion(leaves[m], m, n, proof, root)
+            assert not verify_inclusion(leaves[m], (m + 1) % n, n, proof, root) or n == 1
+
+
+def test_concurrent_backfills_append_each_vote_once(tmp_path, monkeypatch):
+    import asyncio
+    import uuid
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import func, select
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from app.database import Base
+    from app.api.voting import bulletin
+    from app.api.voting.models import BulletinHead, BulletinLeaf, Vote
+
+    eid, now = uuid.uuid4(), datetime.utcnow()
+    votes = [{"id": uuid.uuid4(), "user_id": uuid.uuid4(), "election_id": eid,
+              "candidate_id": uuid.uuid4(), "encrypted_vote": f"ct{i}", "mfa_verified": True,
+              "cast_at": now + timedelta(seconds=i)} for i in range(30)]
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/board.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(Vote.__table__.insert(), votes)
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(bulletin, "async_session", maker)
+
+        board = bulletin.BulletinBoard()
+        for v in votes[:10]:                    # a worker's unflushed receipts
+            board._pending[eid].append((v["id"], bulletin.receipt_for(v["id"], v["encrypted_vote"])))
+        appended = await asyncio.gather(bulletin.backfill(eid), bulletin.backfill(eid), board.flush())
+        again = await bulletin.backfill(eid)
+        async with maker() as s:
+            leaves = (await s.execute(select(BulletinLeaf.vote_id, BulletinLeaf.leaf_index))).all()
+            head = await s.get(BulletinHead, eid)
+        await engine.dispose()
+        return appended, again, leaves, head
+
+    appended, again, leaves, head = asyncio.run(run())
+    assert again == 0
+    assert len({vid for vid, _ in leaves}) == len(leaves) == head.tree_size == 30
+    assert sorted(i for _, i in leaves) == list(range(30))
+
+
+def test_signing_key_is_created_once(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app.api.voting import bulletin
+
+    path = tmp_path / "bulletin_signing.key"
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: bulletin._create_signing_key(path), range(8)))
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+    assert path.stat().st_mode & 0o777 == 0o600 and len(path.read_bytes()) == 32
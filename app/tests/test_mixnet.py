@@ -0,0 +1,67 @@
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+
+import pytest
+from phe import paillier
+
+from app.api.crypto import mixnet
+from app.api.crypto.paillier_utils import get_engine
+
+
+@pytest.fixture(scope="module")
+def keypair():
+    return paillier.generate_paillier_keypair(n_length=512)
+
+
+def _ballots(pub, count, seed=1):
+    rng = Random(seed)
+    candidates = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(3)]
+    votes = [rng.choice(candidates) for _ in range(count)]
+    engine = get_engine()
+    return votes, [engine.encrypt(mixnet.encode_choice(v), pub) for v in votes]
+
+
+def test_mix_verifies_and_decrypts_to_the_same_ballots(keypair):
+    pub, priv = keypair
+    votes, cts = _ballots(pub, 25)
+    shuffles = mixnet.mix(pub, cts, servers=2, rounds=8, chunk=4)
+
+    assert mixnet.verify_mix(pub, cts, shuffles)
+    out = shuffles[-1].output
+    assert not set(out) & set(cts)                  # every ciphertext re-randomised
+    plain = mixnet.decrypt_all(pub, priv, out, chunk=4)
+    assert sorted(map(mixnet.decode_choice, plain)) == sorted(votes)
+
+
+def test_tampering_is_detected(keypair):
+    pub, _ = keypair
+    votes, cts = _ballots(pub, 10)
+    result = mixnet.shuffle(pub, cts, rounds=8, chunk=3)
+    assert mixnet.verify_shuffle(pub, cts, result)
+
+    # swap one ballot for a fresh vote: no opening can explain it
+    forged = list(result.output)
+    forged[0] = get_engine().encrypt(mixnet.encode_choice(votes[0]), pub)
+    assert not mixnet.verify_shuffle(pub, cts, mixnet.Shuffle(forged, result.proof))
+
+    # a proof for other inputs does not carry over
+    assert not mixnet.verify_shuffle(pub, cts[::-1], result)
+
+    # changing any opening breaks it
+    perm, rs = result.proof.openings[0]
+    result.proof.openings[0] = (perm, [rs[0] + 1, *rs[1:]])
+    assert not mixnet.verify_shuffle(pub, cts, result)
+
+
+def test_pool_and_inline_agree(keypair):
+    pub, priv = keypair
+    votes, cts = _ballots(pub, 12)
+    with ProcessPoolExecutor(2) as pool:
+        shuffles = mixnet.mix(pub, cts, servers=2, rounds=4, chunk=5, pool=pool)
+        assert mixnet.verify_mix(pub, cts, shuffles, pool=pool)
+        pooled = mixnet.decrypt_all(pub, priv, shuffles[-1].output, chunk=5, pool=pool)
+    assert mixnet.verify_mix(pub, cts, shuffles)
+    assert pooled == mixnet.decrypt_all(pub, priv, shuffles[-1].output)
+    assert mixnet.decode_choice(0) is None
+
@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.pagination import decode_cursor, encode_cursor, next_cursor
+
+
+def test_cursor_roundtrip():
+    key = (datetime(2025, 5, 1, 12, 30, 0, 123456), uuid.uuid4())
+    cursor = encode_cursor(*key)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, (datetime, uuid.UUID)) == key
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", encode_cursor("x"), encode_cursor(1, 2)])
+def test_bad_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor, (datetime, uuid.UUID))
+    assert e.value.status_code == 400
+
+
+def test_next_cursor_trims_lookahead_row():
+    rows = list(range(4))                      # limit 3 + 1 look-ahead
+    cursor = next_cursor(rows, lambda r: (r,), 3)
+    assert rows == [0, 1, 2]
+    assert decode_cursor(cursor, (int,)) == (2,)
+    assert next_cursor([0, 1], lambda r: (r,), 3) is None
@@ -0,0 +1,46 @@
+import difflib
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.scripts.perf_gate import BASELINES
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+# allowed median latency: baseline * tolerance + slack (0 disables the check)
+PERF_LATENCY_TOLERANCE = float(os.getenv("PERF_LATENCY_TOLERANCE", "3"))
+PERF_LATENCY_SLACK_MS = float(os.getenv("PERF_LATENCY_SLACK_MS", "10"))
+
+
+@pytest.fixture(scope="module")
+def report():
+    # own process: the gate configures the database through the environment
+    out = subprocess.run([sys.executable, "-m", "app.scripts.perf_gate"], cwd=ROOT,
+                         capture_output=True, text=True, timeout=600)
+    assert out.returncode == 0, out.stderr
+    return json.loads(out.stdout)
+
+
+with open(BASELINES) as f:
+    baselines = json.load(f)
+
+
+@pytest.mark.parametrize("endpoint", sorted(baselines))
+def test_statement_budget(report, endpoint):
+    expected, got = baselines[endpoint], report[endpoint]["statements"]
+    if len(got) > expected["max_statements"]:
+        diff = "\n".join(difflib.unified_diff(expected["statements"], got,
+                                              "baseline", "current", lineterm=""))
+        pytest.fail(f"{endpoint}: {len(got)} statements, budget is "
+                    f"{expected['max_statements']}\n{diff}")
+
+
+@pytest.mark.parametrize("endpoint", sorted(baselines))
+def test_median_latency(report, endpoint):
+    if PERF_LATENCY_TOLERANCE <= 0:
+        pytest.skip("latency check disabled")
+    limit = baselines[endpoint]["median_ms"] * PERF_LATENCY_TOLERANCE + PERF_LATENCY_SLACK_MS
+    median = report[endpoint]["median_ms"]
+    assert median <= limit, f"{endpoint}: median {median:.1f} ms, limit {limit:.1f} ms"
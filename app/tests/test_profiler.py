@@ -0,0 +1,38 @@
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app import profiler
+
+
+def busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < end:
+        n += 1
+    return n
+
+
+def test_samples_other_threads_within_overhead_cap():
+    sampler = profiler.start(0.001, max_overhead=0.05)
+    worker = threading.Thread(target=busy_loop, args=(0.3,), name="busy")
+    worker.start()
+    worker.join()
+    profile = profiler.stop(sampler)
+
+    stats = profile.stats()
+    assert stats["samples"] > 10
+    assert stats["overhead"] <= 0.05 * 1.5      # one sample of slack
+    assert any(s.startswith("busy;") and s.endswith("busy_loop (app/tests/test_profiler.py)")
+               for s in profile.stacks)
+    assert profiler.active() is None
+
+
+def test_pool_calls_are_sampled_in_the_worker():
+    with ProcessPoolExecutor(1) as pool:
+        result, stacks, spent, wall = pool.submit(
+            profiler.sampled_call, 0.001, 0.05, busy_loop, 0.3).result()
+    assert result > 0 and wall >= 0.3
+    assert sum(stacks.values()) > 10
+    assert all(s.startswith("crypto-worker;") for s in stacks)
+    assert spent <= 0.05 * wall * 1.5
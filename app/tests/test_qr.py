@@ -0,0 +1,30 @@
+import asyncio
+
+from app.api.auth import qr
+
+
+def test_qr_codes_are_cached_per_uri(monkeypatch):
+    calls = []
+    monkeypatch.setattr(qr, "render", lambda uri, fmt: calls.append(uri) or f"{fmt}:{uri}")
+    monkeypatch.setattr(qr, "QR_CACHE_SIZE", 2)
+    qr.clear_cache()
+
+    async def run():
+        same = await asyncio.gather(*(qr.qr_code("otpauth://a") for _ in range(5)))
+        await qr.qr_code("otpauth://b")
+        await qr.qr_code("otpauth://a")          # hit, a is now most recent
+        await qr.qr_code("otpauth://c")          # evicts b
+        await qr.qr_code("otpauth://b")
+        return same
+
+    same = asyncio.run(run())
+    assert set(same) == {"png:otpauth://a"}
+    assert calls == ["otpauth://a", "otpauth://b", "otpauth://c", "otpauth://b"]
+    qr.clear_cache()
+
+
+def test_svg_and_text_formats():
+    svg = qr.render("otpauth://totp/SecureVote:a?secret=JBSWY3DPEHPK3PXP", "svg")
+    text = qr.render("otpauth://totp/SecureVote:a?secret=JBSWY3DPEHPK3PXP", "text")
+    assert svg.startswith("data:image/svg+xml;base64,")
+    assert len(text.splitlines()) > 10
@@ -0,0 +1,53 @@
+import os
+import re
+import subprocess
+import sys
+
+# Cumulative import time budget for `app.api.main`, in microseconds.
+IMPORT_BUDGET_US = int(os.getenv("IMPORT_BUDGET_US", "2000000"))
+
+# Modules that must only load on first use, never at app import.
+LAZY_MODULES = ("qrcode", "PIL", "sendgrid", "phe", "gmpy2")
+
+
+def _importtime(module: str) -> dict:
+    """Return {module: cumulative_us} from `python -X importtime`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        m = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)", line)
+        if m:
+            times[m.group(2)] = int(m.group(1))
+    return times
+
+
+def test_main_import_is_lazy_and_within_budget():
+    times = _importtime("app.api.main")
+
+    eager = [m for m in times if m.split(".")[0] in LAZY_MODULES]
+    assert not eager, f"heavy modules imported at startup: {sorted(eager)}"
+    assert times["app.api.main"] <= IMPORT_BUDGET_US, (
+        f"import took {times['app.api.main']}us, budget {IMPORT_BUDGET_US}us"
+    )
+
+
+def test_recycling_skips_workers_that_already_exited():
+    import signal
+    import run
+
+    gone = subprocess.Popen([sys.executable, "-c", ""])
+    gone.wait()
+    alive = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        arbiter = run.Arbiter(config=None, workers=2)
+        arbiter.children = {gone.pid: 0.0, alive.pid: 0.0}
+        arbiter.recycle = [alive.pid, gone.pid]     # popped from the end
+        arbiter._recycle_next()                     # used to raise ProcessLookupError
+        assert arbiter.recycle == []
+        assert alive.wait(timeout=5) == -signal.SIGTERM
+        arbiter._stop(None, None)                   # both gone now: still no error
+    finally:
+        alive.kill()
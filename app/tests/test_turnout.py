@@ -0,0 +1,41 @@
+import asyncio
+import uuid
+
+from app.api.voting.turnout import TurnoutHub
+
+
+def test_bursts_are_coalesced_and_reconciled():
+    eid = uuid.uuid4()
+    db = {eid: (10, 40)}
+
+    async def loader(ids):
+        return {i: db[i] for i in ids}
+
+    async def run():
+        hub = TurnoutHub(loader, interval=0.05, reconcile_every=3600)
+        feed = hub.subscribe(eid)
+        first = await feed.__anext__()
+        for _ in range(25):                     # burst within one interval
+            hub.record_vote(eid)
+        second = await feed.__anext__()
+
+        db[eid] = (50, 40)                      # votes cast by another worker
+        await hub.reconcile([eid])
+        third = await feed.__anext__()
+        await feed.aclose()
+        return hub, first, second, third
+
+    hub, first, second, third = asyncio.run(run())
+    assert (first["votes"], first["delta"], first["turnout"]) == (10, 0, 25.0)
+    assert (second["votes"], second["delta"]) == (35, 25)
+    assert (third["votes"], third["delta"]) == (50, 15)
+    assert not hub._subscribers and not hub._votes
+
+
+def test_unwatched_elections_cost_nothing():
+    async def loader(ids):
+        raise AssertionError("no database access without subscribers")
+
+    hub = TurnoutHub(loader)
+    hub.record_vote(uuid.uuid4())
+    assert not hub._votes and not hub._dirty
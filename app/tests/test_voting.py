@@ -0,0 +1,107 @@
+import asyncio
+import uuid
+
+from sqlalchemy import func, select
+
+from app.api.voting.models import Vote
+
+
+def _vote(api, user, election_id, candidate_id):
+    return api.call("POST", f"/voting/elections/{election_id}/vote",
+                    json={"candidate_id": str(candidate_id), "mfa_code": api.mfa_code(user)})
+
+
+def _count_votes(api):
+    async def run():
+        async with api.session() as s:
+            return await s.scalar(select(func.count()).select_from(Vote))
+    return asyncio.run(run())
+
+
+def test_vote_is_cast_once(api):
+    user = api.user()
+    election, (cid, _) = api.election(voters=[user.email])
+    api.login(user)
+
+    first = _vote(api, user, election.id, cid)
+    assert first.status_code == 200 and first.json()["success"]
+    second = _vote(api, user, election.id, cid)
+    assert second.status_code == 409
+    assert second.json()["detail"] == "You have already voted in this election"
+    assert _count_votes(api) == 1
+    assert [e for e, _ in api.audit] == ["vote.cast", "vote.rejected"]
+
+
+def test_vote_rejections(api):
+    user = api.user()
+    election, (cid, _) = api.election(voters=[user.email])
+    closed, (closed_cid, _) = api.election(voters=[user.email], closed=True)
+    not_listed, (other_cid, _) = api.election(voters=["someone@example.com"])
+    api.login(user)
+
+    cases = [
+        (uuid.uuid4(), cid, 404, "Election not found"),
+        (election.id, uuid.uuid4(), 404, "Candidate not found in this election"),
+        (election.id, closed_cid, 404, "Candidate not found in this election"),
+        (closed.id, closed_cid, 403, "Voting is not currently open for this election"),
+        (not_listed.id, other_cid, 403, "You are not eligible to vote in this election"),
+    ]
+    for election_id, candidate_id, code, detail in cases:
+        r = _vote(api, user, election_id, candidate_id)
+        assert (r.status_code, r.json()["detail"]) == (code, detail)
+    assert _count_votes(api) == 0
+
+
+def test_vote_needs_a_valid_mfa_code(api):
+    user = api.user()
+    election, (cid, _) = api.election(voters=[user.email])
+    api.login(user)
+    r = api.call("POST", f"/voting/elections/{election.id}/vote",
+                 json={"candidate_id": str(cid), "mfa_code": "000000"})
+    assert r.status_code == 401 and _count_votes(api) == 0
+
+
+def test_batch_with_an_invalid_choice_casts_nothing(api):
+    user = api.user()
+    first, (cid1, _) = api.election(voters=[user.email])
+    second, (cid2, _) = api.election(voters=[user.email])
+    closed, (closed_cid, _) = api.election(voters=[user.email], closed=True)
+    api.login(user)
+
+    def batch(*choices):
+        return api.call("POST", "/voting/ballots", json={
+            "mfa_code": api.mfa_code(user),
+            "choices": [{"election_id": str(e), "candidate_id": str(c)} for e, c in choices],
+        })
+
+    r = batch((first.id, cid1), (closed.id, closed_cid), (second.id, uuid.uuid4()))
+    assert r.status_code == 403                 # the first rejection's status
+    assert {d["election_id"]: d["detail"] for d in r.json()["detail"]} == {
+        str(closed.id): "Voting is not currently open for this election",
+        str(second.id): "Candidate not found in this election",
+    }
+    assert _count_votes(api) == 0
+
+    r = batch((first.id, cid1), (second.id, cid2))
+    assert r.status_code == 200
+    assert {b["election_id"] for b in r.json()["ballots"]} == {str(first.id), str(second.id)}
+
+    r = batch((first.id, cid1))
+    assert r.status_code == 409 and _count_votes(api) == 2
+
+
+def test_vote_is_encrypted_off_the_event_loop(api, monkeypatch):
+    from app.api.crypto import executor
+
+    calls, run = [], executor.run
+
+    async def spy(fn, *args, **kwargs):
+        calls.append(fn.__name__)
+        return await run(fn, *args, **kwargs)
+
+    monkeypatch.setattr(executor, "run", spy)
+    user = api.user()
+    election, (cid, _) = api.election(voters=[user.email])
+    api.login(user)
+    assert _vote(api, user, election.id, cid).status_code == 200
+    assert calls == ["encrypt_ballot"]
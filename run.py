@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""
+Production entry point: a pre-fork multi-worker uvicorn server.
+
+The parent process imports the application and runs its one-off startup
+work (`app.api.main.prepare`: schema check and migrations, the keys of all
+active elections, bulletin board backfill), loads the crypto modules,
+binds the listening socket, then forks the workers.  Workers share that
+state copy-on-write and skip those steps; each still starts its own
+background tasks (result scheduler, flushers).  All accept on the same
+socket.  uvloop and
+httptools are used when installed (uvicorn's "auto").
+
+Each worker exits gracefully after --max-requests requests (with jitter so
+they don't all recycle at once) and is replaced by the parent.
+
+    python run.py --workers 8 --port 8000
+    kill -HUP <parent>     # recycle all workers one by one
+    kill -TERM <parent>    # graceful shutdown
+
+For development, `uvicorn app.api.main:app --reload` is still the way to go.
+"""
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import signal
+import sys
+import time
+
+import uvicorn
+
+log = logging.getLogger("run")
+
+
+async def _preload() -> int:
+    """Do the startup work once, here, instead of once per worker."""
+    from app.database import engine, read_engine
+    from app.api import main  # routers, models, schemas
+    from app.api.crypto import paillier_utils, zkp  # noqa: F401
+
+    loaded = await main.prepare()
+
+    # connections must not be shared across fork
+    await engine.dispose()
+    await read_engine.dispose()
+    return loaded
+
+
+class Arbiter:
+    """Forks workers on a shared socket and keeps `workers` of them alive."""
+
+    def __init__(self, config: uvicorn.Config, workers: int):
+        self.config = config
+        self.workers = workers
+        self.children = {}              # pid -> start time
+        self.stopping = False
+        self.recycle = []
+
+    def spawn(self, sock) -> None:
+        pid = os.fork()
+        if pid == 0:                    # worker
+            for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+                signal.signal(sig, signal.SIG_DFL)
+            code = 0
+            try:
+                uvicorn.Server(self.config).run(sockets=[sock])
+            except BaseException:
+                log.exception("Worker %d crashed", os.getpid())
+                code = 1
+            os._exit(code)
+        self.children[pid] = time.monotonic()
+
+    def run(self) -> None:
+        sock = self.config.bind_socket()
+        gc.freeze()                     # keep preloaded objects' pages shared
+        for _ in range(self.workers):
+            self.spawn(sock)
+        log.info("Started %d workers on %s:%d", self.workers,
+                 self.config.host, self.config.port)
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGHUP, self._reload)
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except InterruptedError:
+                continue
+            except ChildProcessError:
+                break
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+            if os.waitstatus_to_exitcode(status) != 0 and time.monotonic() - started < 1:
+                time.sleep(1)           # crash loop: don't spin
+            self.spawn(sock)
+            self._recycle_next()        # SIGHUP: replace the next old worker
+        sock.close()
+
+    def _terminate(self, pid: int) -> bool:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:      # exited on its own (e.g. --max-requests)
+            return False
+        return True
+
+    def _recycle_next(self) -> None:
+        while self.recycle:
+            pid = self.recycle.pop()
+            if pid in self.children and self._terminate(pid):
+                return
+
+    def _stop(self, signum, frame) -> None:
+        self.stopping = True
+        for pid in list(self.children):
+            self._terminate(pid)
+
+    def _reload(self, signum, frame) -> None:
+        # one at a time, so capacity never drops by more than one worker
+        self.recycle = list(self.children)
+        self._recycle_next()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    ap.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    ap.add_argument("--workers", type=int,
+                    default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))))
+    ap.add_argument("--max-requests", type=int, default=10000,
+                    help="recycle a worker after this many requests (0 = never)")
+    ap.add_argument("--max-requests-jitter", type=int, default=1000)
+    ap.add_argument("--graceful-timeout", type=int, default=30)
+    ap.add_argument("--backlog", type=int, default=2048)
+    ap.add_argument("--log-level", default="info")
+    args = ap.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper(),
+                        format="%(asctime)s %(process)d %(levelname)s %(message)s")
+
+    loaded = asyncio.run(_preload())
+    log.info("Preloaded %d election keys", loaded)
+
+    from app.api.main import app
+    config = uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        loop="auto",                    # uvloop if installed
+        http="auto",                    # httptools if installed
+        backlog=args.backlog,
+        limit_max_requests=args.max_requests or None,
+        limit_max_requests_jitter=args.max_requests_jitter,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        log_level=args.log_level,
+    )
+    Arbiter(config, max(1, args.workers)).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())